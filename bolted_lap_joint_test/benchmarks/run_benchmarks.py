@@ -0,0 +1,335 @@
+#!/usr/bin/env python
+"""
+Benchmark suite for the bolted lap joint design engine and CLI.
+Results are written as JSON, and a run can be compared against a stored
+baseline, failing when any benchmark regresses by more than a threshold.
+
+Usage:
+    python benchmarks/run_benchmarks.py                        # Run and print results
+    python benchmarks/run_benchmarks.py --save benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --compare benchmarks/baseline.json --threshold 20
+    python benchmarks/run_benchmarks.py --only cli_cold_start --compare benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --only cli_startup_overhead --startup-budget 50
+    python benchmarks/run_benchmarks.py --only cli_batch_throughput cli_checkpointed_batch_throughput
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, 'src'))
+
+# Default allowed regression in percent before a comparison fails
+DEFAULT_THRESHOLD = 25.0
+
+# Default largest time in milliseconds a single CLI design may add to the start
+# of a bare Python interpreter
+DEFAULT_STARTUP_BUDGET = 50.0
+
+# Default largest loss of CLI batch throughput in percent that checkpointing after
+# every chunk may cost compared with a plain batch of the same run
+DEFAULT_CHECKPOINT_TOLERANCE = 15.0
+
+
+def realistic_inputs(n, seed=0):
+    """
+    Generate design inputs with a realistic spread of loads, widths and thicknesses.
+    Loads are log-normally distributed around 60 kN and clipped to 1-500 kN.
+    :return: Tuple of NumPy arrays (P, w, t1, t2)
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    P = np.clip(rng.lognormal(np.log(60), 0.8, n), 1, 500)
+    w = rng.choice([100, 120, 150, 180, 200, 250, 300], n).astype(float)
+    t1 = rng.choice([6, 8, 10, 12, 16, 20, 24], n).astype(float)
+    t2 = rng.choice([6, 8, 10, 12, 16, 20, 24], n).astype(float)
+    return P, w, t1, t2
+
+
+def _best_of(repeats, func):
+    """Return the shortest wall time in seconds of several calls to func."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def bench_single_latency(quick):
+    """Median latency of one design_lap_joint call, in microseconds."""
+    from bolted_lap_joint_design import design_lap_joint
+
+    P, w, t1, t2 = (a.tolist() for a in realistic_inputs(200))
+    design_lap_joint(P[0], w[0], t1[0], t2[0])  # Warm the capacity table
+
+    samples = []
+    for _ in range(3 if quick else 20):
+        start = time.perf_counter()
+        for args in zip(P, w, t1, t2):
+            design_lap_joint(*args)
+        samples.append((time.perf_counter() - start) / len(P))
+    return statistics.median(samples) * 1e6, "us", False
+
+
+def bench_scalar_throughput(quick):
+    """Designs per second with one design_lap_joint call per record."""
+    from bolted_lap_joint_design import design_lap_joint
+
+    n = 5000 if quick else 50000
+    inputs = list(zip(*(a.tolist() for a in realistic_inputs(n))))
+
+    def run():
+        for args in inputs:
+            try:
+                design_lap_joint(*args)
+            except ValueError:
+                pass
+
+    return n / _best_of(3, run), "records/s", True
+
+
+def bench_sensitivity_speedup(quick):
+    """How many times faster design_sensitivity is than designing every perturbation with design_lap_joint."""
+    from bolted_lap_joint_design import design_lap_joint
+    from sensitivity import DEFAULT_PERTURBATIONS, SENSITIVITY_INPUTS, design_sensitivity
+
+    n = 100 if quick else 1000
+    cases = list(zip(*(a.tolist() for a in realistic_inputs(n))))
+
+    def independent():
+        for base in cases:
+            for inputs in [base] + [base[:axis] + (base[axis] + delta,) + base[axis + 1:]
+                                    for axis, name in enumerate(SENSITIVITY_INPUTS)
+                                    for delta in DEFAULT_PERTURBATIONS[name]]:
+                try:
+                    design_lap_joint(*inputs)
+                except ValueError:
+                    pass
+
+    def shared():
+        for base in cases:
+            try:
+                design_sensitivity(*base)
+            except ValueError:
+                pass
+
+    return _best_of(3, independent) / _best_of(3, shared), "x", True
+
+
+def bench_batch_throughput(quick):
+    """Designs per second through design_lap_joint_batch."""
+    from batch_design import design_lap_joint_batch
+
+    n = 20000 if quick else 200000
+    P, w, t1, t2 = realistic_inputs(n)
+    return n / _best_of(3, lambda: design_lap_joint_batch(P, w, t1, t2)), "records/s", True
+
+
+def bench_parallel_throughput(quick):
+    """Designs per second through design_lap_joint_parallel with one worker per core."""
+    from parallel_design import design_lap_joint_parallel
+
+    n = 50000 if quick else 1000000
+    P, w, t1, t2 = realistic_inputs(n)
+    return n / _best_of(2, lambda: design_lap_joint_parallel(P, w, t1, t2)), "records/s", True
+
+
+def bench_cli_cold_start(quick):
+    """Median wall time of a complete 'python main.py' single design, in milliseconds."""
+    command = [sys.executable, os.path.join(ROOT, 'main.py'), "50", "150", "10", "12"]
+    samples = []
+    for _ in range(3 if quick else 10):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000, "ms", False
+
+
+def bench_cli_startup_overhead(quick):
+    """Median wall time a 'python main.py' single design adds to an empty interpreter, in milliseconds."""
+    commands = [
+        [sys.executable, "-c", "pass"],
+        [sys.executable, os.path.join(ROOT, 'main.py'), "50", "150", "10", "12"],
+    ]
+    samples = {0: [], 1: []}
+    for _ in range(5 if quick else 20):
+        # Alternate the commands so that both see the same machine load
+        for i, command in enumerate(commands):
+            start = time.perf_counter()
+            subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+            samples[i].append(time.perf_counter() - start)
+    return (statistics.median(samples[1]) - statistics.median(samples[0])) * 1000, "ms", False
+
+
+def _cli_batch_throughput(quick, *options):
+    """Records per second through 'python main.py --batch' with extra options, including startup."""
+    import tempfile
+
+    n = 5000 if quick else 50000
+    P, w, t1, t2 = realistic_inputs(n)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "joints.jsonl")
+        with open(path, "w") as f:
+            for row in zip(P.tolist(), w.tolist(), t1.tolist(), t2.tolist()):
+                f.write(json.dumps(dict(zip(("load", "width", "thickness1", "thickness2"), row))) + "\n")
+        output = os.path.join(tmp, "designs.jsonl") if options else os.devnull
+        command = [sys.executable, os.path.join(ROOT, 'main.py'), "--batch", path, "--output", output, *options]
+        seconds = _best_of(2, lambda: subprocess.run(command, check=True, stderr=subprocess.DEVNULL))
+    return n / seconds, "records/s", True
+
+
+def bench_cli_batch_throughput(quick):
+    """Records per second through 'python main.py --batch' on a JSONL file, including startup."""
+    return _cli_batch_throughput(quick)
+
+
+def bench_cli_checkpointed_batch_throughput(quick):
+    """Records per second through a resumable batch that checkpoints after every chunk."""
+    return _cli_batch_throughput(quick, "--restart", "--checkpoint-interval", "0")
+
+
+BENCHMARKS = {
+    "single_design_latency": bench_single_latency,
+    "scalar_throughput": bench_scalar_throughput,
+    "sensitivity_speedup": bench_sensitivity_speedup,
+    "batch_throughput": bench_batch_throughput,
+    "parallel_throughput": bench_parallel_throughput,
+    "cli_cold_start": bench_cli_cold_start,
+    "cli_startup_overhead": bench_cli_startup_overhead,
+    "cli_batch_throughput": bench_cli_batch_throughput,
+    "cli_checkpointed_batch_throughput": bench_cli_checkpointed_batch_throughput,
+}
+
+
+def run_benchmarks(names, quick=False):
+    """
+    Run the selected benchmarks.
+    :param names: Benchmark names to run
+    :param quick: Use smaller inputs and fewer repeats
+    :return: Result document with environment details and one entry per benchmark
+    """
+    results = {}
+    for name in names:
+        value, unit, higher_is_better = BENCHMARKS[name](quick)
+        results[name] = {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+        print(f"{name:<34} {value:>14,.2f} {unit}", file=sys.stderr)
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "quick": quick,
+        "benchmarks": results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """
+    Compare a run against a baseline.
+    :param threshold: Allowed regression in percent
+    :return: List of (name, change in percent, regressed) for every benchmark of the run,
+             with a change of None for benchmarks the baseline has no value for
+    """
+    rows = []
+    for name, result in current["benchmarks"].items():
+        reference = baseline["benchmarks"].get(name)
+        if reference is None or reference["value"] == 0:
+            rows.append((name, None, False))
+            continue
+        change = (result["value"] - reference["value"]) / reference["value"] * 100
+        # Express every change so that a positive number is an improvement
+        improvement = change if result["higher_is_better"] else -change
+        rows.append((name, improvement, improvement < -threshold))
+    return rows
+
+
+def checkpoint_overhead(current):
+    """
+    Compare the checkpointed CLI batch throughput with the plain batch of the same run.
+    :param current: Result document of run_benchmarks
+    :return: Throughput lost to checkpointing in percent of the plain batch, or None
+             unless both batch benchmarks were run
+    """
+    plain = current["benchmarks"].get("cli_batch_throughput")
+    checkpointed = current["benchmarks"].get("cli_checkpointed_batch_throughput")
+    if plain is None or checkpointed is None or plain["value"] == 0:
+        return None
+    return (plain["value"] - checkpointed["value"]) / plain["value"] * 100
+
+
+def main(argv=None):
+    """Run the benchmark suite from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark the bolted lap joint design engine and CLI.")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Run only these benchmarks")
+    parser.add_argument("--quick", action="store_true", help="Use smaller inputs and fewer repeats")
+    parser.add_argument("--save", metavar="FILE", help="Write the results to FILE as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="Compare the results with a baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Allowed regression in percent (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--startup-budget", type=float, default=DEFAULT_STARTUP_BUDGET, metavar="MS",
+                        help="Fail if cli_startup_overhead exceeds MS milliseconds "
+                             f"(default: {DEFAULT_STARTUP_BUDGET})")
+    parser.add_argument("--checkpoint-tolerance", type=float, default=DEFAULT_CHECKPOINT_TOLERANCE, metavar="PERCENT",
+                        help="Fail if cli_checkpointed_batch_throughput is more than PERCENT below "
+                             f"cli_batch_throughput (default: {DEFAULT_CHECKPOINT_TOLERANCE})")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        # Quick runs use smaller inputs, so their values cannot be compared with full runs
+        if baseline.get("quick", False) != args.quick:
+            mode = "with" if args.quick else "without"
+            parser.error(f"{args.compare} was not recorded {mode} --quick, so it cannot be compared with this run")
+
+    current = run_benchmarks(args.only or list(BENCHMARKS), args.quick)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(current, f, indent=2)
+            f.write("\n")
+    else:
+        print(json.dumps(current, indent=2))
+
+    failed = False
+    startup = current["benchmarks"].get("cli_startup_overhead")
+    if startup is not None and startup["value"] > args.startup_budget:
+        print(f"CLI startup overhead of {startup['value']:.1f} ms exceeds the budget of {args.startup_budget} ms",
+              file=sys.stderr)
+        failed = True
+
+    overhead = checkpoint_overhead(current)
+    if overhead is not None and overhead > args.checkpoint_tolerance:
+        print(f"Checkpointed CLI batch throughput is {overhead:.1f}% below the plain batch, "
+              f"more than the tolerance of {args.checkpoint_tolerance}%", file=sys.stderr)
+        failed = True
+
+    if baseline is not None:
+        rows = compare(current, baseline, args.threshold)
+        missing = [name for name, improvement, _ in rows if improvement is None]
+        regressions = False
+        for name, improvement, regressed in rows:
+            if improvement is None:
+                continue
+            status = "REGRESSED" if regressed else "ok"
+            print(f"{name:<34} {improvement:>+8.1f}%  {status}", file=sys.stderr)
+            regressions = regressions or regressed
+        if missing:
+            print(f"Not in the baseline, so not compared: {', '.join(missing)}; "
+                  f"store a new baseline with --save to check them", file=sys.stderr)
+        if regressions:
+            print(f"Benchmarks regressed by more than {args.threshold}%", file=sys.stderr)
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,462 @@
+"""
+Vectorized batch design of bolted lap joints.
+This module evaluates the same candidate grid as design_lap_joint for many
+joints at once using NumPy broadcasting, and returns the results as columns.
+"""
+
+import os
+import shutil
+import struct
+import tempfile
+import zipfile
+
+import numpy as np
+
+from bolted_lap_joint_design import DesignRecord, get_capacity_table
+
+# Columns returned by design_lap_joint_batch, in the same order as the
+# keys of the dictionary returned by design_lap_joint
+RESULT_COLUMNS = (
+    "bolt_diameter",
+    "bolt_grade",
+    "number_of_bolts",
+    "pitch_distance",
+    "gauge_distance",
+    "end_distance",
+    "edge_distance",
+    "number_of_rows",
+    "number_of_columns",
+    "hole_diameter",
+    "strength_of_connection",
+    "yield_strength_plate_1",
+    "yield_strength_plate_2",
+    "length_of_connection",
+    "efficiency_of_connection",
+)
+
+# Status of one row of a structured result array
+STATUS_DESIGNED = 0
+STATUS_NO_DESIGN = 1
+STATUS_INVALID = 2
+
+# Row layout of structured result arrays and .npy/.npz result files. Each row holds
+# the inputs and the DesignRecord fields, about 120 bytes against several kilobytes
+# for a design dictionary
+DESIGN_DTYPE = np.dtype([
+    ("index", "<i8"),
+    ("status", "i1"),
+    ("load", "<f8"),
+    ("width", "<f8"),
+    ("thickness1", "<f8"),
+    ("thickness2", "<f8"),
+    ("candidate_index", "<i4"),
+    ("bolt_diameter", "<f8"),
+    ("bolt_grade", "<f8"),
+    ("number_of_bolts", "<i4"),
+    ("number_of_rows", "<i4"),
+    ("pitch_distance", "<f8"),
+    ("gauge_distance", "<f8"),
+    ("end_distance", "<f8"),
+    ("strength_of_connection", "<f8"),
+    ("yield_strength_plate", "<f8"),
+    ("length_of_connection", "<f8"),
+    ("efficiency_of_connection", "<f8"),
+])
+
+_NO_DESIGN = "No suitable design found that meets the requirements."
+
+
+def _candidate_arrays(table):
+    """
+    Turn a capacity table into per-candidate arrays for broadcasting.
+    Candidates keep the table order, which is the order design_lap_joint
+    iterates them, so ties on connection length resolve to the same design.
+    :param table: CapacityTable from get_capacity_table
+    :return: Dictionary of 1-D arrays with one entry per (diameter, grade) pair
+    """
+    gamma_mb = 1.25
+    k2 = 0.7 if table.hole_type == 'Oversized' else 0.9
+
+    bearing_coeff = []
+    for candidate in table.candidates:
+        d = candidate.bolt_diameter
+        e = candidate.end_distance
+        p = candidate.pitch_distance
+        # Leading factors of the clause 10.3.4 bearing formula, multiplied in
+        # the same order as IS800_2007 so the batch result is bit-identical
+        k1 = min(e / (3 * d), p / (3 * d) - 0.25, 1)
+        bearing_coeff.append(2.5 * k1 * k2 * table.fu_plate * d)
+
+    return {
+        "d": np.array([c.bolt_diameter for c in table.candidates], dtype=float),
+        "GB": np.array([c.bolt_grade for c in table.candidates], dtype=float),
+        "V_b": np.array([c.shear_capacity for c in table.candidates], dtype=float),
+        "e": np.array([c.end_distance for c in table.candidates], dtype=float),
+        "p": np.array([c.pitch_distance for c in table.candidates], dtype=float),
+        "bearing_coeff": np.array(bearing_coeff, dtype=float),
+        "gamma_mb": gamma_mb,
+        "field_factor": 0.9 if table.connection_location == 'Field' else 1.0,
+        "fy_plate": table.fy_plate,
+    }
+
+
+_candidate_cache = {}
+
+
+def get_candidate_arrays(table=None):
+    """
+    Return the broadcastable candidate arrays for a capacity table, building them once.
+    :param table: CapacityTable (defaults to the table used by design_lap_joint)
+    :return: Dictionary of per-candidate arrays
+    """
+    if table is None:
+        table = get_capacity_table()
+    # Entries are tied to the table object so that clear_capacity_tables also
+    # invalidates the arrays derived from the discarded tables
+    cached = _candidate_cache.get(table.key)
+    if cached is None or cached[0] is not table:
+        cached = (table, _candidate_arrays(table))
+        _candidate_cache[table.key] = cached
+    return cached[1]
+
+
+def _validate_batch(P, w, t1, t2):
+    """
+    Apply the input checks of design_lap_joint to whole arrays.
+    :raises ValueError: For the first invalid record, naming its index
+    """
+    checks = [
+        (P < 0, "Tensile force P cannot be negative"),
+        (w <= 0, "Width w must be positive"),
+        (t1 <= 0, "Thickness t1 must be positive"),
+        (t2 <= 0, "Thickness t2 must be positive"),
+        (w > 1000, "Width w is too large (> 1000 mm), please check your input"),
+        ((t1 > 100) | (t2 > 100), "Plate thickness is too large (> 100 mm), please check your input"),
+    ]
+    for mask, message in checks:
+        if mask.any():
+            index = int(np.flatnonzero(mask)[0])
+            raise ValueError(f"{message} (record {index})")
+
+
+def design_lap_joint_batch(P, w, t1, t2):
+    """
+    Design many bolted lap joints in a single vectorized pass.
+    Inputs are broadcast against each other, so scalars may be mixed with arrays.
+    Every (record, candidate) pair is evaluated as one 2-D array operation, and
+    the selected design for each record matches design_lap_joint exactly.
+    :param P: Tensile forces in kN
+    :param w: Widths of the plates in mm
+    :param t1: Thicknesses of plate 1 in mm
+    :param t2: Thicknesses of plate 2 in mm
+    :return: Dictionary of 1-D arrays keyed like the design_lap_joint result, plus
+             a boolean "found" column that is False where no suitable design exists
+    """
+    P, w, t1, t2 = (np.ravel(a) for a in np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (P, w, t1, t2))))
+
+    _validate_batch(P, w, t1, t2)
+
+    cand = get_candidate_arrays()
+
+    # Records run along axis 0 and candidates along axis 1
+    P_N = (P * 1000)[:, None]
+    t_min = np.minimum(t1, t2)[:, None]
+
+    N_b = np.ceil(P_N / (cand["V_b"] * 0.75))
+    N_b = np.maximum(N_b, 2)
+
+    length = 2 * cand["e"] + (N_b - 1) * cand["p"]
+
+    V_dpb = cand["bearing_coeff"] * t_min / cand["gamma_mb"]
+    V_dpb = V_dpb * cand["field_factor"]
+
+    strength = N_b * np.minimum(cand["V_b"], V_dpb) * 0.75
+    utilization = P_N / strength
+
+    # argmin returns the first minimum, which matches the strict '<' used by the
+    # scalar search when two candidates give the same connection length
+    feasible_length = np.where(utilization <= 1, length, np.inf)
+    best = np.argmin(feasible_length, axis=1)
+    rows = np.arange(len(P))
+    found = np.isfinite(feasible_length[rows, best])
+
+    n_bolts = np.where(found, N_b[rows, best], 0).astype(np.int64)
+    e = np.where(found, cand["e"][best], np.nan)
+    fy_plate = np.where(found, float(cand["fy_plate"]), np.nan)
+
+    return {
+        "bolt_diameter": np.where(found, cand["d"][best], np.nan),
+        "bolt_grade": np.where(found, cand["GB"][best], np.nan),
+        "number_of_bolts": n_bolts,
+        "pitch_distance": np.where(found, cand["p"][best], np.nan),
+        "gauge_distance": np.where(found, w / 2, np.nan),
+        "end_distance": e,
+        "edge_distance": e,
+        "number_of_rows": found.astype(np.int64),
+        "number_of_columns": n_bolts,
+        "hole_diameter": np.where(found, cand["d"][best] + 2, np.nan),
+        "strength_of_connection": np.where(found, strength[rows, best], np.nan),
+        "yield_strength_plate_1": fy_plate,
+        "yield_strength_plate_2": fy_plate,
+        "length_of_connection": np.where(found, length[rows, best], np.nan),
+        "efficiency_of_connection": np.where(found, utilization[rows, best], np.nan),
+        "found": found,
+        "candidate_index": np.where(found, best, -1),
+    }
+
+
+def design_from_batch(results, i):
+    """
+    Convert one record of a design_lap_joint_batch result into a design dictionary.
+    The dictionary has the same keys, values and Python types as design_lap_joint.
+    :param results: Dictionary of columns returned by design_lap_joint_batch
+    :param i: Index of the record
+    :return: Design dictionary, or None if no suitable design was found
+    """
+    if not results["found"][i]:
+        return None
+
+    table = get_capacity_table()
+    candidate = table.candidates[int(results["candidate_index"][i])]
+    d = candidate.bolt_diameter
+    e = candidate.end_distance
+    p = candidate.pitch_distance
+    N_b = int(results["number_of_bolts"][i])
+
+    return {
+        "bolt_diameter": d,
+        "bolt_grade": candidate.bolt_grade,
+        "number_of_bolts": N_b,
+        "pitch_distance": p,
+        "gauge_distance": float(results["gauge_distance"][i]),
+        "end_distance": e,
+        "edge_distance": e,
+        "number_of_rows": 1,
+        "number_of_columns": N_b,
+        "hole_diameter": d + 2,
+        "strength_of_connection": float(results["strength_of_connection"][i]),
+        "yield_strength_plate_1": table.fy_plate,
+        "yield_strength_plate_2": table.fy_plate,
+        "length_of_connection": 2 * e + (N_b - 1) * p,
+        "efficiency_of_connection": float(results["efficiency_of_connection"][i]),
+    }
+
+
+def empty_structured(n):
+    """
+    Return a structured result array of n invalid rows, ready to be filled.
+    :param n: Number of rows
+    :return: Array of DESIGN_DTYPE
+    """
+    designs = np.zeros(n, dtype=DESIGN_DTYPE)
+    designs["index"] = np.arange(n)
+    designs["status"] = STATUS_INVALID
+    designs["candidate_index"] = -1
+    for name in DESIGN_DTYPE.names:
+        if DESIGN_DTYPE[name].kind == "f":
+            designs[name] = np.nan
+    return designs
+
+
+def fill_structured(designs, rows, P, w, t1, t2):
+    """
+    Design some rows of a structured result array in place.
+    :param designs: Array of DESIGN_DTYPE
+    :param rows: Positions of the rows to design
+    :param P: Tensile forces in kN, one per row
+    :param w: Widths of the plates in mm
+    :param t1: Thicknesses of plate 1 in mm
+    :param t2: Thicknesses of plate 2 in mm
+    :raises ValueError: If any input is invalid
+    """
+    results = design_lap_joint_batch(P, w, t1, t2)
+    P, w, t1, t2 = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (P, w, t1, t2)))
+    found = results["found"]
+
+    part = designs[rows]
+    part["load"], part["width"], part["thickness1"], part["thickness2"] = P, w, t1, t2
+    part["status"] = np.where(found, STATUS_DESIGNED, STATUS_NO_DESIGN)
+    part["candidate_index"] = results["candidate_index"]
+    part["number_of_rows"] = results["number_of_rows"]
+    part["yield_strength_plate"] = results["yield_strength_plate_1"]
+    for name in ("bolt_diameter", "bolt_grade", "number_of_bolts", "pitch_distance", "gauge_distance",
+                 "end_distance", "strength_of_connection", "length_of_connection", "efficiency_of_connection"):
+        part[name] = results[name]
+    designs[rows] = part
+
+
+def design_lap_joint_structured(P, w, t1, t2):
+    """
+    Design many bolted lap joints and return a compact structured array.
+    :param P: Tensile forces in kN
+    :param w: Widths of the plates in mm
+    :param t1: Thicknesses of plate 1 in mm
+    :param t2: Thicknesses of plate 2 in mm
+    :return: Array of DESIGN_DTYPE with one row per record; the status column is
+             STATUS_NO_DESIGN where no suitable design exists
+    :raises ValueError: For the first invalid record, naming its index
+    """
+    n = np.broadcast(*(np.asarray(a) for a in (P, w, t1, t2))).size
+    designs = empty_structured(n)
+    fill_structured(designs, slice(None), *(np.ravel(a) for a in np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (P, w, t1, t2)))))
+    return designs
+
+
+def _catalogue_value(value):
+    """Return a stored float as the int a catalogue would hold when it is integral."""
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def record_from_structured(designs, i):
+    """
+    Convert one row of a structured result array into a DesignRecord.
+    The record is rebuilt from the stored columns, so a file decodes to the same
+    design under any catalogue. When the row's candidate in the active capacity
+    table has the stored diameter, grade and plate strength, its values are used
+    instead so that record.as_dict() equals the design_lap_joint result, types included.
+    :param designs: Array of DESIGN_DTYPE, possibly memory-mapped
+    :param i: Row position
+    :return: DesignRecord, or None if the row has no design
+    """
+    row = designs[i]
+    if row["status"] != STATUS_DESIGNED:
+        return None
+
+    d = float(row["bolt_diameter"])
+    grade = float(row["bolt_grade"])
+    fy_plate = float(row["yield_strength_plate"])
+    table = get_capacity_table()
+    position = int(row["candidate_index"])
+    candidate = table.candidates[position] if 0 <= position < len(table.candidates) else None
+    if (candidate is not None and candidate.bolt_diameter == d and candidate.bolt_grade == grade
+            and table.fy_plate == fy_plate):
+        d, grade, fy_plate = candidate.bolt_diameter, candidate.bolt_grade, table.fy_plate
+        p, e = candidate.pitch_distance, candidate.end_distance
+    else:
+        d, grade, fy_plate = _catalogue_value(d), grade, _catalogue_value(fy_plate)
+        p, e = float(row["pitch_distance"]), float(row["end_distance"])
+
+    N_b = int(row["number_of_bolts"])
+    return DesignRecord(
+        d,
+        grade,
+        N_b,
+        int(row["number_of_rows"]),
+        p,
+        float(row["gauge_distance"]),
+        e,
+        float(row["strength_of_connection"]),
+        fy_plate,
+        2 * e + (N_b - 1) * p,
+        float(row["efficiency_of_connection"]),
+    )
+
+
+def structured_results(designs):
+    """
+    View a structured result array as the output objects of batch JSONL mode.
+    Error messages of invalid input records are not stored in the array, so they
+    are reported generically.
+    :param designs: Array of DESIGN_DTYPE, possibly memory-mapped
+    :return: Generator of dictionaries with an "index" and either "design" or "error"
+    """
+    for i in range(len(designs)):
+        index = int(designs["index"][i])
+        record = record_from_structured(designs, i)
+        if record is not None:
+            yield {"index": index, "design": record.as_dict()}
+        elif designs["status"][i] == STATUS_NO_DESIGN:
+            yield {"index": index, "error": _NO_DESIGN}
+        else:
+            yield {"index": index, "error": "Invalid input record"}
+
+
+# Bytes reserved for a .npy header, enough for DESIGN_DTYPE with any row count
+_NPY_HEADER_SIZE = 1024
+
+
+def _npy_header(dtype, count):
+    """Return a version 1.0 .npy header of exactly _NPY_HEADER_SIZE bytes."""
+    header = repr({"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": (count,)})
+    prefix = b"\x93NUMPY\x01\x00"
+    padding = _NPY_HEADER_SIZE - len(prefix) - 2 - len(header) - 1
+    if padding < 0:
+        raise ValueError("Row layout is too large for the reserved .npy header")
+    return prefix + struct.pack("<H", _NPY_HEADER_SIZE - len(prefix) - 2) + (header + " " * padding + "\n").encode("latin1")
+
+
+class StructuredWriter:
+    """
+    Write structured result arrays chunk by chunk to a .npy or .npz file.
+    Rows are appended behind a reserved header that is completed with the final
+    row count on close, so memory use does not grow with the number of records.
+    A .npz file is assembled from the finished .npy data when the writer closes.
+    """
+
+    def __init__(self, path, dtype=DESIGN_DTYPE):
+        """
+        Open the output.
+        :param path: Output path; a .npz extension selects a compressed archive
+        :param dtype: Row layout of the arrays that will be written
+        """
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.count = 0
+        self._archive = path.lower().endswith(".npz")
+        if self._archive:
+            self._file = tempfile.TemporaryFile(dir=os.path.dirname(os.path.abspath(path)))
+        else:
+            self._file = open(path, "wb")
+        self._file.write(_npy_header(self.dtype, 0))
+
+    def write(self, designs):
+        """Append the rows of a structured array."""
+        self._file.write(np.ascontiguousarray(designs, dtype=self.dtype).tobytes())
+        self.count += len(designs)
+
+    def close(self):
+        """Complete the header with the row count and close the file."""
+        if self._file is None:
+            return
+        self._file.seek(0)
+        self._file.write(_npy_header(self.dtype, self.count))
+        if self._archive:
+            self._file.seek(0)
+            with zipfile.ZipFile(self.path, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+                with archive.open("designs.npy", "w", force_zip64=True) as member:
+                    shutil.copyfileobj(self._file, member)
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def save_designs(path, designs):
+    """
+    Save a structured result array as .npy, or as a compressed .npz archive.
+    :param path: Output path
+    :param designs: Array of DESIGN_DTYPE
+    """
+    with StructuredWriter(path, designs.dtype) as writer:
+        writer.write(designs)
+
+
+def load_designs(path, mmap=True):
+    """
+    Load a structured result array saved by save_designs or StructuredWriter.
+    :param path: Path of a .npy or .npz file
+    :param mmap: Memory-map a .npy file read-only instead of reading it into memory;
+                 .npz archives are always read into memory
+    :return: Array of DESIGN_DTYPE
+    """
+    if path.lower().endswith(".npz"):
+        with np.load(path) as archive:
+            return archive["designs"]
+    return np.load(path, mmap_mode="r" if mmap else None)
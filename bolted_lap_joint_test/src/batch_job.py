@@ -0,0 +1,206 @@
+"""
+Resumable batch design jobs.
+A batch job streams the records of an input file through the chunked batch
+pipeline of stream_design and appends the JSON results to an output file. The
+ranges of input records that are done and the length of the output holding
+their results are checkpointed next to the output, so a job that is killed
+partway through is restarted with the same job spec and skips the completed
+chunks. Each chunk is appended with one write and the checkpoint only counts
+output that was flushed to disk, so a torn write at the end of the output is
+cut off when the job resumes.
+"""
+
+import bisect
+import json
+import os
+import time
+
+from design_cache import rules_version
+from stream_design import DEFAULT_CHUNK_SIZE, _chunked, _serialize_chunk, detect_format, read_raw
+
+CHECKPOINT_SUFFIX = ".checkpoint"
+
+# Seconds between checkpoints; each one costs an fsync of the output and the checkpoint file
+DEFAULT_CHECKPOINT_INTERVAL = 2.0
+
+
+def job_spec(input_path, fmt=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Describe a batch job, so that a checkpoint is only resumed by the same job.
+    The spec covers the input file (by path, size and modification time), the
+    record format, the chunk size that numbers the chunks and the design rules.
+    :param input_path: Input CSV or JSONL file
+    :param fmt: Record format ('csv' or 'jsonl', detected from the file name by default)
+    :param chunk_size: Number of records designed per vectorized call
+    :return: JSON-serializable dictionary
+    """
+    stat = os.stat(input_path)
+    return {
+        "input": os.path.abspath(input_path),
+        "input_size": stat.st_size,
+        "input_mtime_ns": stat.st_mtime_ns,
+        "format": fmt or detect_format(input_path),
+        "chunk_size": chunk_size,
+        "rules_version": rules_version(),
+    }
+
+
+def _add_range(ranges, start, stop):
+    """Insert [start, stop) into a sorted list of disjoint [start, stop] pairs, merging neighbours."""
+    i = bisect.bisect_left(ranges, [start, stop])
+    if i > 0 and ranges[i - 1][1] >= start:
+        i -= 1
+        ranges[i][1] = max(ranges[i][1], stop)
+    else:
+        ranges.insert(i, [start, stop])
+    while i + 1 < len(ranges) and ranges[i + 1][0] <= ranges[i][1]:
+        ranges[i][1] = max(ranges[i][1], ranges.pop(i + 1)[1])
+
+
+def _is_done(ranges, start, stop):
+    """Return True if [start, stop) lies within one of the ranges."""
+    i = bisect.bisect_right(ranges, [start, float("inf")]) - 1
+    return i >= 0 and ranges[i][1] >= stop
+
+
+def _write_checkpoint(path, checkpoint):
+    """Replace the checkpoint atomically, so an interruption never leaves it half written."""
+    temporary = path + ".tmp"
+    with open(temporary, "w") as f:
+        json.dump(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+
+def read_checkpoint(output_path):
+    """
+    Read the checkpoint of a batch job.
+    :param output_path: Output file of the job
+    :return: Checkpoint dictionary with the job "spec", the "done" record ranges as
+             [start, stop] pairs, the "output_bytes" holding their results, the
+             "records" and "errors" written and whether the job is "complete",
+             or None if the job has no checkpoint
+    """
+    path = output_path + CHECKPOINT_SUFFIX
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_all(fd, data):
+    """Append data to a file descriptor, retrying partial writes."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def run_batch_job(input_path, output_path, fmt=None, chunk_size=DEFAULT_CHUNK_SIZE, preserve_order=True,
+                  workers=1, cache_spec=None, checkpoint_interval=DEFAULT_CHECKPOINT_INTERVAL, restart=False,
+                  progress=None):
+    """
+    Design every record of an input file into a JSONL output file, resuming an interrupted run.
+    A checkpoint with the same job spec (see job_spec) is resumed: the output is cut
+    back to the results it records and only the chunks not yet done are designed.
+    Otherwise, or with restart, the job starts over. Results carry the input "index",
+    so chunks designed out of order or on different runs can be told apart.
+    :param input_path: Input CSV or JSONL file; stdin cannot be resumed and is not accepted
+    :param output_path: Output JSONL file; the checkpoint is written next to it
+    :param fmt: Record format ('csv' or 'jsonl', detected from the file name by default)
+    :param chunk_size: Number of records designed per vectorized call
+    :param preserve_order: See stream_design.design_stream
+    :param workers: Number of worker processes
+    :param cache_spec: Optional (path, max_entries) of a persistent design cache
+    :param checkpoint_interval: Seconds between checkpoints (0 checkpoints after every chunk)
+    :param restart: Discard any stored progress
+    :param progress: Optional callable invoked with (records written, errors) after each checkpoint
+    :return: Summary dictionary with the total "records" and "errors" in the output,
+             the records "designed" and "skipped" on this run, whether the job was
+             "resumed" and the "elapsed" seconds of this run
+    :raises ValueError: For an invalid chunk size, worker count or checkpoint interval
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1")
+    if workers < 1:
+        raise ValueError("Number of workers must be at least 1")
+    if checkpoint_interval < 0:
+        raise ValueError("Checkpoint interval cannot be negative")
+    start_time = time.perf_counter()
+
+    spec = job_spec(input_path, fmt, chunk_size)
+    checkpoint_path = output_path + CHECKPOINT_SUFFIX
+    checkpoint = read_checkpoint(output_path)
+    resume = (not restart and checkpoint is not None and checkpoint["spec"] == spec
+              and os.path.exists(output_path) and os.path.getsize(output_path) >= checkpoint["output_bytes"])
+    if not resume:
+        checkpoint = {"spec": spec, "done": [], "output_bytes": 0, "records": 0, "errors": 0, "complete": False}
+        # Mark the job as not started before the output is replaced
+        _write_checkpoint(checkpoint_path, checkpoint)
+
+    summary = {"records": checkpoint["records"], "errors": checkpoint["errors"], "designed": 0, "skipped": 0,
+               "resumed": resume}
+    if checkpoint["complete"]:
+        summary["skipped"] = checkpoint["records"]
+        summary["elapsed"] = time.perf_counter() - start_time
+        return summary
+
+    done = checkpoint["done"]
+    # Results appended since the last checkpoint, as (start, stop, records, errors, bytes)
+    unrecorded = []
+
+    def save(complete=False):
+        if unrecorded:
+            os.fsync(fd)
+            for start, stop, records, errors, size in unrecorded:
+                _add_range(done, start, stop)
+                checkpoint["records"] += records
+                checkpoint["errors"] += errors
+                checkpoint["output_bytes"] += size
+            unrecorded.clear()
+        checkpoint["complete"] = complete
+        _write_checkpoint(checkpoint_path, checkpoint)
+
+    def pending_payloads(input_stream):
+        for start, chunk in _chunked(read_raw(input_stream, spec["format"]), chunk_size):
+            if _is_done(done, start, start + len(chunk)):
+                summary["skipped"] += len(chunk)
+                continue
+            yield (start, len(chunk)), (start, chunk, preserve_order, cache_spec)
+
+    fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o666)
+    try:
+        # Cut off results written after the last checkpoint; their chunks are designed again
+        os.ftruncate(fd, checkpoint["output_bytes"])
+        with open(input_path, newline="") as input_stream:
+            if workers > 1:
+                from parallel_design import imap_chunks
+
+                results = imap_chunks(_serialize_chunk, pending_payloads(input_stream), workers, preserve_order)
+            else:
+                results = ((tag, _serialize_chunk(payload)) for tag, payload in pending_payloads(input_stream))
+
+            last_save = time.perf_counter()
+            for (start, count), (text, records, errors) in results:
+                data = text.encode()
+                _write_all(fd, data)
+                unrecorded.append((start, start + count, records, errors, len(data)))
+                summary["designed"] += records
+                if time.perf_counter() - last_save >= checkpoint_interval:
+                    save()
+                    last_save = time.perf_counter()
+                    if progress is not None:
+                        progress(checkpoint["records"], checkpoint["errors"])
+        save(complete=True)
+        if progress is not None:
+            progress(checkpoint["records"], checkpoint["errors"])
+    finally:
+        # Record what was written before an interruption, so it is not designed again
+        if not checkpoint["complete"]:
+            save()
+        os.close(fd)
+
+    summary["records"] = checkpoint["records"]
+    summary["errors"] = checkpoint["errors"]
+    summary["elapsed"] = time.perf_counter() - start_time
+    return summary
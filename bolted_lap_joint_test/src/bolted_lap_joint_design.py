@@ -1,4 +1,74 @@
+import contextvars
 import math
+import time
+from collections import namedtuple
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+
+from catalogue import load_catalogue
+
+
+class DesignStats:
+    """
+    Counters and timings collected by one instrumented design_lap_joint call.
+    Instrumentation is only active while a DesignStats is being filled, so
+    uninstrumented designs pay no more than a few None checks.
+    The capacities come from the capacity table shared by every design in the
+    process, so clause_calls counts the clause formulas actually computed: the
+    shear capacities when the table is built and the bearing capacities that
+    miss its cache. A design on a warm table looks up one shear capacity per
+    candidate evaluated and one bearing capacity per cache hit or miss. The
+    bearing cache counters are differences of the shared cache, so designs run
+    concurrently in other threads are counted too.
+    """
+
+    def __init__(self):
+        self.candidates_evaluated = 0
+        self.rejected_by_utilization = 0
+        self.improvements = 0  # Times a better design (or a new Pareto design) was found
+        self.clause_calls = {
+            "cl_10_3_3_bolt_shear_capacity": 0,
+            "cl_10_3_4_bolt_bearing_capacity": 0,
+        }
+        self.bearing_cache_hits = 0
+        self.bearing_cache_misses = 0
+        self.phase_times = {}  # Phase name -> seconds
+
+    @property
+    def bearing_cache_hit_rate(self):
+        lookups = self.bearing_cache_hits + self.bearing_cache_misses
+        return self.bearing_cache_hits / lookups if lookups else 0.0
+
+    def as_dict(self):
+        return {
+            "candidates_evaluated": self.candidates_evaluated,
+            "rejected_by_utilization": self.rejected_by_utilization,
+            "improvements": self.improvements,
+            "clause_calls": dict(self.clause_calls),
+            "bearing_cache_hits": self.bearing_cache_hits,
+            "bearing_cache_misses": self.bearing_cache_misses,
+            "bearing_cache_hit_rate": self.bearing_cache_hit_rate,
+            "phase_times": dict(self.phase_times),
+        }
+
+    def __str__(self):
+        rows = [
+            ("Candidates evaluated", self.candidates_evaluated),
+            ("Rejected by utilization", self.rejected_by_utilization),
+            ("Improvements", self.improvements),
+            ("Bearing cache", f"{self.bearing_cache_hits} hits, {self.bearing_cache_misses} misses "
+                              f"({self.bearing_cache_hit_rate:.0%} hit rate)"),
+        ]
+        rows += [(f"Computed {name}", calls) for name, calls in self.clause_calls.items()]
+        rows += [(f"Time in {phase}", f"{seconds * 1e6:.1f} us") for phase, seconds in self.phase_times.items()]
+        return "\n".join(f"{label + ':':<45}{value}" for label, value in rows)
+
+
+# Stats being filled by the design in progress, if it is instrumented; a context
+# variable, so designs in other threads or asyncio tasks do not fill them
+_active_stats = contextvars.ContextVar("_active_stats", default=None)
+
 
 class IS800_2007:
     @staticmethod
@@ -15,6 +85,10 @@ class IS800_2007:
         """
         # Simplified implementation for demonstration
         # In a real implementation, this would follow the actual IS 800:2007 formula
+        stats = _active_stats.get()
+        if stats is not None:
+            stats.clause_calls["cl_10_3_3_bolt_shear_capacity"] += 1
+
         gamma_mb = 1.25  # Partial safety factor for bolt material
         f_ub = bolt_fy * 1.1  # Ultimate strength is approx 1.1 times yield strength
         
@@ -54,6 +128,10 @@ class IS800_2007:
         """
         # Simplified implementation for demonstration
         # In a real implementation, this would follow the actual IS 800:2007 formula
+        stats = _active_stats.get()
+        if stats is not None:
+            stats.clause_calls["cl_10_3_4_bolt_bearing_capacity"] += 1
+
         gamma_mb = 1.25  # Partial safety factor for bolt material
         
         # Calculate k1 (simplified)
@@ -73,17 +151,340 @@ class IS800_2007:
         
         return V_dpb
 
-def design_lap_joint(P, w, t1, t2):
+# Available data, loaded from the catalogue file (see catalogue.py and use_catalogue)
+CATALOGUE = load_catalogue()
+BOLT_DIAMETERS = list(CATALOGUE.bolt_diameters)  # Bolt diameters in mm
+BOLT_GRADES = list(CATALOGUE.bolt_grades)  # Bolt grades
+PLATE_GRADE_LIST = CATALOGUE.plate_grade_names  # Plate grades, weakest first
+
+# Define a mapping from plate grade to yield and ultimate strength
+PLATE_GRADES = CATALOGUE.plate_strengths
+
+# Maximum number of (diameter, thickness) bearing capacities kept per table
+BEARING_CACHE_SIZE = 1024
+
+# One candidate of the bolt catalogue with its load-independent properties
+BoltCandidate = namedtuple("BoltCandidate", [
+    "bolt_diameter",
+    "bolt_grade",
+    "bolt_fu",
+    "bolt_fy",
+    "bolt_area",
+    "shear_capacity",
+    "end_distance",
+    "pitch_distance",
+])
+
+
+
+class DesignRecord(namedtuple("DesignRecord", [
+    "bolt_diameter",
+    "bolt_grade",
+    "number_of_bolts",
+    "number_of_rows",
+    "pitch_distance",
+    "gauge_distance",
+    "end_distance",
+    "strength_of_connection",
+    "yield_strength_plate",
+    "length_of_connection",
+    "efficiency_of_connection",
+])):
     """
-    Design a bolted lap joint connecting two plates.
+    Compact form of a design, without the fields that duplicate others.
+    The edge distance equals the end distance, both plates share one yield
+    strength, the hole is 2 mm larger than the bolt and the number of columns
+    follows from the number of bolts and rows. as_dict restores the full
+    dictionary returned by design_lap_joint.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, design):
+        """Build a record from a design dictionary."""
+        return cls(
+            design["bolt_diameter"],
+            design["bolt_grade"],
+            design["number_of_bolts"],
+            design["number_of_rows"],
+            design["pitch_distance"],
+            design["gauge_distance"],
+            design["end_distance"],
+            design["strength_of_connection"],
+            design["yield_strength_plate_1"],
+            design["length_of_connection"],
+            design["efficiency_of_connection"],
+        )
+
+    def as_dict(self):
+        """Return the design dictionary, with the same keys, values and types as design_lap_joint."""
+        return {
+            "bolt_diameter": self.bolt_diameter,
+            "bolt_grade": self.bolt_grade,
+            "number_of_bolts": self.number_of_bolts,
+            "pitch_distance": self.pitch_distance,
+            "gauge_distance": self.gauge_distance,
+            "end_distance": self.end_distance,
+            "edge_distance": self.end_distance,
+            "number_of_rows": self.number_of_rows,
+            "number_of_columns": self.number_of_bolts // self.number_of_rows,
+            "hole_diameter": self.bolt_diameter + 2,
+            "strength_of_connection": self.strength_of_connection,
+            "yield_strength_plate_1": self.yield_strength_plate,
+            "yield_strength_plate_2": self.yield_strength_plate,
+            "length_of_connection": self.length_of_connection,
+            "efficiency_of_connection": self.efficiency_of_connection,
+        }
+
+
+class CapacityTable:
+    """
+    Precomputed bolt capacities for one bolt catalogue and design setting.
+    Shear capacities are computed once per (diameter, grade) pair when the table
+    is built. Bearing capacities depend on the plate thickness and are computed on
+    demand, with a bounded LRU cache per (diameter, minimum thickness).
+    """
+
+    def __init__(self, bolt_diameters, bolt_grades, plate_grade, hole_type, connection_location):
+        """
+        Build the table.
+        :param bolt_diameters: Bolt diameters in mm, in search order
+        :param bolt_grades: Bolt grades, in search order
+        :param plate_grade: Plate grade name (e.g., "E410")
+        :param hole_type: Type of hole ('Standard' or 'Oversized')
+        :param connection_location: Location of the connection ('Field' or 'Shop')
+        """
+        if plate_grade not in PLATE_GRADES:
+            raise ValueError(f"Unknown plate grade: {plate_grade}")
+
+        self.key = (tuple(bolt_diameters), tuple(bolt_grades), plate_grade, hole_type, connection_location)
+        self.plate_grade = plate_grade
+        self.hole_type = hole_type
+        self.connection_location = connection_location
+        self.fy_plate, self.fu_plate = PLATE_GRADES[plate_grade]
+
+        # Strengths depend only on the grade and areas only on the diameter
+        strengths = {GB: calculate_bolt_strength(GB) for GB in bolt_grades}
+        candidates = []
+        for d in bolt_diameters:
+            A_bolt = math.pi * (d / 2) ** 2  # Cross-sectional area of the bolt
+            e = max(d + 5, 1.5 * d)  # End distance (typically 5 mm larger than bolt diameter or 1.5 times diameter)
+            p = max(d + 10, 2.5 * d)  # Pitch distance (typically 10 mm larger than bolt diameter or 2.5 times diameter)
+            for GB in bolt_grades:
+                bolt_fu, bolt_fy = strengths[GB]
+                V_b = IS800_2007.cl_10_3_3_bolt_shear_capacity(bolt_fy, A_bolt, A_bolt, 0, 0, connection_location)
+                candidates.append(BoltCandidate(d, GB, bolt_fu, bolt_fy, A_bolt, V_b, e, p))
+        self.candidates = tuple(candidates)
+        self._build_index(len(bolt_diameters), len(bolt_grades))
+
+        self._bearing_cache = lru_cache(maxsize=BEARING_CACHE_SIZE)(self._compute_bearing_capacity)
+
+    def _build_index(self, n_diameters, n_grades):
+        """
+        Index the candidates by diameter for search_order.
+        Candidates are grouped by diameter, and each group keeps the length of a
+        two-bolt connection (which no candidate of the group can beat) and its
+        strongest shear capacity. The running maximum of the strongest shear
+        capacities locates the first diameter that carries a load with two bolts.
+        The index needs increasing diameters, so that the end and pitch distances
+        increase too; other tables are searched without it.
+        """
+        diameters = [self.candidates[g * n_grades].bolt_diameter for g in range(n_diameters)]
+        self.indexed = n_grades > 0 and all(a < b for a, b in zip(diameters, diameters[1:]))
+        self._diameters = array('d')
+        self._two_bolt_lengths = array('d')
+        self._strongest_shear = array('d')
+        self._shear_reach = array('d')
+        self._groups = []  # Candidate positions of each diameter, strongest shear capacity first
+        self._group_shear = []  # Negated shear capacities of each group, in the same order
+        self._shear_per_area = 0.0  # Largest strongest shear capacity divided by d^2
+        for g in range(n_diameters if self.indexed else 0):
+            positions = range(g * n_grades, (g + 1) * n_grades)
+            d = diameters[g]
+            e = self.candidates[positions[0]].end_distance
+            p = self.candidates[positions[0]].pitch_distance
+            strongest = max(self.candidates[i].shear_capacity for i in positions)
+            self._diameters.append(d)
+            self._two_bolt_lengths.append(2 * e + (2 - 1) * p)
+            self._strongest_shear.append(strongest)
+            self._shear_reach.append(max(strongest, self._shear_reach[-1] if g else 0.0))
+            group = sorted(positions, key=lambda i: -self.candidates[i].shear_capacity)
+            self._groups.append(tuple(group))
+            self._group_shear.append(array('d', [-self.candidates[i].shear_capacity for i in group]))
+            self._shear_per_area = max(self._shear_per_area, strongest / (d * d))
+
+    def search_order(self, P_N, t_min, best):
+        """
+        Yield the candidates a shortest-connection search has to evaluate.
+        The search jumps to the first diameter whose strongest grade carries the
+        load with two bolts and works down through the smaller diameters, then up
+        through the larger ones. Every feasible design is at least N_b * p long,
+        with p >= 2.5 d and N_b at least the load over the shear and the bearing
+        capacity of one bolt. This bounds all smaller diameters at once and ends
+        the downward pass, and the two-bolt length ends the upward pass. Diameters
+        and grades that cannot beat the best design are skipped (see _search_group),
+        so the result equals a scan of every candidate that keeps the first shortest
+        design. Without an index every candidate is yielded.
+        :param P_N: Load in N
+        :param t_min: Thickness of the thinner plate in mm
+        :param best: Callable returning the (length, position) of the best design so far
+        :return: Generator of (position in candidates, BoltCandidate) pairs
+        """
+        if not self.indexed:
+            yield from enumerate(self.candidates)
+            return
+
+        n_groups = len(self._groups)
+        jump = min(bisect_left(self._shear_reach, P_N / 1.5), n_groups - 1)
+
+        # Clause 10.3.4 bearing capacity per mm of bolt diameter with k1 at its cap of 1
+        k2 = 0.7 if self.hole_type == 'Oversized' else 0.9
+        bearing_per_mm = 2.5 * k2 * self.fu_plate * t_min / 1.25
+        if self.connection_location == 'Field':
+            bearing_per_mm *= 0.9
+        bearing_floor = P_N * 2.5 / (0.75 * bearing_per_mm)
+        # Bounds are relaxed slightly so that rounding can never prune the best design
+        slack = 1 + 1e-9
+
+        for g in range(jump, -1, -1):
+            shear_floor = P_N * 2.5 / (0.75 * self._shear_per_area * self._diameters[g])
+            if max(shear_floor, bearing_floor) > best()[0] * slack:
+                break
+            yield from self._search_group(g, P_N, t_min, best)
+
+        for g in range(jump + 1, n_groups):
+            best_length = best()[0]
+            if self._two_bolt_lengths[g] >= best_length or bearing_floor > best_length * slack:
+                break
+            yield from self._search_group(g, P_N, t_min, best)
+
+    def _search_group(self, g, P_N, t_min, best):
+        """
+        Yield the candidates of one diameter that may beat the best design.
+        Grades are visited strongest first, so each needs at least as many bolts as
+        the one before; the group ends at the first grade that needs a longer
+        connection than the best. Grades too strong to use the bolts bearing needs
+        are jumped over, and the others failing the utilization check are skipped.
+        """
+        positions = self._groups[g]
+        first = self.candidates[positions[0]]
+        e = first.end_distance
+        p = first.pitch_distance
+        V_dpb = self.bearing_capacity(first.bolt_diameter, t_min)
+
+        # The whole diameter is skipped if its strongest grade cannot win, counting
+        # the bolts bearing needs less one, so that rounding cannot matter
+        N_bearing = math.ceil(P_N / (V_dpb * 0.75)) - 1
+        N_b = max(math.ceil(P_N / (self._strongest_shear[g] * 0.75)), N_bearing, 2)
+        if (2 * e + (N_b - 1) * p, min(positions)) > best():
+            return
+
+        # Grades stronger than this use fewer than N_bearing bolts
+        first_grade = 0
+        if N_bearing > 2:
+            first_grade = bisect_left(self._group_shear[g], -P_N / (0.75 * (N_bearing - 1)) * (1 + 1e-9))
+
+        for position in positions[first_grade:]:
+            candidate = self.candidates[position]
+            N_b = max(math.ceil(P_N / (candidate.shear_capacity * 0.75)), 2)
+            if 2 * e + (N_b - 1) * p > best()[0]:
+                return
+            # Same check as the design search, so infeasible grades are never yielded
+            if P_N / (N_b * min(candidate.shear_capacity, V_dpb) * 0.75) > 1:
+                continue
+            yield position, candidate
+
+    def _compute_bearing_capacity(self, d, plate_thickness):
+        """Compute the clause 10.3.4 bearing capacity for one diameter and thickness."""
+        e = max(d + 5, 1.5 * d)
+        p = max(d + 10, 2.5 * d)
+        # Clause 10.3.4 does not use the bolt yield strength, so one value
+        # per (diameter, thickness) serves every bolt grade
+        return IS800_2007.cl_10_3_4_bolt_bearing_capacity(
+            self.fu_plate, None, plate_thickness, d, e, p, self.hole_type, self.connection_location
+        )
+
+    def bearing_capacity(self, d, plate_thickness):
+        """
+        Return the bearing capacity of one bolt, using the LRU cache.
+        :param d: Bolt diameter in mm
+        :param plate_thickness: Thickness of the thinner plate in mm
+        :return: Bearing capacity of the bolt in N
+        """
+        return self._bearing_cache(d, plate_thickness)
+
+    def bearing_cache_info(self):
+        """Return the functools cache statistics of the bearing capacity cache."""
+        return self._bearing_cache.cache_info()
+
+    def as_rows(self):
+        """Return the table as a list of dictionaries, one per candidate, for inspection."""
+        return [candidate._asdict() for candidate in self.candidates]
+
+
+_capacity_tables = {}
+
+
+def get_capacity_table(bolt_diameters=None, bolt_grades=None, plate_grade=None,
+                       hole_type='Standard', connection_location='Field'):
+    """
+    Return the capacity table for a design setting, building it on first use.
+    Tables are kept for the lifetime of the process until clear_capacity_tables is called.
+    :param bolt_diameters: Bolt diameters in mm (defaults to BOLT_DIAMETERS)
+    :param bolt_grades: Bolt grades (defaults to BOLT_GRADES)
+    :param plate_grade: Plate grade name (defaults to the highest grade)
+    :param hole_type: Type of hole ('Standard' or 'Oversized')
+    :param connection_location: Location of the connection ('Field' or 'Shop')
+    :return: CapacityTable instance
+    """
+    key = (
+        tuple(BOLT_DIAMETERS if bolt_diameters is None else bolt_diameters),
+        tuple(BOLT_GRADES if bolt_grades is None else bolt_grades),
+        PLATE_GRADE_LIST[-1] if plate_grade is None else plate_grade,
+        hole_type,
+        connection_location,
+    )
+    table = _capacity_tables.get(key)
+    if table is None:
+        table = CapacityTable(*key)
+        _capacity_tables[key] = table
+    return table
+
+
+def clear_capacity_tables():
+    """Discard every cached capacity table, e.g. after changing the catalogues."""
+    _capacity_tables.clear()
+
+
+def use_catalogue(path=None):
+    """
+    Switch the bolt and plate catalogues to a catalogue file.
+    The module catalogue lists are updated in place, so modules that imported them
+    see the change, and every capacity table is discarded. Call this before
+    designing; worker processes pick the file up from $LAP_JOINT_CATALOGUE.
+    :param path: JSON catalogue file (see catalogue.load_catalogue for the default)
+    :return: The loaded Catalogue
+    """
+    global CATALOGUE
+    CATALOGUE = load_catalogue(path)
+    BOLT_DIAMETERS[:] = CATALOGUE.bolt_diameters
+    BOLT_GRADES[:] = CATALOGUE.bolt_grades
+    PLATE_GRADE_LIST[:] = CATALOGUE.plate_grade_names
+    PLATE_GRADES.clear()
+    PLATE_GRADES.update(CATALOGUE.plate_strengths)
+    clear_capacity_tables()
+    return CATALOGUE
+
+
+def validate_design_inputs(P, w, t1, t2):
+    """
+    Check the design inputs and raise ValueError for invalid or unreasonable values.
     :param P: Tensile force in kN
     :param w: Width of the plates in mm
     :param t1: Thickness of plate 1 in mm
     :param t2: Thickness of plate 2 in mm
-    :return: Dictionary of design parameters and results
     """
-    
-    # Validate input parameters
     if P < 0:
         raise ValueError("Tensile force P cannot be negative")
     
@@ -103,80 +504,208 @@ def design_lap_joint(P, w, t1, t2):
     if t1 > 100 or t2 > 100:
         raise ValueError("Plate thickness is too large (> 100 mm), please check your input")
 
-    # Convert tensile force to Newtons
-    P_N = P * 1000
 
-    # Available data
-    d_list = [10, 12, 16, 20, 24]  # Bolt diameters in mm
-    GB_list = [3.6, 4.6, 4.8, 5.6, 5.8]  # Bolt grades
-    GP_list = ["E250", "E275", "E300", "E350", "E410"]  # Plate grades
+class ParetoFront:
+    """
+    Online filter that keeps the non-dominated items seen so far.
+    Every objective is minimized. An item is dominated when another item is no
+    worse in every objective and strictly better in at least one. Each new item
+    is compared only against the current front, so dominated candidates never
+    need to be collected or sorted.
+    """
+
+    def __init__(self):
+        self._entries = []  # (objectives, item) pairs, in insertion order
+
+    @staticmethod
+    def dominates(a, b):
+        """Return True if objective vector a dominates objective vector b."""
+        return all(x <= y for x, y in zip(a, b)) and a != b
+
+    def is_dominated(self, objectives):
+        """Return True if an item on the front dominates these objectives."""
+        return any(self.dominates(entry, objectives) for entry, _ in self._entries)
+
+    def add(self, objectives, item):
+        """
+        Offer an item to the front.
+        :param objectives: Tuple of objective values, all minimized
+        :param item: Item stored with the objectives
+        :return: True if the item joined the front
+        """
+        if self.is_dominated(objectives):
+            return False
+        self._entries = [(entry, kept) for entry, kept in self._entries if not self.dominates(objectives, entry)]
+        self._entries.append((objectives, item))
+        return True
+
+    def items(self):
+        """Return the items on the front, in insertion order."""
+        return [item for _, item in self._entries]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def pareto_objectives(design):
+    """
+    Return the objectives a design is compared on in Pareto mode, all minimized:
+    connection length, number of bolts, bolt grade (as a proxy for bolt cost) and
+    utilization ratio (a lower ratio leaves more reserve capacity).
+    """
+    return (
+        design["length_of_connection"],
+        design["number_of_bolts"],
+        design["bolt_grade"],
+        design["efficiency_of_connection"],
+    )
+
+
+def design_lap_joint(P, w, t1, t2, pareto=False, return_stats=False, compact=False):
+    """
+    Design a bolted lap joint connecting two plates.
+    :param P: Tensile force in kN
+    :param w: Width of the plates in mm
+    :param t1: Thickness of plate 1 in mm
+    :param t2: Thickness of plate 2 in mm
+    :param pareto: If True, return every feasible design that is not dominated on
+                   connection length, number of bolts, bolt grade and utilization
+                   (see pareto_objectives), sorted by connection length
+    :param return_stats: If True, also return a DesignStats describing the search
+    :param compact: If True, return DesignRecord tuples instead of dictionaries
+    :return: Dictionary of design parameters and results, or a list of them in Pareto
+             mode; with return_stats, a tuple (result, DesignStats)
+    """
+    if return_stats:
+        stats = DesignStats()
+        token = _active_stats.set(stats)
+        try:
+            result = _design_lap_joint(P, w, t1, t2, pareto, stats)
+        finally:
+            _active_stats.reset(token)
+    else:
+        result = _design_lap_joint(P, w, t1, t2, pareto, None)
+
+    if compact:
+        result = [DesignRecord.from_dict(design) for design in result] if pareto else DesignRecord.from_dict(result)
+    return (result, stats) if return_stats else result
+
+
+def _design_lap_joint(P, w, t1, t2, pareto, stats):
+    """Search the candidates for design_lap_joint, filling stats if it is not None."""
+    if stats is not None:
+        start = time.perf_counter()
+    
+    # Validate input parameters
+    validate_design_inputs(P, w, t1, t2)
 
-    # Define a mapping from plate grade to yield and ultimate strength
-    plate_grades = {
-        "E250": (250, 410),
-        "E275": (275, 440),
-        "E300": (300, 470),
-        "E350": (350, 510),
-        "E410": (410, 550)
-    }
+    # Convert tensile force to Newtons
+    P_N = P * 1000
 
-    # Select the best plate grade based on the given thicknesses
-    plate_grade = GP_list[-1]  # Choose the highest grade for the design
-    fy_plate, fu_plate = plate_grades[plate_grade]  # Get the yield and ultimate strengths for the chosen grade
+    # Shear capacities of every (diameter, grade) pair do not depend on the load,
+    # so they come from the capacity table built once per process
+    if stats is not None:
+        stats.phase_times["validation"] = time.perf_counter() - start
+        start = time.perf_counter()
+    table = get_capacity_table()
+    fy_plate = table.fy_plate
+    t_min = min(t1, t2)
 
     # Initialize variables to store the best design
     best_design = None
     min_length = float('inf')
+    best_position = len(table.candidates)
+    front = ParetoFront() if pareto else None
+    rejected = 0
+    evaluated = 0
+    improvements = 0
+    if stats is not None:
+        stats.phase_times["capacity_table"] = time.perf_counter() - start
+        cache_before = table.bearing_cache_info()
+        start = time.perf_counter()
 
-    for d in d_list:
-        for GB in GB_list:
-            # Calculate the bolt strength
-            bolt_fu, bolt_fy = calculate_bolt_strength(GB)
-            
-            # Calculate the shear strength of one bolt
-            A_bolt = math.pi * (d / 2) ** 2  # Cross-sectional area of the bolt
-            V_b = IS800_2007.cl_10_3_3_bolt_shear_capacity(bolt_fy, A_bolt, A_bolt, 0, 0, 'Field')  # Shear capacity
-            
-            # Calculate the required number of bolts
-            N_b = math.ceil(P_N / (V_b * 0.75))  # Using a safety factor of 1.33
-            
-            if N_b < 2:
-                N_b = 2  # Ensure at least 2 bolts are used
-
-            # Calculate distances
-            e = max(d + 5, 1.5 * d)  # End distance (typically 5 mm larger than bolt diameter or 1.5 times diameter)
-            p = max(d + 10, 2.5 * d)  # Pitch distance (typically 10 mm larger than bolt diameter or 2.5 times diameter)
-            g = w / 2  # Gauge distance (for simplicity, use half of the plate width)
-
-            # Calculate the length of the connection
-            length_of_connection = 2 * e + (N_b - 1) * p
-
-            # Calculate the bearing strength of the bolt
-            V_dpb = IS800_2007.cl_10_3_4_bolt_bearing_capacity(fu_plate, bolt_fy, min(t1, t2), d, e, p, 'Standard', 'Field')
-
-            # Calculate the efficiency of the connection
-            Utilization_ratio = P_N / (N_b * min(V_b, V_dpb) * 0.75)  # Using a safety factor of 1.33
-            
-            # Check if this design is better
-            if Utilization_ratio <= 1 and length_of_connection < min_length:
-                min_length = length_of_connection
-                best_design = {
-                    "bolt_diameter": d,
-                    "bolt_grade": GB,
-                    "number_of_bolts": N_b,
-                    "pitch_distance": p,
-                    "gauge_distance": g,
-                    "end_distance": e,
-                    "edge_distance": e,
-                    "number_of_rows": 1,  # Simple design assumption, can be improved
-                    "number_of_columns": N_b,  # One column for simplicity
-                    "hole_diameter": d + 2,  # Diameter of hole is slightly larger than the bolt
-                    "strength_of_connection": N_b * min(V_b, V_dpb) * 0.75,  # Strength based on shear capacity
-                    "yield_strength_plate_1": fy_plate,
-                    "yield_strength_plate_2": fy_plate,
-                    "length_of_connection": length_of_connection,
-                    "efficiency_of_connection": Utilization_ratio
-                }
+    # A Pareto front needs every candidate; the shortest design only needs the
+    # candidates the table index cannot rule out
+    if front is not None:
+        candidates = enumerate(table.candidates)
+    else:
+        candidates = table.search_order(P_N, t_min, lambda: (min_length, best_position))
+
+    for position, candidate in candidates:
+        evaluated += 1
+        d = candidate.bolt_diameter
+        V_b = candidate.shear_capacity
+
+        # Calculate the required number of bolts
+        N_b = math.ceil(P_N / (V_b * 0.75))  # Using a safety factor of 1.33
+
+        if N_b < 2:
+            N_b = 2  # Ensure at least 2 bolts are used
+
+        e = candidate.end_distance
+        p = candidate.pitch_distance
+        g = w / 2  # Gauge distance (for simplicity, use half of the plate width)
+
+        # Calculate the length of the connection
+        length_of_connection = 2 * e + (N_b - 1) * p
+
+        # Calculate the bearing strength of the bolt
+        V_dpb = table.bearing_capacity(d, t_min)
+
+        # Calculate the efficiency of the connection
+        Utilization_ratio = P_N / (N_b * min(V_b, V_dpb) * 0.75)  # Using a safety factor of 1.33
+
+        if Utilization_ratio > 1:
+            rejected += 1
+            continue
+
+        if front is not None:
+            objectives = (length_of_connection, N_b, candidate.bolt_grade, Utilization_ratio)
+            if front.is_dominated(objectives):
+                continue
+        elif (length_of_connection, position) >= (min_length, best_position):
+            continue
+
+        # This design is better (or, in Pareto mode, not dominated)
+        design = {
+            "bolt_diameter": d,
+            "bolt_grade": candidate.bolt_grade,
+            "number_of_bolts": N_b,
+            "pitch_distance": p,
+            "gauge_distance": g,
+            "end_distance": e,
+            "edge_distance": e,
+            "number_of_rows": 1,  # Simple design assumption, can be improved
+            "number_of_columns": N_b,  # One column for simplicity
+            "hole_diameter": d + 2,  # Diameter of hole is slightly larger than the bolt
+            "strength_of_connection": N_b * min(V_b, V_dpb) * 0.75,  # Strength based on shear capacity
+            "yield_strength_plate_1": fy_plate,
+            "yield_strength_plate_2": fy_plate,
+            "length_of_connection": length_of_connection,
+            "efficiency_of_connection": Utilization_ratio
+        }
+        improvements += 1
+        if front is not None:
+            front.add(objectives, design)
+        else:
+            min_length = length_of_connection
+            best_position = position
+            best_design = design
+
+    if stats is not None:
+        stats.phase_times["search"] = time.perf_counter() - start
+        cache_after = table.bearing_cache_info()
+        stats.candidates_evaluated = evaluated
+        stats.rejected_by_utilization = rejected
+        stats.improvements = improvements
+        stats.bearing_cache_hits = cache_after.hits - cache_before.hits
+        stats.bearing_cache_misses = cache_after.misses - cache_before.misses
+
+    if front is not None:
+        if not len(front):
+            raise ValueError("No suitable design found that meets the requirements.")
+        # The front is small, so sorting it for presentation is cheap
+        return sorted(front.items(), key=lambda design: design["length_of_connection"])
 
     if best_design is None:
         raise ValueError("No suitable design found that meets the requirements.")
@@ -0,0 +1,132 @@
+"""
+Bolt and plate catalogues loaded from a JSON data file.
+The file lists the bolt diameters, the bolt grades and the plate grades with
+their yield and ultimate strengths. It is read and validated once per process,
+and CapacityTable compiles it into the indexed tables used by the design search.
+"""
+
+import json
+import math
+import os
+
+# Catalogue shipped with the tool
+DEFAULT_CATALOGUE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'catalogue.json')
+
+# Environment variable naming another catalogue file; worker processes inherit it
+CATALOGUE_ENV = "LAP_JOINT_CATALOGUE"
+
+
+class Catalogue:
+    """
+    Validated bolt and plate catalogue.
+    Bolt diameters and grades are sorted in increasing order, which is the order
+    the design search enumerates them, and plate grades are sorted by ultimate
+    strength so that the last one is the strongest.
+    """
+
+    def __init__(self, bolt_diameters, bolt_grades, plate_grades, source="<catalogue>", data=None):
+        """
+        Validate and sort catalogue data.
+        :param bolt_diameters: Bolt diameters in mm
+        :param bolt_grades: Bolt grades (e.g., 4.6)
+        :param plate_grades: Iterable of (name, fy, fu) tuples
+        :param source: Description of where the data came from, used in error messages
+        :param data: Contents of the source file, if any, for the digest
+        :raises ValueError: If any entry is invalid or duplicated
+        """
+        self.source = source
+        self._data = data
+        self._digest = None
+        self.bolt_diameters = tuple(sorted(self._numbers(bolt_diameters, "bolt diameter")))
+        self.bolt_grades = tuple(sorted(self._numbers(bolt_grades, "bolt grade")))
+        for grade in self.bolt_grades:
+            # The yield strength is derived from the digits after the point
+            if grade == int(grade):
+                self._fail(f"bolt grade {grade} has no yield ratio, e.g. 4.6")
+
+        plates = []
+        for entry in plate_grades:
+            try:
+                name, fy, fu = entry
+            except (TypeError, ValueError):
+                self._fail(f"plate grade entry {entry!r} must have a grade, fy and fu")
+            if not isinstance(name, str) or not name:
+                self._fail(f"plate grade name {name!r} must be a non-empty string")
+            fy, fu = self._numbers([fy, fu], f"strength of plate grade {name}")
+            if fy >= fu:
+                self._fail(f"plate grade {name} has fy >= fu")
+            plates.append((name, fy, fu))
+        if not plates:
+            self._fail("no plate grades")
+        names = [name for name, _, _ in plates]
+        if len(set(names)) != len(names):
+            self._fail("duplicate plate grade names")
+        self.plate_grades = tuple(sorted(plates, key=lambda plate: plate[2]))
+
+    def _fail(self, message):
+        raise ValueError(f"Invalid catalogue {self.source}: {message}")
+
+    def _numbers(self, values, what):
+        """Check that values is a non-empty list of distinct positive finite numbers."""
+        if not isinstance(values, (list, tuple)) or not values:
+            self._fail(f"no {what} values")
+        for value in values:
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value) or value <= 0:
+                self._fail(f"{what} {value!r} must be a positive number")
+        if len(set(values)) != len(values):
+            self._fail(f"duplicate {what} values")
+        return list(values)
+
+    @property
+    def digest(self):
+        """SHA-256 of the source file, or of the entries without one, computed on first use."""
+        if self._digest is None:
+            # Imported here, as only the design cache needs the digest
+            import hashlib
+
+            data = self._data
+            if data is None:
+                data = repr((self.bolt_diameters, self.bolt_grades, self.plate_grades)).encode()
+            self._digest = hashlib.sha256(data).hexdigest()
+        return self._digest
+
+    @property
+    def plate_grade_names(self):
+        return [name for name, _, _ in self.plate_grades]
+
+    @property
+    def plate_strengths(self):
+        """Mapping from plate grade name to (fy, fu)."""
+        return {name: (fy, fu) for name, fy, fu in self.plate_grades}
+
+
+_catalogues = {}
+
+
+def load_catalogue(path=None):
+    """
+    Load a catalogue file, reading and validating it only once per process.
+    :param path: JSON catalogue file (defaults to $LAP_JOINT_CATALOGUE, then the shipped catalogue)
+    :return: Catalogue instance
+    :raises ValueError: If the file is not a valid catalogue
+    :raises OSError: If the file cannot be read
+    """
+    if path is None:
+        path = os.environ.get(CATALOGUE_ENV) or DEFAULT_CATALOGUE_PATH
+    path = os.path.abspath(path)
+    catalogue = _catalogues.get(path)
+    if catalogue is not None:
+        return catalogue
+
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        document = json.loads(data)
+        bolts = document["bolts"]
+        plates = [(plate["grade"], plate["fy"], plate["fu"]) for plate in document["plates"]]
+        catalogue = Catalogue(bolts["diameters"], bolts["grades"], plates, source=path, data=data)
+    except (json.JSONDecodeError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid catalogue {path}: {e!r}")
+
+    _catalogues[path] = catalogue
+    return catalogue
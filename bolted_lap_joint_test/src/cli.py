@@ -4,14 +4,39 @@ Command-line interface for the Bolted Lap Joint Design tool.
 This script provides a simple way to use the design functionality from the command line.
 """
 
-import argparse
 import json
+import os
 import sys
-from bolted_lap_joint_design import design_lap_joint
+import time
+from bolted_lap_joint_design import design_lap_joint, use_catalogue
+from catalogue import CATALOGUE_ENV
 
-def parse_arguments():
+# argparse, the batch pipeline, the cache, NumPy and the other engines are
+# imported by the commands that use them, so that a single design starts fast
+
+def _argument_parser(**kwargs):
+    """Create an argument parser, importing argparse only when a command line needs it."""
+    import argparse
+    from functools import partial
+    
+    # argparse builds a help formatter for every argument it adds, and without a
+    # width each one imports shutil to ask for the terminal size
+    try:
+        columns = int(os.environ["COLUMNS"])
+    except (KeyError, ValueError):
+        try:
+            columns = os.get_terminal_size(sys.__stdout__.fileno()).columns
+        except (AttributeError, ValueError, OSError):
+            columns = 80
+    formatter = partial(kwargs.pop("formatter_class", argparse.HelpFormatter), width=columns - 2)
+    return argparse.ArgumentParser(formatter_class=formatter, **kwargs)
+
+def parse_arguments(argv=None):
     """Parse command line arguments."""
-    parser = argparse.ArgumentParser(
+    from design_cache import DEFAULT_MAX_ENTRIES
+    from stream_design import DEFAULT_CHUNK_SIZE
+    
+    parser = _argument_parser(
         description="Design a bolted lap joint connecting two plates."
     )
     
@@ -48,8 +73,182 @@ def parse_arguments():
     parser.add_argument(
         "--json", action="store_true", help="Output results in JSON format"
     )
+    parser.add_argument(
+        "--stats", action="store_true",
+        help="Print search statistics (candidates evaluated and rejected, clause calls, cache hits, phase times) to stderr"
+    )
+    parser.add_argument(
+        "--profile", nargs="?", const="-", metavar="FILE",
+        help="Run under cProfile and print the hottest functions to stderr, or save the raw profile to FILE"
+    )
+    parser.add_argument(
+        "--import-time", action="store_true",
+        help="Run the command under 'python -X importtime' and print the modules it loads to stderr"
+    )
+    parser.add_argument(
+        "--catalogue", metavar="FILE",
+        help=f"Bolt and plate catalogue JSON file (default: ${CATALOGUE_ENV}, then the shipped catalogue)"
+    )
+    parser.add_argument(
+        "--pareto", action="store_true",
+        help="Show every non-dominated design (connection length, bolt count, bolt grade, utilization) instead of the shortest one"
+    )
+    
+    # Create a group for sensitivity analysis
+    sensitivity_group = parser.add_argument_group("Sensitivity Analysis")
+    sensitivity_group.add_argument(
+        "--sensitivity", action="store_true",
+        help="Also design small changes of each input and show which ones change the chosen bolts "
+             "(default changes: load +-10 kN, width +-10 mm, thicknesses +-2 mm)"
+    )
+    sensitivity_group.add_argument(
+        "--perturb", action="append", metavar="INPUT=DELTA[,DELTA]",
+        help="Change to analyse instead of the defaults, e.g. thickness1=-2,-4 (repeatable, implies --sensitivity)"
+    )
+    
+    # Create a group for the multi-row layout optimizer
+    layout_group = parser.add_argument_group("Layout Optimization")
+    layout_group.add_argument(
+        "--optimize", action="store_true",
+        help="Search multi-row layouts, every plate grade and more bolt diameters for the shortest connection"
+    )
+    layout_group.add_argument(
+        "--time-budget", type=float, metavar="SECONDS",
+        help="Return the best layout found within SECONDS and its optimality gap (implies --optimize)"
+    )
+    layout_group.add_argument(
+        "--max-evaluations", type=int, metavar="N",
+        help="Return the best layout found within N layout evaluations and its optimality gap (implies --optimize)"
+    )
+    layout_group.add_argument(
+        "--max-rows", type=int, metavar="N",
+        help="Maximum number of bolt rows (default: as many as fit across the width)"
+    )
+    
+    # Create a group for streaming batch mode
+    batch_group = parser.add_argument_group("Batch Mode")
+    batch_group.add_argument(
+        "--batch", nargs="?", const="-", metavar="FILE",
+        help="Design every record of a CSV or JSONL file (or stdin if no file is given) and write one JSON result per line"
+    )
+    batch_group.add_argument(
+        "--format", choices=["csv", "jsonl"], dest="input_format",
+        help="Input record format (default: detected from the file extension, jsonl for stdin)"
+    )
+    batch_group.add_argument(
+        "--output", metavar="FILE", help="Write batch results to FILE instead of stdout"
+    )
+    batch_group.add_argument(
+        "--output-format", choices=["jsonl", "npy", "npz"],
+        help="Write JSON lines, or a compact NumPy structured array as .npy (memory-mappable) or compressed .npz "
+             "(default: detected from the --output extension, jsonl otherwise)"
+    )
+    batch_group.add_argument(
+        "--view", metavar="FILE",
+        help="Print the results stored in a .npy or .npz file as JSON lines, as batch mode would have written them"
+    )
+    batch_group.add_argument(
+        "--order", choices=["input", "any"], default="input",
+        help="Emit results in input order, or report invalid records as soon as they are read (default: input)"
+    )
+    batch_group.add_argument(
+        "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+        help=f"Number of records designed per vectorized call (default: {DEFAULT_CHUNK_SIZE})"
+    )
+    batch_group.add_argument(
+        "--workers", type=int, default=1, metavar="N",
+        help="Design chunks in N worker processes (default: 1, 0 for one per CPU core)"
+    )
+    batch_group.add_argument(
+        "--checkpoint", action="store_true",
+        help="Record progress next to the --output file so that an interrupted batch is resumed when "
+             "run again with the same input and options"
+    )
+    batch_group.add_argument(
+        "--checkpoint-interval", type=float, default=None, metavar="SECONDS",
+        help="Seconds between checkpoints (default: 2, implies --checkpoint)"
+    )
+    batch_group.add_argument(
+        "--restart", action="store_true", help="Discard the progress of a checkpointed batch and start over"
+    )
+    
+    # Create a group for the persistent design cache
+    cache_group = parser.add_argument_group("Design Cache")
+    cache_group.add_argument(
+        "--cache", metavar="FILE", help="Reuse designs stored in a persistent SQLite cache file"
+    )
+    cache_group.add_argument(
+        "--cache-size", type=int, default=DEFAULT_MAX_ENTRIES, metavar="N",
+        help=f"Maximum number of designs kept in the cache (default: {DEFAULT_MAX_ENTRIES})"
+    )
+    cache_group.add_argument(
+        "--cache-stats", action="store_true", help="Print cache hit/miss statistics to stderr"
+    )
+    
+    args = parser.parse_args(argv)
+    
+    if args.cache_size < 1:
+        parser.error("--cache-size must be at least 1")
+    
+    if args.output_format is None:
+        extension = os.path.splitext(args.output or "")[1].lower()
+        args.output_format = extension[1:] if extension in (".npy", ".npz") else "jsonl"
     
-    args = parser.parse_args()
+    if args.time_budget is not None or args.max_evaluations is not None or args.max_rows is not None:
+        args.optimize = True
+    if args.optimize:
+        if args.batch is not None or args.view is not None or args.pareto or args.cache:
+            parser.error("--optimize cannot be combined with --batch, --view, --pareto or --cache")
+        if args.time_budget is not None and args.time_budget < 0:
+            parser.error("--time-budget cannot be negative")
+        if args.max_evaluations is not None and args.max_evaluations < 0:
+            parser.error("--max-evaluations cannot be negative")
+        if args.max_rows is not None and args.max_rows < 1:
+            parser.error("--max-rows must be at least 1")
+        if args.stats:
+            parser.error("--optimize reports its own search statistics; --stats is not available")
+    
+    if args.perturb:
+        args.sensitivity = True
+    if args.sensitivity:
+        if args.batch is not None or args.view is not None or args.pareto or args.cache or args.optimize:
+            parser.error("--sensitivity cannot be combined with --batch, --view, --pareto, --cache or --optimize")
+        if args.stats:
+            parser.error("--stats is not available with --sensitivity")
+    
+    if args.cache and args.batch is None and args.view is None:
+        if args.pareto:
+            parser.error("--pareto results are not cached; --cache is not available with --pareto")
+        if args.stats:
+            parser.error("a cached design skips the search; --stats is not available with --cache")
+    
+    if args.view is not None:
+        if args.batch is not None:
+            parser.error("--view cannot be combined with --batch")
+        return args
+    
+    if args.batch is not None:
+        if args.output_format != "jsonl":
+            if args.output is None:
+                parser.error(f"--output-format {args.output_format} needs an --output file")
+            if args.cache:
+                parser.error("--cache stores JSON results and is only available with --output-format jsonl")
+        if args.pareto:
+            parser.error("--pareto is not available in batch mode")
+        if args.stats:
+            parser.error("--stats is only available for single designs; batch mode reports throughput on stderr")
+        if args.chunk_size < 1:
+            parser.error("--chunk-size must be at least 1")
+        if args.workers < 0:
+            parser.error("--workers cannot be negative")
+        if args.checkpoint_interval is not None or args.restart:
+            args.checkpoint = True
+        if args.checkpoint:
+            if args.batch == "-" or args.output is None or args.output_format != "jsonl":
+                parser.error("--checkpoint needs an input FILE and a JSONL --output file")
+            if args.checkpoint_interval is not None and args.checkpoint_interval < 0:
+                parser.error("--checkpoint-interval cannot be negative")
+        return args
     
     # Determine if we're using named parameters
     named_params_provided = any([
@@ -102,13 +301,640 @@ def display_results(design, json_output=False):
     print(f"Connection Strength:     {design['strength_of_connection']/1000:.2f} kN")
     print("===========================================")
 
-def main():
+def display_layout_results(design, stats, json_output=False):
+    """Display an optimized layout and the quality of the search on stderr."""
+    if json_output:
+        print(json.dumps({"design": design, "search": stats.as_dict()}, indent=2))
+        return
+
+    display_results(design)
+    print(f"Plate Grade:             {design['plate_grade']}")
+    print(f"Rows x Columns:          {design['number_of_rows']} x {design['number_of_columns']}")
+    print(f"Gauge Distance:          {design['gauge_distance']:.2f} mm")
+    quality = "optimal" if stats.optimal else f"gap {stats.gap:.1%} to lower bound {stats.lower_bound:.2f} mm"
+    print(f"Layout search: {stats.evaluated} evaluations in {stats.elapsed * 1000:.1f} ms, {quality}", file=sys.stderr)
+
+def display_sensitivity(result, json_output=False):
+    """Display a design and the table of how it responds to input changes."""
+    if json_output:
+        print(json.dumps(result, indent=2))
+        return
+
+    display_results(result["design"])
+    print("\n====== SENSITIVITY ======")
+    print(f"{'Input':<12}{'Change':>8}{'Value':>10}  {'Design':<12}{'Bolts':>14}{'Length':>10}{'Efficiency':>12}")
+    for row in result["table"]:
+        change = f"{row['input']:<12}{row['delta']:>+8g}{row['value']:>10g}  {row['status']:<12}"
+        if row["status"] == "infeasible":
+            print(f"{change}{row['error']}")
+            continue
+        bolts = f"{row['number_of_bolts']} x M{row['bolt_diameter']:g} {row['bolt_grade']}"
+        print(f"{change}{bolts:>14}{row['length_of_connection']:>10.1f}{row['efficiency_of_connection']:>12.2%}")
+    print("=========================")
+
+def run_batch_checkpointed(args, workers):
+    """Run a batch as a resumable job, reporting on stderr how much of it was already done."""
+    from batch_job import DEFAULT_CHECKPOINT_INTERVAL, run_batch_job
+    
+    cache_spec = (args.cache, args.cache_size) if args.cache else None
+    interval = DEFAULT_CHECKPOINT_INTERVAL if args.checkpoint_interval is None else args.checkpoint_interval
+    start = time.perf_counter()
+    try:
+        summary = run_batch_job(args.batch, args.output, args.input_format, args.chunk_size,
+                                preserve_order=args.order == "input", workers=workers, cache_spec=cache_spec,
+                                checkpoint_interval=interval, restart=args.restart)
+    except KeyboardInterrupt:
+        print("Interrupted; run the same command again to resume from the checkpoint", file=sys.stderr)
+        return 130
+    if summary["resumed"]:
+        print(f"Resumed from checkpoint: {summary['skipped']} records already done, "
+              f"{summary['designed']} designed now", file=sys.stderr)
+    report_batch(args, summary["records"], summary["errors"], time.perf_counter() - start, workers,
+                 processed=summary["designed"])
+    return 0
+
+def run_batch(args):
+    """Stream batch records through the design engine and write JSONL or structured array results."""
+    from stream_design import design_jsonl, design_structured, detect_format, write_jsonl_chunks
+    
+    workers = args.workers or os.cpu_count() or 1
+    if args.checkpoint:
+        return run_batch_checkpointed(args, workers)
+    
+    fmt = args.input_format or detect_format(args.batch)
+    input_stream = sys.stdin if args.batch == "-" else open(args.batch, newline="")
+    start = time.perf_counter()
+    
+    try:
+        if args.output_format == "jsonl":
+            output_stream = sys.stdout if args.output is None else open(args.output, "w")
+            try:
+                cache_spec = (args.cache, args.cache_size) if args.cache else None
+                chunks = design_jsonl(input_stream, fmt, args.chunk_size, preserve_order=args.order == "input",
+                                      workers=workers, cache_spec=cache_spec)
+                written, errors = write_jsonl_chunks(chunks, output_stream)
+            finally:
+                if output_stream is not sys.stdout:
+                    output_stream.close()
+        else:
+            from batch_design import StructuredWriter
+            
+            written = errors = 0
+            with StructuredWriter(args.output) as writer:
+                for designs, records, chunk_errors in design_structured(
+                        input_stream, fmt, args.chunk_size, preserve_order=args.order == "input", workers=workers):
+                    writer.write(designs)
+                    written += records
+                    errors += chunk_errors
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+    
+    report_batch(args, written, errors, time.perf_counter() - start, workers)
+    return 0
+
+def report_batch(args, written, errors, elapsed, workers, processed=None):
+    """
+    Print the throughput, errors and cache statistics of a batch to stderr.
+    :param processed: Records processed by this run when fewer than written (a resumed batch)
+    """
+    from design_cache import open_cache
+    
+    if processed is None:
+        processed = written
+    rate = processed / elapsed if elapsed > 0 else float('inf')
+    print(f"Processed {processed} records in {elapsed:.2f} s ({rate:,.0f} records/s, {workers} workers)", file=sys.stderr)
+    if errors:
+        print(f"{errors} of {written} records could not be designed", file=sys.stderr)
+    if args.cache and args.cache_stats:
+        # Worker processes keep their own connections, so with several workers only
+        # the totals stored in the file are known here
+        print_cache_stats(open_cache(args.cache, args.cache_size).stats(), lifetime_only=workers > 1)
+
+def run_view(args):
+    """Print the results stored in a .npy or .npz file as JSON lines."""
+    from batch_design import load_designs, structured_results
+    from stream_design import write_jsonl
+    
+    designs = load_designs(args.view)
+    output_stream = sys.stdout if args.output is None else open(args.output, "w")
+    try:
+        write_jsonl(structured_results(designs), output_stream)
+    finally:
+        if output_stream is not sys.stdout:
+            output_stream.close()
+    return 0
+
+def print_cache_stats(stats, lifetime_only=False):
+    """Print design cache statistics to stderr."""
+    if not lifetime_only:
+        print(f"Cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.1%} hit rate), "
+              f"{stats['evictions']} evictions", file=sys.stderr)
+    print(f"Cache file: {stats['entries']}/{stats['max_entries']} entries, "
+          f"{stats['lifetime_hits']} hits and {stats['lifetime_misses']} misses in total", file=sys.stderr)
+
+def print_design_stats(stats, as_json=False):
+    """Print the statistics of an instrumented design to stderr."""
+    if as_json:
+        print(json.dumps(stats.as_dict(), indent=2), file=sys.stderr)
+        return
+    print("\n====== DESIGN SEARCH STATISTICS ======", file=sys.stderr)
+    print(stats, file=sys.stderr)
+    print("======================================", file=sys.stderr)
+
+def display_pareto_results(designs, json_output=False):
+    """Display the non-dominated designs as a table, shortest connection first."""
+    if json_output:
+        print(json.dumps(designs, indent=2))
+        return
+
+    print("\n====== NON-DOMINATED BOLTED LAP JOINT DESIGNS ======")
+    print(f"{'Diameter':>9} {'Grade':>6} {'Bolts':>6} {'Length':>9} {'Utilization':>12} {'Strength':>10}")
+    for design in designs:
+        print(f"{design['bolt_diameter']:>6} mm {design['bolt_grade']:>6} {design['number_of_bolts']:>6} "
+              f"{design['length_of_connection']:>6.1f} mm {design['efficiency_of_connection']:>12.2%} "
+              f"{design['strength_of_connection']/1000:>7.2f} kN")
+    print("====================================================")
+
+def parse_serve_arguments(argv):
+    """Parse command line arguments of the serve subcommand."""
+    parser = _argument_parser(
+        prog="main.py serve",
+        description="Serve design requests from a long-running process with warm caches."
+    )
+    parser.add_argument(
+        "--unix", metavar="PATH", help="Listen on a Unix socket (newline-delimited JSON) instead of HTTP"
+    )
+    parser.add_argument(
+        "--host", default="127.0.0.1", help="HTTP host to listen on (default: 127.0.0.1)"
+    )
+    parser.add_argument(
+        "--port", type=int, default=8765, help="HTTP port to listen on (default: 8765)"
+    )
+    parser.add_argument(
+        "--batch-window", type=float, default=2.0, metavar="MS",
+        help="Milliseconds a request waits for others to join its micro-batch (default: 2)"
+    )
+    parser.add_argument(
+        "--max-batch", type=int, default=4096, metavar="N",
+        help="Largest number of distinct requests designed in one batch (default: 4096)"
+    )
+    args = parser.parse_args(argv)
+    if args.batch_window < 0:
+        parser.error("--batch-window cannot be negative")
+    if args.max_batch < 1:
+        parser.error("--max-batch must be at least 1")
+    return args
+
+def serve(argv):
+    """Run the design server until interrupted."""
+    import asyncio
+    from design_server import serve_forever
+    
+    args = parse_serve_arguments(argv)
+    
+    def ready(server):
+        where = args.unix or "http://{}:{}".format(*server.sockets[0].getsockname()[:2])
+        print(f"Serving lap joint designs on {where}", file=sys.stderr)
+    
+    try:
+        asyncio.run(serve_forever(args.unix, args.host, args.port, args.batch_window / 1000, args.max_batch, ready))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+def parse_check_arguments(argv):
+    """Parse command line arguments of the check subcommand."""
+    from bolted_lap_joint_design import PLATE_GRADE_LIST
+    from stream_design import DEFAULT_CHUNK_SIZE
+    
+    # The plate grades to choose from come from the catalogue, so it is loaded first
+    catalogue_parser = _argument_parser(prog="main.py check", add_help=False)
+    catalogue_parser.add_argument("--catalogue", metavar="FILE")
+    catalogue = catalogue_parser.parse_known_args(argv)[0].catalogue
+    if catalogue is not None:
+        try:
+            use_catalogue(catalogue)
+        except (OSError, ValueError) as e:
+            catalogue_parser.error(str(e))
+    
+    parser = _argument_parser(
+        prog="main.py check",
+        description="Check the capacity of existing bolted lap joints under new loads."
+    )
+    parser.add_argument(
+        "input", nargs="?", default="-", metavar="FILE",
+        help="CSV or JSONL file of joints with load, bolt_diameter, bolt_grade, number_of_bolts, "
+             "pitch_distance, end_distance, thickness1 and thickness2 fields (default: stdin)"
+    )
+    parser.add_argument(
+        "--format", choices=["csv", "jsonl"], dest="input_format",
+        help="Input record format (default: detected from the file extension, jsonl for stdin)"
+    )
+    parser.add_argument(
+        "--output", metavar="FILE", help="Write one JSON result per joint to FILE instead of stdout"
+    )
+    parser.add_argument(
+        "--catalogue", metavar="FILE",
+        help=f"Bolt and plate catalogue JSON file (default: ${CATALOGUE_ENV}, then the shipped catalogue)"
+    )
+    parser.add_argument(
+        "--plate-grade", default=PLATE_GRADE_LIST[-1], choices=sorted(PLATE_GRADE_LIST),
+        help=f"Plate grade of the catalogue (default: {PLATE_GRADE_LIST[-1]}, the strongest)"
+    )
+    parser.add_argument(
+        "--hole-type", default="Standard", choices=["Standard", "Oversized"], help="Type of bolt hole (default: Standard)"
+    )
+    parser.add_argument(
+        "--location", default="Field", choices=["Field", "Shop"], help="Location of the connection (default: Field)"
+    )
+    parser.add_argument(
+        "--failures-only", action="store_true", help="Only write joints that fail or cannot be checked"
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+        help=f"Number of joints checked per vectorized call (default: {DEFAULT_CHUNK_SIZE})"
+    )
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    return args
+
+def check(argv):
+    """Check existing joints and write one JSON result per joint; exit with 1 if any joint fails."""
+    from check_design import check_stream
+    from stream_design import detect_format, read_records
+    
+    args = parse_check_arguments(argv)
+    fmt = args.input_format or detect_format(args.input)
+    try:
+        input_stream = sys.stdin if args.input == "-" else open(args.input, newline="")
+        output_stream = sys.stdout if args.output is None else open(args.output, "w")
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    
+    checked = failed = errors = 0
+    try:
+        results = check_stream(read_records(input_stream, fmt), args.chunk_size, plate_grade=args.plate_grade,
+                               hole_type=args.hole_type, connection_location=args.location)
+        for result in results:
+            checked += 1
+            if "error" in result:
+                errors += 1
+            elif not result["passed"]:
+                failed += 1
+            elif args.failures_only:
+                continue
+            output_stream.write(json.dumps(result) + "\n")
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+    
+    print(f"Checked {checked} joints: {checked - failed - errors} passed, {failed} failed, "
+          f"{errors} could not be checked", file=sys.stderr)
+    return 1 if failed or errors else 0
+
+def parse_sweep_arguments(argv):
+    """Parse command line arguments of the sweep subcommand."""
+    parser = _argument_parser(
+        prog="main.py sweep",
+        description="Design every combination of load, width and plate thicknesses into memory-mapped design maps.",
+        epilog="Each axis is start:stop:count (evenly spaced, both ends included), a list such as 6,8,10, or one value."
+    )
+    parser.add_argument("--load", required=True, help="Tensile forces in kN")
+    parser.add_argument("--width", required=True, help="Widths of the plates in mm")
+    parser.add_argument("--thickness1", required=True, help="Thicknesses of plate 1 in mm")
+    parser.add_argument("--thickness2", required=True, help="Thicknesses of plate 2 in mm")
+    parser.add_argument(
+        "--output", required=True, metavar="DIR",
+        help="Directory for the design map arrays; an interrupted sweep in it is resumed"
+    )
+    parser.add_argument(
+        "--block-size", type=int, default=None, metavar="N",
+        help="Grid points designed and recorded per block (default: 65536)"
+    )
+    parser.add_argument(
+        "--restart", action="store_true", help="Discard the progress of a sweep already in the directory"
+    )
+    args = parser.parse_args(argv)
+    if args.block_size is not None and args.block_size < 1:
+        parser.error("--block-size must be at least 1")
+    return args
+
+def sweep(argv):
+    """Run a parametric sweep and report its progress on stderr."""
+    from design_sweep import DEFAULT_SWEEP_BLOCK, parse_range, run_sweep
+    
+    args = parse_sweep_arguments(argv)
+    start = time.perf_counter()
+    
+    def progress(completed, total):
+        print(f"\r{completed}/{total} grid points ({completed / total:.0%})", end="", file=sys.stderr)
+    
+    try:
+        axes = [parse_range(text) for text in (args.load, args.width, args.thickness1, args.thickness2)]
+        manifest = run_sweep(args.output, *axes, block_size=args.block_size or DEFAULT_SWEEP_BLOCK,
+                             restart=args.restart, progress=progress)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    
+    shape = " x ".join(str(n) for n in manifest["shape"])
+    print(f"\nDesign map of {shape} points written to {args.output} in {time.perf_counter() - start:.2f} s",
+          file=sys.stderr)
+    return 0
+
+def parse_schedule_arguments(argv):
+    """Parse command line arguments of the schedule subcommand."""
+    parser = _argument_parser(
+        prog="main.py schedule",
+        description="Design every joint of a structural model, designing equal joints only once."
+    )
+    parser.add_argument(
+        "input", nargs="?", default="-", metavar="FILE",
+        help="JSON list of joints with an id, load, width, thickness1 and thickness2, "
+             "or one JSON joint per line (default: stdin)"
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.0, metavar="T",
+        help="Design joints whose inputs fall into the same bins of width T (kN or mm) once, "
+             "for the largest load and smallest width and thicknesses (default: 0, equal inputs only)"
+    )
+    parser.add_argument(
+        "--output", metavar="FILE", help="Write one JSON result per joint to FILE instead of stdout"
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="Print the summary to stderr as JSON"
+    )
+    args = parser.parse_args(argv)
+    if not args.tolerance >= 0:
+        parser.error("--tolerance cannot be negative")
+    if args.tolerance == float("inf"):
+        parser.error("--tolerance must be finite")
+    return args
+
+def schedule(argv):
+    """Design a joint schedule and report the dedup ratio and time on stderr."""
+    from joint_schedule import design_schedule, load_schedule
+    from stream_design import write_jsonl
+    
+    args = parse_schedule_arguments(argv)
+    try:
+        if args.input == "-":
+            joints = load_schedule(sys.stdin)
+        else:
+            with open(args.input) as input_stream:
+                joints = load_schedule(input_stream)
+        results, summary = design_schedule(joints, args.tolerance)
+        output_stream = sys.stdout if args.output is None else open(args.output, "w")
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    
+    try:
+        write_jsonl(results, output_stream)
+    finally:
+        if output_stream is not sys.stdout:
+            output_stream.close()
+    
+    if args.json:
+        print(json.dumps(summary), file=sys.stderr)
+    else:
+        print(f"Designed {summary['joints']} joints with {summary['unique_designs']} unique designs "
+              f"(dedup ratio {summary['dedup_ratio']:.2f}) in {summary['total_time']:.3f} s "
+              f"({summary['design_time']:.3f} s designing)", file=sys.stderr)
+        if summary["errors"]:
+            print(f"{summary['errors']} of {summary['joints']} joints could not be designed", file=sys.stderr)
+    return 0
+
+def parse_verify_arguments(argv):
+    """Parse command line arguments of the verify subcommand."""
+    parser = _argument_parser(
+        prog="main.py verify",
+        description="Check the design invariants on randomly generated inputs and shrink any failing case."
+    )
+    parser.add_argument(
+        "--cases", type=int, default=None, metavar="N",
+        help="Number of cases to check (default: 1000000 without --time-budget)"
+    )
+    parser.add_argument(
+        "--time-budget", type=float, default=None, metavar="SECONDS", help="Stop after SECONDS, including shrinking"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the input generator (default: 0)")
+    parser.add_argument(
+        "--batch-size", type=int, default=None, metavar="N",
+        help="Cases designed and checked together (default: 65536)"
+    )
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+    if args.cases is not None and args.cases < 0:
+        parser.error("--cases cannot be negative")
+    if args.time_budget is not None and args.time_budget < 0:
+        parser.error("--time-budget cannot be negative")
+    if args.batch_size is not None and args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    if args.cases is None and args.time_budget is None:
+        args.cases = 1000000
+    return args
+
+def verify(argv):
+    """Run the randomized invariant checks; the exit code is 1 if any invariant fails."""
+    from verify_invariants import DEFAULT_VERIFY_BATCH, verify_invariants
+    
+    args = parse_verify_arguments(argv)
+    report = verify_invariants(args.cases, args.time_budget, args.seed, args.batch_size or DEFAULT_VERIFY_BATCH)
+    if args.json:
+        print(json.dumps(report.as_dict(), indent=2))
+    else:
+        print(report)
+        for failure in report.failures.values():
+            minimal = failure.minimal
+            print(f"Reproduce {failure.invariant}: python main.py {minimal['load']:g} {minimal['width']:g} "
+                  f"{minimal['thickness1']:g} {minimal['thickness2']:g}"
+                  + (f" (thickness increase {minimal['thickness_increase']:g})"
+                     if failure.invariant == "thicker_plates_not_longer" else ""))
+    return 0 if report.passed else 1
+
+def run_profiled(func, args, destination):
+    """
+    Run func(args) under cProfile.
+    :param destination: '-' to print the hottest functions to stderr, or a file for the raw profile
+    """
+    import cProfile
+    import pstats
+    
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func, args)
+    finally:
+        if destination == "-":
+            pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(25)
+        else:
+            profiler.dump_stats(destination)
+            print(f"Profile written to {destination}", file=sys.stderr)
+
+def plain_design_arguments(argv):
+    """
+    Recognize the common 'load width thickness1 thickness2 [--json]' command line.
+    :param argv: Command line arguments
+    :return: Tuple ((P, w, t1, t2), json output), or None for any other command line
+    """
+    values = [arg for arg in argv if arg != "--json"]
+    if len(values) != 4 or len(argv) > 5:
+        return None
+    try:
+        # The same conversion argparse applies to these arguments
+        inputs = tuple(float(value) for value in values)
+    except ValueError:
+        return None
+    return inputs, len(argv) == 5
+
+def run_plain(inputs, json_output):
+    """Design one joint without building an argument parser."""
+    try:
+        design = design_lap_joint(*inputs)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    display_results(design, json_output)
+    return 0
+
+def run_import_time(argv, top=15):
+    """
+    Run a command line under 'python -X importtime' and summarize what it imports.
+    The command's own output is passed through; the summary goes to stderr.
+    :param argv: Command line arguments without --import-time
+    :param top: Number of top-level imports listed
+    :return: Exit code of the command
+    """
+    import subprocess
+    
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    code = f"import sys; sys.path.insert(0, {src_dir!r}); import cli; sys.exit(cli.main({list(argv)!r}))"
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", code], stderr=subprocess.PIPE, text=True)
+    
+    # Lines come in completion order, each module after the ones it imported,
+    # with the nesting depth in the indentation of the name
+    imports = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:"):
+            print(line, file=sys.stderr)
+            continue
+        fields = line[len("import time:"):].split("|")
+        if not fields[0].strip().isdigit():
+            continue  # Column header
+        name = fields[2].rstrip()
+        imports.append((int(fields[0]), int(fields[1]), name.strip(), (len(name) - len(name.lstrip())) // 2))
+    
+    # Modules the CLI imports when it loads, and the ones imported while the command runs
+    position = next((i for i, (_, _, name, depth) in enumerate(imports) if name == "cli" and depth == 0), None)
+    loaded = []
+    if position is not None:
+        first = max((i for i in range(position) if imports[i][3] == 0), default=-1) + 1
+        loaded = [entry for entry in imports[first:position] if entry[3] == 1]
+        loaded += [entry for entry in imports[position + 1:] if entry[3] == 0]
+    
+    total = sum(own for own, _, _, _ in imports) / 1000
+    names = {name for _, _, name, _ in imports}
+    print(f"\n====== IMPORT TIME: main.py {' '.join(argv)} ======", file=sys.stderr)
+    print(f"{'cumulative':>12}{'self':>10}  module (ms)", file=sys.stderr)
+    for own, cumulative, name, _ in sorted(loaded, key=lambda entry: -entry[1])[:top]:
+        print(f"{cumulative / 1000:>12.2f}{own / 1000:>10.2f}  {name}", file=sys.stderr)
+    print(f"Total: {total:.2f} ms in {len(imports)} modules, including interpreter startup; NumPy "
+          f"{'loaded' if 'numpy' in names else 'not loaded'}", file=sys.stderr)
+    return process.returncode
+
+def main(argv=None):
     """Main function for the CLI."""
-    args = parse_arguments()
+    if argv is None:
+        argv = sys.argv[1:]
+    if "--import-time" in argv:
+        return run_import_time([arg for arg in argv if arg != "--import-time"])
+    plain = plain_design_arguments(argv)
+    if plain is not None:
+        return run_plain(*plain)
+    if argv and argv[0] == "serve":
+        return serve(argv[1:])
+    if argv and argv[0] == "check":
+        return check(argv[1:])
+    if argv and argv[0] == "sweep":
+        return sweep(argv[1:])
+    if argv and argv[0] == "schedule":
+        return schedule(argv[1:])
+    if argv and argv[0] == "verify":
+        return verify(argv[1:])
+    
+    args = parse_arguments(argv)
+    if args.profile is not None:
+        return run_profiled(run, args, args.profile)
+    return run(args)
+
+def run(args):
+    """Run the design selected by the parsed command line arguments."""
+    
+    if args.catalogue is not None:
+        try:
+            use_catalogue(args.catalogue)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        # Worker processes load the catalogue named by the environment
+        os.environ[CATALOGUE_ENV] = os.path.abspath(args.catalogue)
+    
+    if args.batch is not None or args.view is not None:
+        try:
+            return run_batch(args) if args.batch is not None else run_view(args)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
     
     try:
         # Design the bolted lap joint
-        design = design_lap_joint(args.load, args.width, args.thickness1, args.thickness2)
+        if args.cache:
+            from design_cache import DesignCache
+            
+            with DesignCache(args.cache, args.cache_size) as cache:
+                try:
+                    design = cache.design(args.load, args.width, args.thickness1, args.thickness2)
+                finally:
+                    if args.cache_stats:
+                        print_cache_stats(cache.stats())
+        elif args.sensitivity:
+            from sensitivity import design_sensitivity, parse_perturbation
+            
+            perturbations = dict(parse_perturbation(text) for text in args.perturb) if args.perturb else None
+            result = design_sensitivity(args.load, args.width, args.thickness1, args.thickness2, perturbations)
+            display_sensitivity(result, args.json)
+            return 0
+        elif args.optimize:
+            from design_search import anytime_search_lap_joint
+            
+            design, stats = anytime_search_lap_joint(args.load, args.width, args.thickness1, args.thickness2,
+                                                     time_budget=args.time_budget,
+                                                     max_evaluations=args.max_evaluations, max_rows=args.max_rows)
+            display_layout_results(design, stats, args.json)
+            return 0
+        elif args.pareto:
+            result = design_lap_joint(args.load, args.width, args.thickness1, args.thickness2,
+                                      pareto=True, return_stats=args.stats, compact=True)
+            records, stats = result if args.stats else (result, None)
+            display_pareto_results([record.as_dict() for record in records], args.json)
+            if args.stats:
+                print_design_stats(stats, args.json)
+            return 0
+        else:
+            result = design_lap_joint(args.load, args.width, args.thickness1, args.thickness2,
+                                      return_stats=args.stats, compact=True)
+            record, stats = result if args.stats else (result, None)
+            design = record.as_dict()
+            if args.stats:
+                print_design_stats(stats, args.json)
         
         # Display the results
         display_results(design, args.json)
@@ -0,0 +1,266 @@
+"""
+Persistent on-disk cache of bolted lap joint designs.
+Designs are stored in a local SQLite file keyed by the normalized inputs and a
+version hash of the design rules and catalogues, so cached entries are never
+served once the IS800_2007 logic or the catalogues change. Entries of other
+versions stay in the file until they are evicted as least recently used.
+"""
+
+import json
+
+import bolted_lap_joint_design
+from bolted_lap_joint_design import design_lap_joint, validate_design_inputs
+
+# Default maximum number of designs kept in a cache file
+DEFAULT_MAX_ENTRIES = 1_000_000
+
+# Number of decimal places the inputs are rounded to when building a key
+KEY_DECIMALS = 9
+
+# Modules whose source computes the cached designs: the scalar design search and
+# the batch search that designs the records of batch runs
+RULES_MODULES = ("bolted_lap_joint_design", "batch_design")
+
+_rules_versions = {}
+
+
+def _module_source(name):
+    """Return the source of a module as bytes, without importing it."""
+    import importlib.util
+
+    with open(importlib.util.find_spec(name).origin, "rb") as source:
+        return source.read()
+
+
+def rules_version():
+    """
+    Return a hash identifying the design rules and catalogues.
+    The hash covers the source of the modules that compute designs (see
+    RULES_MODULES) and the active bolt and plate catalogue, so any change to
+    either produces a new version.
+    :return: Hexadecimal version string
+    """
+    catalogue = bolted_lap_joint_design.CATALOGUE
+    version = _rules_versions.get(catalogue.digest)
+    if version is None:
+        import hashlib
+
+        digest = hashlib.sha256()
+        for name in RULES_MODULES:
+            digest.update(_module_source(name))
+        digest.update(repr((catalogue.bolt_diameters, catalogue.bolt_grades, catalogue.plate_grades)).encode())
+        version = _rules_versions[catalogue.digest] = digest.hexdigest()[:16]
+    return version
+
+
+def normalize_key(P, w, t1, t2):
+    """
+    Build the cache key for one set of inputs.
+    Inputs are converted to floats and rounded to KEY_DECIMALS places, so 50 and
+    50.0 share one entry.
+    :return: Key string
+    """
+    # Adding 0.0 folds -0.0 into 0.0
+    return ",".join(repr(round(float(value), KEY_DECIMALS) + 0.0) for value in (P, w, t1, t2))
+
+
+class DesignCache:
+    """
+    Size-bounded persistent design cache backed by SQLite.
+    Entries are stored per rules version, so runs with different catalogues can
+    share one file; every lookup uses the version of the catalogue active at that
+    time. The least recently used entries, of any version, are evicted once
+    max_entries is exceeded. Hit and miss counts are kept for this session and
+    accumulated in the file.
+    """
+
+    def __init__(self, path, max_entries=DEFAULT_MAX_ENTRIES):
+        """
+        Open (or create) a cache file.
+        :param path: Path of the SQLite file
+        :param max_entries: Maximum number of designs to keep
+        """
+        if max_entries < 1:
+            raise ValueError("Cache size must be at least 1 entry")
+
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Imported here so that the CLI only loads SQLite when a cache is used
+        import sqlite3
+
+        self._conn = sqlite3.connect(path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._create_tables()
+            # The file may have been filled under a larger size limit
+            self._evict()
+        row = self._conn.execute("SELECT MAX(last_used) FROM designs").fetchone()
+        self._clock = row[0] or 0
+
+    def _create_tables(self):
+        """Create the tables, moving the entries of a file keyed by input alone to per-version keys."""
+        primary_key = {row[1]: row[5] for row in self._conn.execute("PRAGMA table_info(designs)")}
+        keyed_by_input = bool(primary_key) and not primary_key["version"]
+        if keyed_by_input:
+            self._conn.execute("DROP INDEX IF EXISTS designs_last_used")
+            self._conn.execute("ALTER TABLE designs RENAME TO designs_by_key")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS designs (key TEXT NOT NULL, version TEXT NOT NULL, result TEXT NOT NULL, "
+            "last_used INTEGER NOT NULL, PRIMARY KEY (version, key))"
+        )
+        if keyed_by_input:
+            self._conn.execute("INSERT INTO designs SELECT key, version, result, last_used FROM designs_by_key")
+            self._conn.execute("DROP TABLE designs_by_key")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS designs_last_used ON designs (last_used)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+    @property
+    def version(self):
+        """Rules version of the active catalogue, which keys every lookup and store."""
+        return rules_version()
+
+    def close(self):
+        """Close the cache file."""
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _tick(self):
+        self._clock += 1
+        return self._clock
+
+    def get_many(self, keys):
+        """
+        Look up several keys at once.
+        :param keys: Keys from normalize_key
+        :return: Dictionary mapping each cached key to its stored result
+        """
+        found = {}
+        version = self.version
+        keys = list(dict.fromkeys(keys))
+        for i in range(0, len(keys), 500):
+            part = keys[i:i + 500]
+            placeholders = ",".join("?" * len(part))
+            rows = self._conn.execute(
+                f"SELECT key, result FROM designs WHERE version = ? AND key IN ({placeholders})",
+                [version, *part],
+            )
+            found.update((key, json.loads(result)) for key, result in rows)
+
+        if found:
+            with self._conn:
+                tick = self._tick()
+                self._conn.executemany("UPDATE designs SET last_used = ? WHERE version = ? AND key = ?",
+                                       [(tick, version, key) for key in found])
+        return found
+
+    def put_many(self, items):
+        """
+        Store several results and evict the least recently used entries if needed.
+        :param items: Iterable of (key, result) pairs, where result is a design
+                      dictionary or {"error": message}
+        """
+        tick = self._tick()
+        version = self.version
+        rows = [(key, version, json.dumps(result), tick) for key, result in items]
+        if not rows:
+            return
+        with self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO designs VALUES (?, ?, ?, ?)", rows)
+            self._evict()
+
+    def _evict(self):
+        """Delete the least recently used entries beyond max_entries."""
+        count = self._conn.execute("SELECT COUNT(*) FROM designs").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM designs WHERE rowid IN (SELECT rowid FROM designs ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+            self.evictions += excess
+
+    def record(self, hits, misses):
+        """Add lookup counts to the session and lifetime statistics."""
+        self.hits += hits
+        self.misses += misses
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO counters VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                [("hits", hits), ("misses", misses)],
+            )
+
+    def design(self, P, w, t1, t2):
+        """
+        Design a lap joint, returning the cached result when available.
+        :return: Design dictionary, as from design_lap_joint
+        :raises ValueError: For invalid inputs, or if no suitable design exists
+        """
+        validate_design_inputs(P, w, t1, t2)
+        key = normalize_key(P, w, t1, t2)
+
+        cached = self.get_many([key]).get(key)
+        if cached is not None:
+            self.record(1, 0)
+        else:
+            self.record(0, 1)
+            try:
+                cached = design_lap_joint(P, w, t1, t2)
+            except ValueError as e:
+                cached = {"error": str(e)}
+            self.put_many([(key, cached)])
+
+        if "error" in cached:
+            raise ValueError(cached["error"])
+        return cached
+
+    def stats(self):
+        """
+        Return cache statistics.
+        :return: Dictionary with session hits, misses and evictions, lifetime
+                 hits and misses, the number of entries of every version, the size
+                 limit and the active rules version
+        """
+        counters = dict(self._conn.execute("SELECT name, value FROM counters"))
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "lifetime_hits": counters.get("hits", 0),
+            "lifetime_misses": counters.get("misses", 0),
+            "entries": self._conn.execute("SELECT COUNT(*) FROM designs").fetchone()[0],
+            "max_entries": self.max_entries,
+            "version": self.version,
+        }
+
+    def clear(self):
+        """Remove every cached design and reset the statistics."""
+        with self._conn:
+            self._conn.execute("DELETE FROM designs")
+            self._conn.execute("DELETE FROM counters")
+        self.hits = self.misses = self.evictions = 0
+
+
+_open_caches = {}
+
+
+def open_cache(path, max_entries=DEFAULT_MAX_ENTRIES):
+    """
+    Return a cache for a path, reusing the connection already open in this process.
+    Worker processes use this so that each opens a cache file only once.
+    """
+    cache = _open_caches.get(path)
+    if cache is None or cache.max_entries != max_entries:
+        cache = DesignCache(path, max_entries)
+        _open_caches[path] = cache
+    return cache
@@ -0,0 +1,434 @@
+"""
+Branch-and-bound design search over an expanded bolted lap joint design space.
+The space covers every bolt diameter, bolt grade, plate grade and number of bolt
+rows. Candidates are explored in order of a lower bound on the connection length
+and branches that cannot beat the best design found so far are pruned, so the
+result is the same as an exhaustive search of the space. The anytime search
+explores the same space best first under a time or evaluation budget and
+reports how far its best design can be from the optimum.
+"""
+
+import heapq
+import math
+import time
+
+from bolted_lap_joint_design import (
+    BOLT_GRADES,
+    PLATE_GRADE_LIST,
+    design_lap_joint,
+    get_capacity_table,
+    validate_design_inputs,
+)
+
+# Bolt diameters in mm searched by default
+EXTENDED_BOLT_DIAMETERS = [8, 10, 12, 16, 20, 22, 24, 27, 30, 36]
+
+# Maximum number of bolt rows searched by default
+DEFAULT_MAX_ROWS = 4
+
+
+class SearchStats:
+    """Counts of the candidates a design search evaluated and pruned."""
+
+    def __init__(self, candidates):
+        self.candidates = candidates  # Size of the design space
+        self.evaluated = 0  # Candidates whose capacity was checked
+        self.pruned = 0  # Candidates skipped by a bound, never evaluated
+
+    def as_dict(self):
+        return {"candidates": self.candidates, "evaluated": self.evaluated, "pruned": self.pruned}
+
+    def __repr__(self):
+        return f"SearchStats(candidates={self.candidates}, evaluated={self.evaluated}, pruned={self.pruned})"
+
+
+class AnytimeStats(SearchStats):
+    """Search counts of an anytime search, with the quality of its result."""
+
+    def __init__(self, candidates):
+        super().__init__(candidates)
+        self.lower_bound = 0.0  # No design in the space is shorter than this, in mm
+        self.gap = float('inf')  # (best length - lower bound) / best length
+        self.optimal = False  # True if the search finished, so the gap is 0
+        self.elapsed = 0.0  # Search time in seconds
+        self.history = []  # (evaluations, elapsed seconds, length) at every improvement
+
+    def as_dict(self):
+        result = super().as_dict()
+        result.update(lower_bound=self.lower_bound, gap=self.gap, optimal=self.optimal,
+                      elapsed=self.elapsed, history=self.history)
+        return result
+
+    def __repr__(self):
+        return (f"AnytimeStats(evaluated={self.evaluated}, lower_bound={self.lower_bound}, "
+                f"gap={self.gap}, optimal={self.optimal})")
+
+
+def max_rows_for_width(d, w, max_rows):
+    """
+    Return the largest number of bolt rows that fits across the plate width.
+    A single row always fits, as in design_lap_joint. Several rows need an edge
+    distance on both sides and a gauge of at least one pitch between rows.
+    :param d: Bolt diameter in mm
+    :param w: Width of the plates in mm
+    :param max_rows: Upper limit on the number of rows
+    :return: Number of rows, at least 1
+    """
+    e = max(d + 5, 1.5 * d)
+    p = max(d + 10, 2.5 * d)
+    rows = int((w - 2 * e) // p) + 1 if w > 2 * e else 1
+    return max(1, min(rows, max_rows))
+
+
+def _layout(N_req, rows, d, w):
+    """Return (number of bolts, columns, length, gauge) for a rows x columns layout."""
+    e = max(d + 5, 1.5 * d)
+    p = max(d + 10, 2.5 * d)
+    columns = math.ceil(N_req / rows)
+    length = 2 * e + (columns - 1) * p
+    gauge = w / 2 if rows == 1 else (w - 2 * e) / (rows - 1)
+    return rows * columns, columns, length, gauge
+
+
+def _required_bolts(P_N, V_b):
+    """Number of bolts required in shear, with the minimum of 2 used by design_lap_joint."""
+    N_b = math.ceil(P_N / (V_b * 0.75))  # Using a safety factor of 1.33
+    return max(N_b, 2)
+
+
+class _Space:
+    """Load-independent data shared by the branch-and-bound and exhaustive searches."""
+
+    def __init__(self, bolt_diameters, bolt_grades, plate_grades, max_rows):
+        if not bolt_diameters or not bolt_grades or not plate_grades:
+            raise ValueError("The design space must contain at least one diameter, bolt grade and plate grade")
+        if max_rows < 1:
+            raise ValueError("Maximum number of rows must be at least 1")
+
+        self.bolt_diameters = list(bolt_diameters)
+        self.bolt_grades = list(bolt_grades)
+        self.plate_grades = list(plate_grades)
+        self.max_rows = max_rows
+        self.tables = [get_capacity_table(self.bolt_diameters, self.bolt_grades, grade) for grade in self.plate_grades]
+        # The plate grade does not enter the shear capacity, so any table gives it
+        self.shear = self.tables[0].candidates
+
+    def candidate(self, i_d, i_gb):
+        return self.shear[i_d * len(self.bolt_grades) + i_gb]
+
+    def size(self, w):
+        rows = sum(max_rows_for_width(d, w, self.max_rows) for d in self.bolt_diameters)
+        return rows * len(self.bolt_grades) * len(self.plate_grades)
+
+
+def _evaluate(space, P_N, w, t_min, i_d, i_gb, i_pg, rows):
+    """
+    Evaluate one leaf of the design space.
+    :return: Design dictionary, or None if the utilization exceeds 1
+    """
+    candidate = space.candidate(i_d, i_gb)
+    table = space.tables[i_pg]
+    d = candidate.bolt_diameter
+    V_b = candidate.shear_capacity
+    N_req = _required_bolts(P_N, V_b)
+    N_b, columns, length, gauge = _layout(N_req, rows, d, w)
+
+    V_dpb = table.bearing_capacity(d, t_min)
+    Utilization_ratio = P_N / (N_b * min(V_b, V_dpb) * 0.75)
+    if Utilization_ratio > 1:
+        return None
+
+    return {
+        "bolt_diameter": d,
+        "bolt_grade": candidate.bolt_grade,
+        "number_of_bolts": N_b,
+        "pitch_distance": candidate.pitch_distance,
+        "gauge_distance": gauge,
+        "end_distance": candidate.end_distance,
+        "edge_distance": candidate.end_distance,
+        "number_of_rows": rows,
+        "number_of_columns": columns,
+        "hole_diameter": d + 2,
+        "strength_of_connection": N_b * min(V_b, V_dpb) * 0.75,
+        "yield_strength_plate_1": table.fy_plate,
+        "yield_strength_plate_2": table.fy_plate,
+        "length_of_connection": length,
+        "efficiency_of_connection": Utilization_ratio,
+        "plate_grade": table.plate_grade,
+    }
+
+
+def exhaustive_search_lap_joint(P, w, t1, t2, bolt_diameters=None, bolt_grades=None,
+                                plate_grades=None, max_rows=DEFAULT_MAX_ROWS):
+    """
+    Evaluate every candidate of the expanded design space.
+    This is the reference the branch-and-bound search is checked against. Ties on
+    connection length go to the first candidate in (diameter, bolt grade, plate
+    grade, rows) order, as in design_lap_joint.
+    :return: Tuple (design dictionary, SearchStats)
+    :raises ValueError: For invalid inputs, or if no suitable design exists
+    """
+    validate_design_inputs(P, w, t1, t2)
+    space = _Space(bolt_diameters or EXTENDED_BOLT_DIAMETERS, bolt_grades or BOLT_GRADES,
+                   plate_grades or PLATE_GRADE_LIST, max_rows)
+    stats = SearchStats(space.size(w))
+    P_N = P * 1000
+    t_min = min(t1, t2)
+
+    best_design = None
+    min_length = float('inf')
+    for i_d, d in enumerate(space.bolt_diameters):
+        for i_gb in range(len(space.bolt_grades)):
+            for i_pg in range(len(space.plate_grades)):
+                for rows in range(1, max_rows_for_width(d, w, max_rows) + 1):
+                    stats.evaluated += 1
+                    design = _evaluate(space, P_N, w, t_min, i_d, i_gb, i_pg, rows)
+                    if design is not None and design["length_of_connection"] < min_length:
+                        min_length = design["length_of_connection"]
+                        best_design = design
+
+    if best_design is None:
+        raise ValueError("No suitable design found that meets the requirements.")
+    return best_design, stats
+
+
+def search_lap_joint(P, w, t1, t2, bolt_diameters=None, bolt_grades=None,
+                     plate_grades=None, max_rows=DEFAULT_MAX_ROWS):
+    """
+    Find the shortest bolted lap joint in the expanded design space by branch and bound.
+    Diameters and bolt grades are visited in order of a lower bound on the connection
+    length, using the most rows that fit the plate width. A branch is pruned when its
+    bound is longer than the best design found, or equal to it but later in the
+    exhaustive enumeration order, so the result always equals exhaustive_search_lap_joint.
+    Plate grades are tried in list order, and a layout whose bearing check fails
+    even for the strongest plate grade is pruned as a whole.
+    :param P: Tensile force in kN
+    :param w: Width of the plates in mm
+    :param t1: Thickness of plate 1 in mm
+    :param t2: Thickness of plate 2 in mm
+    :param bolt_diameters: Bolt diameters in mm (defaults to EXTENDED_BOLT_DIAMETERS)
+    :param bolt_grades: Bolt grades (defaults to BOLT_GRADES)
+    :param plate_grades: Plate grade names (defaults to every grade in PLATE_GRADE_LIST)
+    :param max_rows: Maximum number of bolt rows
+    :return: Tuple (design dictionary, SearchStats)
+    :raises ValueError: For invalid inputs, or if no suitable design exists
+    """
+    validate_design_inputs(P, w, t1, t2)
+    space = _Space(bolt_diameters or EXTENDED_BOLT_DIAMETERS, bolt_grades or BOLT_GRADES,
+                   plate_grades or PLATE_GRADE_LIST, max_rows)
+    stats = SearchStats(space.size(w))
+    P_N = P * 1000
+    t_min = min(t1, t2)
+    n_grades = len(space.bolt_grades)
+    n_plates = len(space.plate_grades)
+
+    # The plate grade with the highest ultimate strength gives the largest bearing capacity
+    strongest_plate = max(range(n_plates), key=lambda i: space.tables[i].fu_plate)
+
+    def bound(i_d, i_gb, rows):
+        """Connection length of a (diameter, grade) pair with the given number of rows."""
+        candidate = space.candidate(i_d, i_gb)
+        N_req = _required_bolts(P_N, candidate.shear_capacity)
+        return _layout(N_req, rows, candidate.bolt_diameter, w)[2]
+
+    # Bound for a whole diameter: its strongest bolt grade with the most rows that fit
+    diameter_nodes = []
+    for i_d, d in enumerate(space.bolt_diameters):
+        rows_d = max_rows_for_width(d, w, max_rows)
+        strongest = max(range(n_grades), key=lambda i: space.candidate(i_d, i).shear_capacity)
+        diameter_nodes.append((bound(i_d, strongest, rows_d), i_d, rows_d))
+    diameter_nodes.sort()
+
+    best_design = None
+    best_key = (float('inf'),)  # (length, enumeration index) of the best design
+
+    def prunable(lower_bound, index):
+        return (lower_bound, index) > best_key
+
+    for lb_d, i_d, rows_d in diameter_nodes:
+        if prunable(lb_d, (i_d,)):
+            continue
+
+        grade_nodes = sorted((bound(i_d, i_gb, rows_d), i_gb) for i_gb in range(n_grades))
+        for lb_gb, i_gb in grade_nodes:
+            if prunable(lb_gb, (i_d, i_gb)):
+                continue
+
+            # More rows give shorter layouts, so visit them from the most rows down
+            for rows in range(rows_d, 0, -1):
+                length = bound(i_d, i_gb, rows)
+                if prunable(length, (i_d, i_gb, 0, rows)):
+                    continue
+
+                # Bearing capacity grows with the plate strength, so if the strongest
+                # plate fails, every plate grade fails for this layout
+                stats.evaluated += 1
+                strongest_design = _evaluate(space, P_N, w, t_min, i_d, i_gb, strongest_plate, rows)
+                if strongest_design is None:
+                    continue
+
+                # The first feasible plate grade in enumeration order wins the tie
+                for i_pg in range(n_plates):
+                    index = (i_d, i_gb, i_pg, rows)
+                    if prunable(length, index):
+                        break
+                    if i_pg == strongest_plate:
+                        design = strongest_design
+                    else:
+                        stats.evaluated += 1
+                        design = _evaluate(space, P_N, w, t_min, i_d, i_gb, i_pg, rows)
+                    if design is not None:
+                        best_design = design
+                        best_key = (length, index)
+                        break
+
+    stats.pruned = stats.candidates - stats.evaluated
+    if best_design is None:
+        raise ValueError("No suitable design found that meets the requirements.")
+    return best_design, stats
+
+
+def anytime_search_lap_joint(P, w, t1, t2, time_budget=None, max_evaluations=None, bolt_diameters=None,
+                             bolt_grades=None, plate_grades=None, max_rows=None):
+    """
+    Find a short multi-row bolted lap joint within a time or evaluation budget.
+    The search starts from the single-row design_lap_joint result, evaluated in
+    the search space when its bolt is part of it, so it never returns a longer
+    joint. A greedy pass then designs every diameter with its strongest grade and
+    the most rows that fit, which gives a good layout after one evaluation per
+    diameter. The search then expands diameters, grades and row counts best first
+    by a lower bound on the connection length that counts the bolts both shear
+    and bearing need. The smallest bound still unexplored bounds every remaining
+    design, so when the budget runs out the gap between it and the best design is
+    known. A search that finishes returns the search_lap_joint optimum for the same
+    max_rows with a gap of 0; by default it searches more rows than search_lap_joint
+    (DEFAULT_MAX_ROWS), so its optimum can be shorter.
+    :param P: Tensile force in kN
+    :param w: Width of the plates in mm
+    :param t1: Thickness of plate 1 in mm
+    :param t2: Thickness of plate 2 in mm
+    :param time_budget: Seconds after which the search stops (default: no limit)
+    :param max_evaluations: Number of layout evaluations after which the search stops,
+                            not counting the starting design and the greedy pass (default: no limit)
+    :param bolt_diameters: Bolt diameters in mm (defaults to EXTENDED_BOLT_DIAMETERS)
+    :param bolt_grades: Bolt grades (defaults to BOLT_GRADES)
+    :param plate_grades: Plate grade names (defaults to every grade in PLATE_GRADE_LIST)
+    :param max_rows: Maximum number of bolt rows (default: as many as fit across the width)
+    :return: Tuple (design dictionary, AnytimeStats)
+    :raises ValueError: For invalid inputs or budgets, or if no suitable design was found
+    """
+    validate_design_inputs(P, w, t1, t2)
+    if time_budget is not None and not time_budget >= 0:
+        raise ValueError("Time budget cannot be negative")
+    if max_evaluations is not None and max_evaluations < 0:
+        raise ValueError("Evaluation budget cannot be negative")
+    start = time.perf_counter()
+    deadline = None if time_budget is None else start + time_budget
+
+    space = _Space(bolt_diameters or EXTENDED_BOLT_DIAMETERS, bolt_grades or BOLT_GRADES,
+                   plate_grades or PLATE_GRADE_LIST, math.inf if max_rows is None else max_rows)
+    stats = AnytimeStats(space.size(w))
+    P_N = P * 1000
+    t_min = min(t1, t2)
+    n_grades = len(space.bolt_grades)
+    n_plates = len(space.plate_grades)
+    strongest_plate = max(range(n_plates), key=lambda i: space.tables[i].fu_plate)
+
+    # Bolts the bearing check needs with the strongest plate, less one so that
+    # rounding cannot matter; the bolt grade does not enter the bearing capacity
+    bearing_bolts = []
+    for d in space.bolt_diameters:
+        V_dpb = space.tables[strongest_plate].bearing_capacity(d, t_min)
+        bearing_bolts.append(math.ceil(P_N / (V_dpb * 0.75)) - 1)
+
+    def bound(i_d, i_gb, rows):
+        """Length of a (diameter, grade, rows) layout with at least the bolts bearing needs."""
+        candidate = space.candidate(i_d, i_gb)
+        N_req = max(_required_bolts(P_N, candidate.shear_capacity), bearing_bolts[i_d])
+        return _layout(N_req, rows, candidate.bolt_diameter, w)[2]
+
+    best_design = None
+    best_key = (float('inf'),)  # (length, enumeration index) of the best design
+
+    evaluated_layouts = set()
+
+    def evaluate(i_d, i_gb, rows):
+        """Evaluate a layout once; return (key, design) of its first feasible plate grade, or None."""
+        if (i_d, i_gb, rows) in evaluated_layouts:
+            return None
+        evaluated_layouts.add((i_d, i_gb, rows))
+        stats.evaluated += 1
+        strongest_design = _evaluate(space, P_N, w, t_min, i_d, i_gb, strongest_plate, rows)
+        if strongest_design is None:
+            return None
+        for i_pg in range(n_plates):
+            if i_pg == strongest_plate:
+                design = strongest_design
+            else:
+                stats.evaluated += 1
+                design = _evaluate(space, P_N, w, t_min, i_d, i_gb, i_pg, rows)
+            if design is not None:
+                return (design["length_of_connection"], (i_d, i_gb, i_pg, rows)), design
+
+    def improve(key, design):
+        nonlocal best_key, best_design
+        if key < best_key:
+            best_key, best_design = key, design
+            stats.history.append((stats.evaluated, time.perf_counter() - start, key[0]))
+
+    # Start from the design_lap_joint choice; its length is the same for every plate grade
+    try:
+        single_row = design_lap_joint(P, w, t1, t2)
+    except ValueError:
+        single_row = None
+    if (single_row is not None and single_row["bolt_diameter"] in space.bolt_diameters
+            and single_row["bolt_grade"] in space.bolt_grades):
+        result = evaluate(space.bolt_diameters.index(single_row["bolt_diameter"]),
+                          space.bolt_grades.index(single_row["bolt_grade"]), 1)
+        if result is not None:
+            improve(*result)
+
+    # Greedy pass: the strongest grade with the most rows of each diameter
+    heap = []
+    for i_d, d in enumerate(space.bolt_diameters):
+        rows_d = max_rows_for_width(d, w, space.max_rows)
+        strongest = max(range(n_grades), key=lambda i: space.candidate(i_d, i).shear_capacity)
+        result = evaluate(i_d, strongest, rows_d)
+        if result is not None:
+            improve(*result)
+        heap.append((bound(i_d, strongest, rows_d), (i_d,), rows_d))
+    heapq.heapify(heap)
+    greedy_evaluations = stats.evaluated
+
+    # Best-first expansion; a node's bound never exceeds those of its children.
+    # Nodes are (bound, index, rows): a diameter (i_d,), a grade (i_d, i_gb) with
+    # up to rows rows, or one layout (i_d, i_gb, 0, rows)
+    while heap and heap[0][:2] < best_key:
+        if ((deadline is not None and time.perf_counter() >= deadline)
+                or (max_evaluations is not None and stats.evaluated - greedy_evaluations >= max_evaluations)):
+            break
+        length, index, rows = heapq.heappop(heap)
+        if len(index) == 1:
+            for i_gb in range(n_grades):
+                heapq.heappush(heap, (bound(index[0], i_gb, rows), index + (i_gb,), rows))
+        elif len(index) == 2:
+            for r in range(rows, 0, -1):
+                heapq.heappush(heap, (bound(*index, r), index + (0, r), r))
+        else:
+            result = evaluate(index[0], index[1], rows)
+            if result is not None:
+                improve(*result)
+
+    stats.elapsed = time.perf_counter() - start
+    stats.optimal = not heap or heap[0][:2] >= best_key
+    if best_design is None:
+        stats.lower_bound = heap[0][0] if heap else float('inf')
+        if stats.optimal:
+            raise ValueError("No suitable design found that meets the requirements.")
+        raise ValueError("No suitable design found within the search budget.")
+    stats.lower_bound = best_key[0] if stats.optimal else min(heap[0][0], best_key[0])
+    stats.gap = (best_key[0] - stats.lower_bound) / best_key[0] if best_key[0] > 0 else 0.0
+    if stats.optimal:
+        # Candidates left unexplored by the budget are not counted as pruned
+        stats.pruned = stats.candidates - stats.evaluated
+    return best_design, stats
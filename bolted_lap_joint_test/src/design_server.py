@@ -0,0 +1,278 @@
+"""
+Long-running local design server.
+The server keeps the design engine, capacity tables and NumPy loaded, and accepts
+JSON design requests over a Unix socket (one JSON object per line) or localhost
+HTTP (POST /design). Identical requests that are in flight at the same time are
+coalesced, and requests arriving close together are micro-batched through the
+vectorized batch path.
+"""
+
+import asyncio
+import json
+import os
+import stat
+import time
+
+from bolted_lap_joint_design import get_capacity_table
+from stream_design import parse_record
+
+# Longest time in seconds a request waits for others to join its batch
+DEFAULT_BATCH_WINDOW = 0.002
+
+# Largest number of distinct requests designed in one batch
+DEFAULT_MAX_BATCH = 4096
+
+# Largest HTTP request body accepted, in bytes
+MAX_BODY_SIZE = 16 * 1024 * 1024
+
+_NO_DESIGN = "No suitable design found that meets the requirements."
+
+
+class DesignService:
+    """
+    Request coalescing and micro-batching in front of design_lap_joint_batch.
+    Must be used from a running event loop.
+    """
+
+    def __init__(self, batch_window=DEFAULT_BATCH_WINDOW, max_batch=DEFAULT_MAX_BATCH):
+        if batch_window < 0:
+            raise ValueError("Batch window cannot be negative")
+        if max_batch < 1:
+            raise ValueError("Maximum batch size must be at least 1")
+
+        # Imported here so that the CLI only loads NumPy when it starts a server
+        from batch_design import design_lap_joint_batch, design_from_batch, get_candidate_arrays
+
+        self._design_batch = design_lap_joint_batch
+        self._design_from_batch = design_from_batch
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+
+        self._inflight = {}  # inputs -> future shared by identical requests
+        self._queue = []  # inputs waiting for the next batch
+        self._flush_handle = None
+
+        self.requests = 0
+        self.coalesced = 0
+        self.batches = 0
+        self.designed = 0
+        self.started = time.time()
+
+        # Warm the capacity table and the candidate arrays used by the batch path
+        get_candidate_arrays(get_capacity_table())
+
+    def stats(self):
+        """Return request, coalescing and batching counters."""
+        return {
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "batches": self.batches,
+            "designed": self.designed,
+            "mean_batch_size": self.designed / self.batches if self.batches else 0.0,
+            "uptime": time.time() - self.started,
+        }
+
+    async def design(self, record):
+        """
+        Design one request.
+        :param record: Dictionary with load, width, thickness1 and thickness2 fields
+        :return: Design dictionary
+        :raises ValueError: For invalid inputs, or if no suitable design exists
+        """
+        self.requests += 1
+        inputs = parse_record(record)
+
+        future = self._inflight.get(inputs)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[inputs] = future
+            self._queue.append(inputs)
+            if len(self._queue) >= self.max_batch:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = asyncio.get_running_loop().call_later(self.batch_window, self._flush)
+
+        # Shield the shared future so one cancelled client does not cancel the others
+        design = await asyncio.shield(future)
+        if design is None:
+            raise ValueError(_NO_DESIGN)
+        return design
+
+    def _flush(self):
+        """Design every queued request in one vectorized call and resolve their futures."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        queue, self._queue = self._queue, []
+        if not queue:
+            return
+
+        self.batches += 1
+        self.designed += len(queue)
+        try:
+            P, w, t1, t2 = zip(*queue)
+            results = self._design_batch(P, w, t1, t2)
+        except Exception as e:
+            for inputs in queue:
+                self._inflight.pop(inputs).set_exception(e)
+            return
+
+        for i, inputs in enumerate(queue):
+            self._inflight.pop(inputs).set_result(self._design_from_batch(results, i))
+
+    async def handle(self, payload):
+        """
+        Answer one decoded request object or a list of them.
+        :return: Response object, or a list of response objects
+        """
+        if isinstance(payload, list):
+            return list(await asyncio.gather(*(self.handle(item) for item in payload)))
+        if not isinstance(payload, dict):
+            return {"error": "Each request must be a JSON object"}
+
+        response = {"id": payload["id"]} if "id" in payload else {}
+        try:
+            response["design"] = await self.design(payload)
+        except ValueError as e:
+            response["error"] = str(e)
+        return response
+
+
+async def _handle_lines(service, reader, writer):
+    """Serve newline-delimited JSON requests on one stream connection."""
+    pending = set()
+    lock = asyncio.Lock()
+
+    async def answer(line):
+        # ValueError also covers lines that are not valid UTF-8
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            response = {"error": f"Invalid JSON request: {e}"}
+        else:
+            response = await service.handle(request)
+        async with lock:
+            writer.write((json.dumps(response) + "\n").encode())
+            await writer.drain()
+
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if not line.strip():
+                continue
+            # Answer requests concurrently so pipelined lines can share a batch;
+            # clients match responses to requests by their "id"
+            task = asyncio.ensure_future(answer(line))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        if pending:
+            await asyncio.gather(*pending)
+    finally:
+        writer.close()
+
+
+def _http_response(status, body):
+    reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large"}
+    data = json.dumps(body).encode()
+    head = (f"HTTP/1.1 {status} {reason[status]}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n")
+    return head.encode() + data
+
+
+async def _handle_http(service, reader, writer):
+    """Serve HTTP/1.1 requests (with keep-alive) on one connection."""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line.strip():
+                break
+            try:
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+            except ValueError:
+                writer.write(_http_response(400, {"error": "Malformed request line"}))
+                break
+
+            headers = {}
+            while True:
+                header = await reader.readline()
+                if header in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = header.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            try:
+                length = int(headers.get("content-length", 0) or 0)
+            except ValueError:
+                length = -1
+            if length < 0:
+                writer.write(_http_response(400, {"error": "Invalid Content-Length header"}))
+                break
+            if length > MAX_BODY_SIZE:
+                writer.write(_http_response(413, {"error": "Request body too large"}))
+                break
+            body = await reader.readexactly(length) if length else b""
+
+            if path == "/health" and method == "GET":
+                response = _http_response(200, {"status": "ok", **service.stats()})
+            elif path == "/design":
+                if method != "POST":
+                    response = _http_response(405, {"error": "Use POST for /design"})
+                else:
+                    try:
+                        request = json.loads(body)
+                    except ValueError as e:
+                        response = _http_response(400, {"error": f"Invalid JSON request: {e}"})
+                    else:
+                        response = _http_response(200, await service.handle(request))
+            else:
+                response = _http_response(404, {"error": f"Unknown path: {path}"})
+
+            writer.write(response)
+            await writer.drain()
+            if headers.get("connection", "").lower() == "close":
+                break
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(service, unix_path=None, host="127.0.0.1", port=8765):
+    """
+    Start serving design requests.
+    :param service: DesignService handling the requests
+    :param unix_path: Serve newline-delimited JSON on this Unix socket instead of HTTP
+    :param host: HTTP host (localhost by default)
+    :param port: HTTP port (0 picks a free port)
+    :return: asyncio Server
+    """
+    if unix_path is not None:
+        return await asyncio.start_unix_server(lambda r, w: _handle_lines(service, r, w), path=unix_path)
+    return await asyncio.start_server(lambda r, w: _handle_http(service, r, w), host=host, port=port)
+
+
+async def serve_forever(unix_path=None, host="127.0.0.1", port=8765,
+                        batch_window=DEFAULT_BATCH_WINDOW, max_batch=DEFAULT_MAX_BATCH, ready=None):
+    """
+    Create a DesignService and serve until cancelled.
+    :param ready: Optional callable invoked with the started server
+    """
+    service = DesignService(batch_window, max_batch)
+    # A socket file left behind by a server that was killed would block the bind
+    if unix_path is not None and os.path.exists(unix_path) and stat.S_ISSOCK(os.stat(unix_path).st_mode):
+        os.unlink(unix_path)
+
+    server = await start_server(service, unix_path, host, port)
+    if ready is not None:
+        ready(server)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if unix_path is not None and os.path.exists(unix_path):
+            os.unlink(unix_path)
@@ -0,0 +1,181 @@
+"""
+Parametric sweeps producing design maps.
+A sweep designs every combination of load, width and plate thicknesses through
+the vectorized batch path and writes the results into memory-mapped .npy arrays
+with one axis per input, block by block. Progress is recorded after each block,
+so grids larger than memory can be built and an interrupted sweep resumes from
+the last completed block.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from batch_design import design_lap_joint_batch
+from design_cache import rules_version
+
+# Number of grid points designed per block
+DEFAULT_SWEEP_BLOCK = 65536
+
+# Input axes of a design map, in array axis order
+SWEEP_AXES = ("load", "width", "thickness1", "thickness2")
+
+# Result arrays of a design map and their element types; no design is marked by
+# a candidate index of -1, zero bolts and NaN in the float maps
+SWEEP_FIELDS = {
+    "candidate_index": "<i4",
+    "bolt_diameter": "<f8",
+    "bolt_grade": "<f8",
+    "number_of_bolts": "<i4",
+    "length_of_connection": "<f8",
+    "strength_of_connection": "<f8",
+    "efficiency_of_connection": "<f8",
+}
+
+MANIFEST_NAME = "sweep.json"
+
+# Valid range of each axis, as (lowest value, whether it may equal it, highest value)
+_AXIS_LIMITS = {
+    "load": (0, True, float("inf")),
+    "width": (0, False, 1000),
+    "thickness1": (0, False, 100),
+    "thickness2": (0, False, 100),
+}
+
+
+def parse_range(text):
+    """
+    Parse the values of one sweep axis.
+    :param text: 'start:stop:count' for evenly spaced values including both ends,
+                 a comma-separated list of values, or a single value
+    :return: List of floats
+    :raises ValueError: If the text cannot be parsed
+    """
+    try:
+        if ":" in text:
+            start, stop, count = text.split(":")
+            count = int(count)
+            if count < 1:
+                raise ValueError
+            return np.linspace(float(start), float(stop), count).tolist()
+        return [float(value) for value in text.split(",")]
+    except ValueError:
+        raise ValueError(f"Invalid range {text!r}, expected start:stop:count, a list like 6,8,10, or a value")
+
+
+def _validate_axes(axes):
+    """Check every axis value against the input limits of design_lap_joint."""
+    for name in SWEEP_AXES:
+        values = axes[name]
+        if not values:
+            raise ValueError(f"Axis {name} has no values")
+        low, inclusive, high = _AXIS_LIMITS[name]
+        for value in values:
+            if not np.isfinite(value) or value < low or (value == low and not inclusive) or value > high:
+                raise ValueError(f"Value {value} of axis {name} is outside the valid input range")
+
+
+def _write_manifest(path, manifest):
+    """Replace the manifest atomically, so an interruption never leaves it half written."""
+    target = os.path.join(path, MANIFEST_NAME)
+    temporary = target + ".tmp"
+    with open(temporary, "w") as f:
+        json.dump(manifest, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, target)
+
+
+def _read_manifest(path):
+    target = os.path.join(path, MANIFEST_NAME)
+    if not os.path.exists(target):
+        return None
+    with open(target) as f:
+        return json.load(f)
+
+
+def run_sweep(path, loads, widths, thicknesses1, thicknesses2, block_size=DEFAULT_SWEEP_BLOCK,
+              restart=False, progress=None):
+    """
+    Design every grid point and store the design map in a directory.
+    A sweep already present in the directory with the same axes and design rules
+    is resumed from its last completed block; otherwise the directory is started over.
+    :param path: Output directory, created if needed
+    :param loads: Tensile forces in kN
+    :param widths: Widths of the plates in mm
+    :param thicknesses1: Thicknesses of plate 1 in mm
+    :param thicknesses2: Thicknesses of plate 2 in mm
+    :param block_size: Number of grid points designed and recorded per block
+    :param restart: Discard any stored progress
+    :param progress: Optional callable invoked with (completed points, total points) after each block
+    :return: Manifest dictionary describing the finished sweep
+    :raises ValueError: For invalid axis values or block size
+    """
+    if block_size < 1:
+        raise ValueError("Block size must be at least 1")
+    axes = dict(zip(SWEEP_AXES, ([float(v) for v in values]
+                                 for values in (loads, widths, thicknesses1, thicknesses2))))
+    _validate_axes(axes)
+    shape = tuple(len(axes[name]) for name in SWEEP_AXES)
+    total = int(np.prod(shape))
+
+    os.makedirs(path, exist_ok=True)
+    manifest = _read_manifest(path)
+    resume = (not restart and manifest is not None and manifest["axes"] == axes
+              and manifest["fields"] == SWEEP_FIELDS
+              and manifest["rules_version"] == rules_version()
+              and all(os.path.exists(os.path.join(path, f"{name}.npy")) for name in SWEEP_FIELDS))
+
+    maps = {}
+    if resume:
+        for name in SWEEP_FIELDS:
+            maps[name] = np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r+")
+    else:
+        manifest = {"axes": axes, "shape": list(shape), "fields": SWEEP_FIELDS,
+                    "rules_version": rules_version(), "completed": 0, "total": total}
+        # Mark the sweep as not started before any array is replaced
+        _write_manifest(path, manifest)
+        for name, dtype in SWEEP_FIELDS.items():
+            maps[name] = np.lib.format.open_memmap(os.path.join(path, f"{name}.npy"), mode="w+",
+                                                   dtype=dtype, shape=shape)
+
+    flat = {name: array.reshape(-1) for name, array in maps.items()}
+    values = [np.asarray(axes[name]) for name in SWEEP_AXES]
+
+    start = manifest["completed"]
+    while start < total:
+        stop = min(start + block_size, total)
+        index = np.unravel_index(np.arange(start, stop), shape)
+        results = design_lap_joint_batch(*(axis[i] for axis, i in zip(values, index)))
+        for name in SWEEP_FIELDS:
+            flat[name][start:stop] = results[name]
+
+        # Results reach the files before the block is recorded as completed
+        for array in maps.values():
+            array.flush()
+        manifest["completed"] = stop
+        _write_manifest(path, manifest)
+        start = stop
+        if progress is not None:
+            progress(stop, total)
+
+    return manifest
+
+
+def load_sweep(path):
+    """
+    Open a stored design map read-only.
+    :param path: Directory written by run_sweep
+    :return: Dictionary with the "axes" values, "completed" and "total" point counts,
+             and one memory-mapped array per SWEEP_FIELDS entry, indexed as
+             [load, width, thickness1, thickness2]
+    :raises ValueError: If the directory holds no sweep
+    """
+    manifest = _read_manifest(path)
+    if manifest is None:
+        raise ValueError(f"No sweep found in {path}")
+    sweep = {"axes": manifest["axes"], "completed": manifest["completed"], "total": manifest["total"]}
+    for name in manifest["fields"]:
+        sweep[name] = np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+    return sweep
@@ -0,0 +1,137 @@
+"""
+Design of a whole joint schedule with deduplication.
+A structural model usually has many lap joints with identical or nearly
+identical inputs. design_schedule groups the joints whose load, width and plate
+thicknesses agree within a tolerance, runs design_lap_joint once per group and
+fans the design back out to every joint ID of the group.
+"""
+
+import json
+import math
+import time
+
+from bolted_lap_joint_design import design_lap_joint
+from stream_design import _result, decode_record, parse_record
+
+# Default grouping tolerance; 0 only merges joints with equal inputs
+DEFAULT_TOLERANCE = 0.0
+
+
+def schedule_key(inputs, tolerance=DEFAULT_TOLERANCE):
+    """
+    Return the group key of one joint.
+    With a tolerance, every input is binned into intervals [k * tolerance, (k + 1) * tolerance),
+    so all joints of a group differ by less than the tolerance in each input. An input
+    too large for its bin number to be a finite float (for a tiny tolerance) is keyed
+    by its exact value instead.
+    :param inputs: Tuple (P, w, t1, t2) of floats
+    :param tolerance: Bin width in the units of each input (kN for the load, mm otherwise)
+    :return: Hashable key
+    """
+    if tolerance > 0:
+        return tuple(_bin(value, tolerance) for value in inputs)
+    # Adding 0.0 folds -0.0 into 0.0
+    return tuple(value + 0.0 for value in inputs)
+
+
+def _bin(value, tolerance):
+    """Return the bin number of one input, or a tagged exact value if it is not finite."""
+    quotient = value / tolerance
+    if math.isfinite(quotient):
+        return math.floor(quotient)
+    # Tagged, so an exact value never equals a bin number
+    return ("exact", value + 0.0)
+
+
+def governing_inputs(group):
+    """
+    Return the inputs a group of joints is designed for.
+    The largest load and the smallest width and thicknesses govern, so the design
+    is safe for every joint in the group.
+    :param group: List of (P, w, t1, t2) tuples
+    :return: Tuple (P, w, t1, t2)
+    """
+    loads, widths, thicknesses1, thicknesses2 = zip(*group)
+    return max(loads), min(widths), min(thicknesses1), min(thicknesses2)
+
+
+def load_schedule(stream):
+    """
+    Read a joint schedule from a text stream.
+    :param stream: Text stream holding a JSON list of joint objects, a JSON object
+                   with such a list under "joints", or one JSON joint object per line
+    :return: List of dictionaries or ValueError instances, one per joint
+    :raises ValueError: If a JSON document is neither a list nor holds "joints"
+    """
+    text = stream.read()
+    try:
+        document = json.loads(text)
+    except json.JSONDecodeError:
+        # Not one JSON document, so one joint per line
+        return [decode_record(line.strip()) for line in text.splitlines() if line.strip()]
+
+    joints = document.get("joints") if isinstance(document, dict) else document
+    if not isinstance(joints, list):
+        raise ValueError("A joint schedule must be a list of joint objects")
+    return [joint if isinstance(joint, dict) else ValueError("Each joint must be an object") for joint in joints]
+
+
+def design_schedule(joints, tolerance=DEFAULT_TOLERANCE):
+    """
+    Design every joint of a schedule, designing each group of equal joints once.
+    :param joints: Iterable of joint dictionaries (load, width, thickness1 and thickness2
+                   fields as in stream_design, and an optional "id"), or ValueError instances
+    :param tolerance: Joints whose inputs fall into the same bins of this width share
+                      one design (see schedule_key); 0 only merges equal inputs
+    :return: Tuple (results, summary). results holds one object per joint in input order,
+             with its "index", "id", the "group" it was designed in and its "design",
+             or an "error". summary holds the number of joints, unique designs and
+             errors, the dedup ratio (valid joints per unique design) and the design
+             and total times in seconds
+    :raises ValueError: If the tolerance is negative or not finite
+    """
+    if not tolerance >= 0:
+        raise ValueError("Tolerance cannot be negative")
+    if not math.isfinite(tolerance):
+        raise ValueError("Tolerance must be finite")
+    start = time.perf_counter()
+
+    # Group the valid joints by key, in order of first appearance
+    groups = {}
+    members = []
+    results = []
+    for index, joint in enumerate(joints):
+        try:
+            if isinstance(joint, Exception):
+                raise joint
+            inputs = parse_record(joint)
+        except ValueError as e:
+            results.append(_result(index, joint, error=str(e)))
+            continue
+        results.append(None)  # Filled in once the group is designed
+        group = groups.setdefault(schedule_key(inputs, tolerance), len(groups))
+        if group == len(members):
+            members.append([])
+        members[group].append((index, joint, inputs))
+
+    design_start = time.perf_counter()
+    for group, group_joints in enumerate(members):
+        try:
+            design, error = design_lap_joint(*governing_inputs([inputs for _, _, inputs in group_joints])), None
+        except ValueError as e:
+            design, error = None, str(e)
+        for index, joint, _ in group_joints:
+            results[index] = _result(index, joint, design=None if error else dict(design), error=error)
+            results[index]["group"] = group
+    end = time.perf_counter()
+
+    valid = sum(len(group_joints) for group_joints in members)
+    summary = {
+        "joints": len(results),
+        "unique_designs": len(members),
+        "errors": sum(1 for result in results if "error" in result),
+        "dedup_ratio": valid / len(members) if members else 1.0,
+        "design_time": end - design_start,
+        "total_time": end - start,
+    }
+    return results, summary
@@ -0,0 +1,269 @@
+"""
+Load breakpoint index for repeated designs of one joint geometry.
+For fixed (w, t1, t2) the design chosen by design_lap_joint is piecewise constant
+in the load P. It can only change where a candidate needs one more bolt or where
+a candidate's utilization crosses 1. The index precomputes those breakpoints and
+the design chosen between them, so a new load is answered with a binary search.
+The number of breakpoints grows linearly with the load, so the index stops at
+MAX_INDEX_LOAD and higher loads are designed with design_lap_joint.
+"""
+
+import math
+from bisect import bisect_left
+from functools import lru_cache
+
+from bolted_lap_joint_design import design_lap_joint, get_capacity_table, validate_design_inputs
+
+# Highest load in kN covered when an index is first built; it is extended on demand
+DEFAULT_MAX_LOAD = 1000
+
+# Highest load in kN an index is ever extended to (a few thousand breakpoints for
+# the shipped catalogue); higher loads are designed without the index
+MAX_INDEX_LOAD = 10000
+
+# Loads closer than this relative tolerance to a breakpoint are designed with a full
+# scan, because rounding decides which side of the breakpoint they fall on
+BREAKPOINT_TOLERANCE = 1e-9
+
+# Maximum number of geometries whose index is kept by get_load_index
+INDEX_CACHE_SIZE = 4096
+
+
+class LoadIndex:
+    """
+    Breakpoint index answering "which design for load P" for one joint geometry.
+    The breakpoints split [0, max_load] into intervals that are closed on the right,
+    and each interval stores the candidate chosen by design_lap_joint for every
+    load inside it (or None if no candidate is feasible). max_load grows on demand
+    up to MAX_INDEX_LOAD; loads above it are answered without the index.
+    """
+
+    def __init__(self, w, t1, t2, max_load=DEFAULT_MAX_LOAD):
+        """
+        Build the index.
+        :param w: Width of the plates in mm
+        :param t1: Thickness of plate 1 in mm
+        :param t2: Thickness of plate 2 in mm
+        :param max_load: Highest load in kN to index initially (at most MAX_INDEX_LOAD)
+        """
+        validate_design_inputs(0, w, t1, t2)
+        self.w = w
+        self.t1 = t1
+        self.t2 = t2
+
+        self._table = get_capacity_table()
+        t_min = min(t1, t2)
+        # (shear capacity, bearing capacity) of each candidate in search order
+        self._capacities = [
+            (candidate.shear_capacity, self._table.bearing_capacity(candidate.bolt_diameter, t_min))
+            for candidate in self._table.candidates
+        ]
+        self._build(min(max_load, MAX_INDEX_LOAD))
+
+    def _choose(self, P_N):
+        """
+        Scan every candidate for one load, exactly as design_lap_joint does.
+        :param P_N: Load in N
+        :return: Tuple (candidate index, number of bolts), or None if nothing is feasible
+        """
+        best = None
+        min_length = float('inf')
+        for i, (candidate, (V_b, V_dpb)) in enumerate(zip(self._table.candidates, self._capacities)):
+            N_b = math.ceil(P_N / (V_b * 0.75))
+            if N_b < 2:
+                N_b = 2
+            length_of_connection = 2 * candidate.end_distance + (N_b - 1) * candidate.pitch_distance
+            Utilization_ratio = P_N / (N_b * min(V_b, V_dpb) * 0.75)
+            if Utilization_ratio <= 1 and length_of_connection < min_length:
+                min_length = length_of_connection
+                best = i
+        return best
+
+    def _build(self, max_load):
+        """Compute the breakpoints and chosen candidates for loads up to max_load."""
+        P_N_max = max_load * 1000
+        points = {P_N_max}
+        for V_b, V_dpb in self._capacities:
+            # The bolt count of a candidate steps up just above k * V_b * 0.75
+            step = V_b * 0.75
+            points.update(k * step for k in range(2, int(P_N_max // step) + 1))
+            # A candidate weaker in bearing than in shear is only feasible up to
+            # k * V_dpb * 0.75 within the step where it uses k bolts
+            if V_dpb < V_b:
+                step = V_dpb * 0.75
+                points.update(k * step for k in range(2, int(P_N_max // step) + 1))
+
+        points_N = sorted(p for p in points if p > 0)
+        self.max_load = max_load
+        self._breakpoints = [p / 1000 for p in points_N]
+
+        # Any load strictly inside an interval sees the same bolt counts and
+        # feasibility for every candidate, so its midpoint represents it
+        self._choices = []
+        lower = 0
+        for upper in points_N:
+            self._choices.append(self._choose((lower + upper) / 2))
+            lower = upper
+
+    @property
+    def breakpoints(self):
+        """Loads in kN at which the chosen design may change, in increasing order."""
+        return list(self._breakpoints)
+
+    def _extend(self, P):
+        """Extend the index to cover a load, if it is within MAX_INDEX_LOAD."""
+        if self.max_load < P <= MAX_INDEX_LOAD:
+            self._build(min(max(2 * self.max_load, 1.5 * P), MAX_INDEX_LOAD))
+
+    def _locate(self, P):
+        """
+        Return the interval index of a load, extending the index if needed.
+        :return: Interval index, or None if P is too close to a breakpoint to trust the
+                 index or above MAX_INDEX_LOAD
+        """
+        self._extend(P)
+        if P > self.max_load:
+            return None
+
+        i = bisect_left(self._breakpoints, P)
+        tolerance = BREAKPOINT_TOLERANCE * max(1.0, P)
+        if abs(self._breakpoints[i] - P) <= tolerance or (i > 0 and abs(P - self._breakpoints[i - 1]) <= tolerance):
+            return None
+        return i
+
+    def choice(self, P):
+        """
+        Return the index into get_capacity_table().candidates chosen for a load.
+        :param P: Tensile force in kN
+        :return: Candidate index, or None if no suitable design exists
+        """
+        if P < 0:
+            raise ValueError("Tensile force P cannot be negative")
+        i = self._locate(P)
+        if i is None:
+            return self._choose(P * 1000)
+        return self._choices[i]
+
+    def design(self, P):
+        """
+        Return the design for a load, equal to design_lap_joint(P, w, t1, t2).
+        :param P: Tensile force in kN
+        :return: Dictionary of design parameters and results
+        :raises ValueError: If P is negative or no suitable design exists
+        """
+        if P > max(self.max_load, MAX_INDEX_LOAD):
+            return design_lap_joint(P, self.w, self.t1, self.t2)
+        i = self.choice(P)
+        if i is None:
+            raise ValueError("No suitable design found that meets the requirements.")
+
+        candidate = self._table.candidates[i]
+        V_b, V_dpb = self._capacities[i]
+        P_N = P * 1000
+        N_b = math.ceil(P_N / (V_b * 0.75))
+        if N_b < 2:
+            N_b = 2
+        d = candidate.bolt_diameter
+        e = candidate.end_distance
+        p = candidate.pitch_distance
+
+        return {
+            "bolt_diameter": d,
+            "bolt_grade": candidate.bolt_grade,
+            "number_of_bolts": N_b,
+            "pitch_distance": p,
+            "gauge_distance": self.w / 2,
+            "end_distance": e,
+            "edge_distance": e,
+            "number_of_rows": 1,
+            "number_of_columns": N_b,
+            "hole_diameter": d + 2,
+            "strength_of_connection": N_b * min(V_b, V_dpb) * 0.75,
+            "yield_strength_plate_1": self._table.fy_plate,
+            "yield_strength_plate_2": self._table.fy_plate,
+            "length_of_connection": 2 * e + (N_b - 1) * p,
+            "efficiency_of_connection": P_N / (N_b * min(V_b, V_dpb) * 0.75),
+        }
+
+    def next_breakpoint(self, P):
+        """
+        Return the lowest breakpoint above a load, where the chosen design may change.
+        :param P: Tensile force in kN
+        :return: Load in kN
+        """
+        self._extend(P)
+        i = bisect_left(self._breakpoints, P)
+        while i < len(self._breakpoints) and self._breakpoints[i] <= P:
+            i += 1
+        # The last breakpoint is max_load, which only ends the index
+        if i >= len(self._breakpoints) - 1:
+            return self._scan_next_breakpoint(P)
+        return self._breakpoints[i]
+
+    def _scan_next_breakpoint(self, P):
+        """Return the lowest breakpoint above a load from the candidates, without the index."""
+        P_N = P * 1000
+        lowest = math.inf
+        for V_b, V_dpb in self._capacities:
+            steps = (V_b * 0.75, V_dpb * 0.75) if V_dpb < V_b else (V_b * 0.75,)
+            for step in steps:
+                k = max(2, math.floor(P_N / step) + 1)
+                while k * step <= P_N:
+                    k += 1
+                lowest = min(lowest, k * step)
+        return lowest / 1000
+
+    def headroom(self, P):
+        """
+        Describe how close a joint is to needing a different design.
+        :param P: Tensile force in kN
+        :return: Dictionary with the current number of bolts, the load at which the
+                 chosen bolt needs one more bolt, and the next breakpoint of the index
+        """
+        design = self.design(P)
+        V_b = self._capacities[self.choice(P)][0]
+        next_bolt_load = design["number_of_bolts"] * (V_b * 0.75) / 1000
+        return {
+            "load": P,
+            "number_of_bolts": design["number_of_bolts"],
+            "load_for_next_bolt": next_bolt_load,
+            "margin_to_next_bolt": next_bolt_load - P,
+            "next_breakpoint": self.next_breakpoint(P),
+        }
+
+
+def get_load_index(w, t1, t2):
+    """
+    Return the load index of a geometry, building it on first use.
+    Indexes are kept per capacity table, so changing the catalogue (see
+    use_catalogue) builds new ones.
+    :param w: Width of the plates in mm
+    :param t1: Thickness of plate 1 in mm
+    :param t2: Thickness of plate 2 in mm
+    :return: LoadIndex instance
+    """
+    return _cached_load_index(get_capacity_table(), w, t1, t2)
+
+
+@lru_cache(maxsize=INDEX_CACHE_SIZE)
+def _cached_load_index(table, w, t1, t2):
+    """Build the load index of a geometry on the capacity table it is cached for."""
+    return LoadIndex(w, t1, t2)
+
+
+def design_for_loads(loads, w, t1, t2):
+    """
+    Design one joint geometry for several load cases using its cached load index.
+    :param loads: Iterable of tensile forces in kN
+    :return: List of design dictionaries, with None where no suitable design exists
+    """
+    index = get_load_index(w, t1, t2)
+    designs = []
+    for P in loads:
+        try:
+            designs.append(index.design(P))
+        except ValueError:
+            if P < 0:
+                raise
+            designs.append(None)
+    return designs
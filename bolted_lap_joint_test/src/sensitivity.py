@@ -0,0 +1,156 @@
+"""
+Sensitivity of a bolted lap joint design to small changes of its inputs.
+design_sensitivity designs a joint and every one-input perturbation of it in a
+single analysis. The chosen bolt only depends on the load and the thinner plate,
+so each distinct (load, thinner plate) pair is searched once with the indexed
+search order of the capacity table, and changes of the width or of the thicker
+plate reuse the search of the base design; the width only moves the gauge. The
+result is a table of which input changes flip the chosen design.
+"""
+
+import math
+
+from bolted_lap_joint_design import DesignRecord, get_capacity_table, validate_design_inputs
+
+# Input names in design_lap_joint argument order
+SENSITIVITY_INPUTS = ("load", "width", "thickness1", "thickness2")
+
+# Changes applied to each input by default, in kN for the load and mm otherwise
+DEFAULT_PERTURBATIONS = {
+    "load": (-10.0, 10.0),
+    "width": (-10.0, 10.0),
+    "thickness1": (-2.0, 2.0),
+    "thickness2": (-2.0, 2.0),
+}
+
+_NO_DESIGN = "No suitable design found that meets the requirements."
+
+
+class _SharedSearch:
+    """Design searches shared by the designs of one sensitivity analysis."""
+
+    def __init__(self, table):
+        self.table = table
+        self._choices = {}  # (P_N, t_min) -> (position, bolts) of the chosen candidate, or None
+
+    def choose(self, P_N, t_min):
+        """
+        Position and bolt count of the shortest feasible candidate, the first one on ties
+        as in design_lap_joint. The search uses the indexed search order of the table, and
+        each (load, thinner plate) pair is searched once, so changes of the width or of
+        the thicker plate reuse the search of the base design.
+        """
+        key = (P_N, t_min)
+        if key not in self._choices:
+            table = self.table
+            best = (float('inf'), len(table.candidates))
+            choice = None
+            for position, candidate in table.search_order(P_N, t_min, lambda: best):
+                N_b = max(math.ceil(P_N / (candidate.shear_capacity * 0.75)), 2)  # Using a safety factor of 1.33
+                length = 2 * candidate.end_distance + (N_b - 1) * candidate.pitch_distance
+                if (length, position) >= best:
+                    continue
+                V_dpb = table.bearing_capacity(candidate.bolt_diameter, t_min)
+                if P_N / (N_b * min(candidate.shear_capacity, V_dpb) * 0.75) > 1:
+                    continue
+                best = (length, position)
+                choice = (position, N_b)
+            self._choices[key] = choice
+        return self._choices[key]
+
+    def design(self, P, w, t1, t2):
+        """
+        Design one joint from the shared terms.
+        :return: Design dictionary equal to design_lap_joint(P, w, t1, t2)
+        :raises ValueError: For invalid inputs, or if no suitable design exists
+        """
+        validate_design_inputs(P, w, t1, t2)
+        P_N = P * 1000
+        t_min = min(t1, t2)
+        choice = self.choose(P_N, t_min)
+        if choice is None:
+            raise ValueError(_NO_DESIGN)
+
+        position, N_b = choice
+        candidate = self.table.candidates[position]
+        e = candidate.end_distance
+        p = candidate.pitch_distance
+        capacity = min(candidate.shear_capacity, self.table.bearing_capacity(candidate.bolt_diameter, t_min))
+        return DesignRecord(
+            candidate.bolt_diameter, candidate.bolt_grade, N_b, 1, p, w / 2, e, N_b * capacity * 0.75,
+            self.table.fy_plate, 2 * e + (N_b - 1) * p, P_N / (N_b * capacity * 0.75),
+        ).as_dict()
+
+
+def _choice(design):
+    """The part of a design a reviewer sees as 'the chosen design'."""
+    return design["bolt_diameter"], design["bolt_grade"], design["number_of_bolts"]
+
+
+def design_sensitivity(P, w, t1, t2, perturbations=None):
+    """
+    Design a joint and each one-input perturbation of it.
+    :param P: Tensile force in kN
+    :param w: Width of the plates in mm
+    :param t1: Thickness of plate 1 in mm
+    :param t2: Thickness of plate 2 in mm
+    :param perturbations: Mapping from input name (see SENSITIVITY_INPUTS) to the changes
+                          applied to it one at a time (defaults to DEFAULT_PERTURBATIONS)
+    :return: Dictionary with the base "design" and a "table" with one row per change:
+             input, delta, value, status ('same' design, 'flipped' to another bolt
+             diameter, grade or count, or 'infeasible'), the bolt_diameter, bolt_grade,
+             number_of_bolts, length_of_connection and efficiency_of_connection of the
+             changed design, its length_change from the base design, and error when infeasible
+    :raises ValueError: For invalid inputs or perturbation names, or if the base joint has no design
+    """
+    if perturbations is None:
+        perturbations = DEFAULT_PERTURBATIONS
+    for name in perturbations:
+        if name not in SENSITIVITY_INPUTS:
+            raise ValueError(f"Unknown input {name!r}, expected one of {', '.join(SENSITIVITY_INPUTS)}")
+
+    search = _SharedSearch(get_capacity_table())
+    base_inputs = (P, w, t1, t2)
+    base = search.design(*base_inputs)
+
+    table = []
+    for name, deltas in perturbations.items():
+        axis = SENSITIVITY_INPUTS.index(name)
+        for delta in deltas:
+            inputs = list(base_inputs)
+            inputs[axis] += delta
+            row = {"input": name, "delta": delta, "value": inputs[axis]}
+            try:
+                design = search.design(*inputs)
+            except ValueError as e:
+                row.update(status="infeasible", error=str(e))
+            else:
+                row.update(
+                    status="same" if _choice(design) == _choice(base) else "flipped",
+                    bolt_diameter=design["bolt_diameter"],
+                    bolt_grade=design["bolt_grade"],
+                    number_of_bolts=design["number_of_bolts"],
+                    length_of_connection=design["length_of_connection"],
+                    efficiency_of_connection=design["efficiency_of_connection"],
+                    length_change=design["length_of_connection"] - base["length_of_connection"],
+                )
+            table.append(row)
+
+    return {"design": base, "table": table}
+
+
+def parse_perturbation(text):
+    """
+    Parse one command line perturbation.
+    :param text: 'input=delta[,delta...]', e.g. 'thickness1=-2,2'
+    :return: Tuple (input name, tuple of deltas)
+    :raises ValueError: If the text cannot be parsed
+    """
+    name, _, deltas = text.partition("=")
+    try:
+        values = tuple(float(delta) for delta in deltas.split(","))
+    except ValueError:
+        raise ValueError(f"Invalid perturbation {text!r}, expected input=delta[,delta...]")
+    if name not in SENSITIVITY_INPUTS:
+        raise ValueError(f"Unknown input {name!r}, expected one of {', '.join(SENSITIVITY_INPUTS)}")
+    return name, values
@@ -0,0 +1,358 @@
+"""
+Streaming batch design of bolted lap joints.
+Records are read from CSV or JSONL, designed in fixed-size chunks through the
+vectorized batch path and written back as one JSON object per line. Every stage
+is a generator, so memory use does not grow with the size of the input.
+"""
+
+import csv
+import json
+import math
+from itertools import islice
+
+from bolted_lap_joint_design import validate_design_inputs
+
+# Accepted field names for each design input, in order of preference
+FIELD_NAMES = {
+    "load": ("load", "P"),
+    "width": ("width", "w"),
+    "thickness1": ("thickness1", "t1"),
+    "thickness2": ("thickness2", "t2"),
+}
+
+_NO_DESIGN = "No suitable design found that meets the requirements."
+
+# Number of records designed together in one vectorized call
+DEFAULT_CHUNK_SIZE = 1024
+
+
+def detect_format(path):
+    """
+    Guess the record format from a file name.
+    :param path: Input file path, or '-' for stdin
+    :return: 'csv' for .csv files, otherwise 'jsonl'
+    """
+    if path and path.lower().endswith(".csv"):
+        return "csv"
+    return "jsonl"
+
+
+def read_raw(stream, fmt="jsonl"):
+    """
+    Read undecoded records from a text stream.
+    :param stream: Text stream to read from
+    :param fmt: Record format ('csv' or 'jsonl')
+    :return: Generator of non-blank JSON lines, or of CSV rows as dictionaries
+    """
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+        return
+
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield line
+
+
+def decode_record(raw):
+    """
+    Decode one undecoded record from read_raw.
+    Records that cannot be decoded are returned as exceptions instead of raising,
+    so one bad line does not abort the run.
+    :param raw: JSON line, or a record that is already decoded
+    :return: Dictionary, or a ValueError instance
+    """
+    if not isinstance(raw, str):
+        return raw
+    try:
+        record = json.loads(raw)
+    except json.JSONDecodeError as e:
+        return ValueError(f"Invalid JSON record: {e}")
+    if not isinstance(record, dict):
+        return ValueError("Each JSON record must be an object")
+    return record
+
+
+def read_records(stream, fmt="jsonl"):
+    """
+    Read and decode records from a text stream.
+    :param stream: Text stream to read from
+    :param fmt: Record format ('csv' or 'jsonl')
+    :return: Generator of dictionaries or ValueError instances, one per record
+    """
+    for raw in read_raw(stream, fmt):
+        yield decode_record(raw)
+
+
+def parse_record(record):
+    """
+    Extract and validate the design inputs of one record.
+    :param record: Dictionary with load, width, thickness1 and thickness2 fields
+    :return: Tuple (P, w, t1, t2) of floats
+    :raises ValueError: If a field is missing, not a number or out of range
+    """
+    values = []
+    for name, aliases in FIELD_NAMES.items():
+        raw = next((record[alias] for alias in aliases if record.get(alias) not in (None, "")), None)
+        if raw is None:
+            raise ValueError(f"Missing field: {name}")
+        try:
+            value = float(raw)
+        except (TypeError, ValueError):
+            raise ValueError(f"Field {name} must be a number, got {raw!r}")
+        if not math.isfinite(value):
+            raise ValueError(f"Field {name} must be finite, got {raw!r}")
+        values.append(value)
+
+    validate_design_inputs(*values)
+    return tuple(values)
+
+
+def _result(index, record, design=None, error=None):
+    """Build one output object, carrying the record id through when present."""
+    result = {"index": index}
+    if isinstance(record, dict) and "id" in record:
+        result["id"] = record["id"]
+    if error is not None:
+        result["error"] = error
+    else:
+        result["design"] = design
+    return result
+
+
+def _design_chunk(chunk, cache_spec=None):
+    """
+    Design the valid records of one chunk with a single batch call.
+    :param chunk: List of (index, record, inputs) tuples with parsed inputs
+    :param cache_spec: Optional (path, max_entries) of a persistent design cache; cached
+                       records skip the design and new results are stored
+    :return: List of output objects in chunk order
+    """
+    if not chunk:
+        return []
+
+    cache = None
+    cached = {}
+    if cache_spec is not None:
+        from design_cache import open_cache, normalize_key
+
+        cache = open_cache(*cache_spec)
+        keys = [normalize_key(*inputs) for _, _, inputs in chunk]
+        cached = cache.get_many(keys)
+        misses = [(key, item) for key, item in zip(keys, chunk) if key not in cached]
+        cache.record(len(chunk) - len(misses), len(misses))
+    else:
+        misses = [(None, item) for item in chunk]
+
+    designed = {}
+    if misses:
+        # Imported here so that single designs from the CLI do not load NumPy
+        from batch_design import design_lap_joint_batch, design_from_batch
+
+        P, w, t1, t2 = zip(*(inputs for _, (_, _, inputs) in misses))
+        results = design_lap_joint_batch(P, w, t1, t2)
+        for i, (key, (index, _, _)) in enumerate(misses):
+            design = design_from_batch(results, i)
+            designed[index] = {"error": _NO_DESIGN} if design is None else design
+
+        if cache is not None:
+            cache.put_many((key, designed[index]) for key, (index, _, _) in misses)
+
+    output = []
+    for i, (index, record, _) in enumerate(chunk):
+        design = designed[index] if index in designed else cached[keys[i]]
+        if "error" in design:
+            output.append(_result(index, record, error=design["error"]))
+        else:
+            output.append(_result(index, record, design=design))
+    return output
+
+
+def _chunked(items, chunk_size):
+    """Group an iterable into (start index, list) chunks of at most chunk_size items."""
+    items = iter(items)
+    start = 0
+    while True:
+        chunk = list(islice(items, chunk_size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def _split_chunk(start, records):
+    """
+    Parse the records of one chunk.
+    :param start: Input index of the first record
+    :param records: Decoded records (dictionaries or exceptions)
+    :return: Tuple (slots, pending), where slots holds the output object of each invalid
+             record and None for each valid one, in input order, and pending holds
+             (index, record, inputs) tuples for the valid records
+    """
+    slots = []
+    pending = []
+    for index, record in enumerate(records, start):
+        try:
+            if isinstance(record, Exception):
+                raise record
+            inputs = parse_record(record)
+        except ValueError as e:
+            slots.append(_result(index, record, error=str(e)))
+        else:
+            slots.append(None)
+            pending.append((index, record, inputs))
+    return slots, pending
+
+
+def _merge_chunk(slots, designed, preserve_order):
+    """Combine the errors and designs of one chunk into its output objects."""
+    if preserve_order:
+        designed = iter(designed)
+        return [next(designed) if slot is None else slot for slot in slots]
+    return [slot for slot in slots if slot is not None] + designed
+
+
+def _process_chunk(payload):
+    """
+    Decode, design and merge one chunk of records.
+    This is the unit of work sent to worker processes, so it takes one picklable payload.
+    :param payload: Tuple (start index, raw records, preserve_order, cache_spec)
+    :return: List of output objects
+    """
+    start, raw_records, preserve_order, cache_spec = payload
+    slots, pending = _split_chunk(start, [decode_record(raw) for raw in raw_records])
+    return _merge_chunk(slots, _design_chunk(pending, cache_spec), preserve_order)
+
+
+def _serialize_chunk(payload):
+    """
+    Process one chunk and serialize its output objects as JSON lines.
+    Serializing in the worker keeps the parent process down to reading and writing text.
+    :param payload: Tuple (start index, raw records, preserve_order, cache_spec)
+    :return: Tuple (JSONL text, number of records, number of records with errors)
+    """
+    results = _process_chunk(payload)
+    errors = sum(1 for result in results if "error" in result)
+    return "".join(json.dumps(result) + "\n" for result in results), len(results), errors
+
+
+def _structured_chunk(payload):
+    """
+    Decode and design one chunk of records into a structured result array.
+    :param payload: Tuple (start index, raw records, preserve_order, cache_spec); the
+                    cache is not used because it stores JSON results
+    :return: Tuple (array of DESIGN_DTYPE, number of records, number of records with errors)
+    """
+    # Imported here so that single designs from the CLI do not load NumPy
+    from batch_design import STATUS_DESIGNED, empty_structured, fill_structured
+
+    start, raw_records, _, _ = payload
+    slots, pending = _split_chunk(start, [decode_record(raw) for raw in raw_records])
+    designs = empty_structured(len(slots))
+    designs["index"] += start
+    if pending:
+        rows = [index - start for index, _, _ in pending]
+        fill_structured(designs, rows, *zip(*(inputs for _, _, inputs in pending)))
+    errors = int((designs["status"] != STATUS_DESIGNED).sum())
+    return designs, len(slots), errors
+
+
+def _map_chunks(func, raw_records, chunk_size, preserve_order, workers, cache_spec):
+    """Apply func to every chunk of raw records, in a process pool when workers > 1."""
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1")
+
+    payloads = ((start, chunk, preserve_order, cache_spec) for start, chunk in _chunked(raw_records, chunk_size))
+    if workers > 1:
+        from parallel_design import imap_chunks
+
+        tagged = ((None, payload) for payload in payloads)
+        for _, result in imap_chunks(func, tagged, workers, preserve_order):
+            yield result
+        return
+
+    for payload in payloads:
+        yield func(payload)
+
+
+def design_stream(records, chunk_size=DEFAULT_CHUNK_SIZE, preserve_order=True, workers=1, cache_spec=None):
+    """
+    Design a stream of records chunk by chunk.
+    :param records: Iterable of records (dictionaries, exceptions, or raw JSON lines)
+    :param chunk_size: Number of records designed per vectorized call
+    :param preserve_order: If True, results follow input order. If False, the invalid
+                           records of each chunk are reported ahead of its designs, and
+                           with several workers chunks are emitted as they complete.
+    :param workers: Number of worker processes; chunks are designed in a process pool
+                    when this is greater than 1
+    :param cache_spec: Optional (path, max_entries) of a persistent design cache
+    :return: Generator of output objects with an "index" and either "design" or "error"
+    """
+    for results in _map_chunks(_process_chunk, records, chunk_size, preserve_order, workers, cache_spec):
+        yield from results
+
+
+def design_jsonl(stream, fmt="jsonl", chunk_size=DEFAULT_CHUNK_SIZE, preserve_order=True, workers=1,
+                 cache_spec=None):
+    """
+    Design every record of a text stream and produce JSONL output text chunk by chunk.
+    Decoding, design and serialization all happen per chunk (in the workers when
+    workers > 1), which is the fastest path for the CLI.
+    :param stream: Text stream to read from
+    :param fmt: Record format ('csv' or 'jsonl')
+    :param chunk_size: Number of records designed per vectorized call
+    :param preserve_order: See design_stream
+    :param workers: Number of worker processes
+    :param cache_spec: Optional (path, max_entries) of a persistent design cache
+    :return: Generator of (JSONL text, number of records, number of records with errors)
+    """
+    yield from _map_chunks(_serialize_chunk, read_raw(stream, fmt), chunk_size, preserve_order, workers,
+                           cache_spec)
+
+
+def design_structured(stream, fmt="jsonl", chunk_size=DEFAULT_CHUNK_SIZE, preserve_order=True, workers=1):
+    """
+    Design every record of a text stream into compact structured result arrays.
+    Each chunk keeps its records in input order, and the "index" column identifies
+    the input record of every row when chunks complete out of order.
+    :param stream: Text stream to read from
+    :param fmt: Record format ('csv' or 'jsonl')
+    :param chunk_size: Number of records designed per vectorized call
+    :param preserve_order: If False, with several workers chunks are emitted as they complete
+    :param workers: Number of worker processes
+    :return: Generator of (array of DESIGN_DTYPE, number of records, number of records with errors)
+    """
+    yield from _map_chunks(_structured_chunk, read_raw(stream, fmt), chunk_size, preserve_order, workers, None)
+
+
+def write_jsonl(results, stream):
+    """
+    Write output objects to a text stream, one JSON object per line.
+    :param results: Iterable of output objects
+    :param stream: Text stream to write to
+    :return: Tuple (number of records written, number of records with errors)
+    """
+    written = 0
+    errors = 0
+    for result in results:
+        stream.write(json.dumps(result) + "\n")
+        written += 1
+        if "error" in result:
+            errors += 1
+    return written, errors
+
+
+def write_jsonl_chunks(chunks, stream):
+    """
+    Write the output of design_jsonl to a text stream.
+    :param chunks: Iterable of (JSONL text, records, errors) tuples
+    :param stream: Text stream to write to
+    :return: Tuple (number of records written, number of records with errors)
+    """
+    written = 0
+    errors = 0
+    for text, records, chunk_errors in chunks:
+        stream.write(text)
+        written += records
+        errors += chunk_errors
+    return written, errors
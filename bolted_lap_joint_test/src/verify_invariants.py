@@ -0,0 +1,323 @@
+"""
+Randomized verification of design invariants.
+verify_invariants generates design inputs in bulk, designs them through the
+vectorized batch path and checks every invariant as an array predicate over the
+whole batch, so millions of cases are checked in seconds. The first failing case
+of each invariant is shrunk to a minimal reproducer, and the run stops within a
+fixed number of cases or a time budget.
+"""
+
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from batch_design import design_lap_joint_batch, design_from_batch
+from bolted_lap_joint_design import design_lap_joint
+
+# Generated input fields. thickness_increase is added to both plates by the
+# metamorphic thickness check
+INPUT_FIELDS = ("load", "width", "thickness1", "thickness2", "thickness_increase")
+
+# Valid range of each input as (lowest value, whether it may equal it, highest value),
+# and the value each input is shrunk towards
+_INPUT_LIMITS = {
+    "load": (0.0, True, 1e4),
+    "width": (0.0, False, 1000.0),
+    "thickness1": (0.0, False, 100.0),
+    "thickness2": (0.0, False, 100.0),
+    "thickness_increase": (0.0, True, 100.0),
+}
+_SHRINK_TARGETS = {"load": 0.0, "width": 1.0, "thickness1": 1.0, "thickness2": 1.0, "thickness_increase": 0.0}
+
+# Standard plate widths and thicknesses mixed into the random inputs, with the input limits
+_STANDARD_WIDTHS = np.array([50, 100, 120, 150, 180, 200, 250, 300, 400, 500, 1000], dtype=float)
+_STANDARD_THICKNESSES = np.array([4, 5, 6, 8, 10, 12, 16, 20, 24, 32, 40, 50, 100], dtype=float)
+
+# Number of cases designed and checked together
+DEFAULT_VERIFY_BATCH = 65536
+
+# Number of cases per batch also designed by design_lap_joint and compared
+DEFAULT_SCALAR_SAMPLE = 32
+
+# Largest number of shrinking rounds for one failing case
+MAX_SHRINK_ROUNDS = 200
+
+Invariant = namedtuple("Invariant", ["name", "description", "predicate", "sampled"])
+Invariant.__doc__ = """
+A design invariant.
+predicate(inputs, results) takes a dictionary of INPUT_FIELDS arrays and the
+design_lap_joint_batch results for them and returns a boolean array that is
+True where the invariant holds. Sampled invariants are only applied to a few
+cases of each batch because they are expensive.
+"""
+
+InvariantFailure = namedtuple("InvariantFailure", ["invariant", "count", "example", "minimal"])
+InvariantFailure.__doc__ = """
+The violations of one invariant: the number of failing cases, the first one
+found and the same case after shrinking, each as a dictionary of INPUT_FIELDS.
+"""
+
+
+def _at_least_two_bolts(inputs, results):
+    return ~results["found"] | (results["number_of_bolts"] >= 2)
+
+
+def _utilization_within_one(inputs, results):
+    efficiency = results["efficiency_of_connection"]
+    return ~results["found"] | ((efficiency >= 0) & (efficiency <= 1))
+
+
+def _minimum_spacing(inputs, results):
+    d = results["bolt_diameter"]
+    return ~results["found"] | ((results["pitch_distance"] >= 2.5 * d) & (results["end_distance"] >= 1.5 * d))
+
+
+def _length_consistent(inputs, results):
+    expected = 2 * results["end_distance"] + (results["number_of_bolts"] - 1) * results["pitch_distance"]
+    return ~results["found"] | (results["length_of_connection"] == expected)
+
+
+def _strength_carries_load(inputs, results):
+    load = inputs["load"] * 1000
+    carried = results["efficiency_of_connection"] * results["strength_of_connection"]
+    return ~results["found"] | (np.abs(carried - load) <= 1e-9 * load)
+
+
+def _plate_order_symmetric(inputs, results):
+    swapped = design_lap_joint_batch(inputs["load"], inputs["width"], inputs["thickness2"], inputs["thickness1"])
+    return (results["found"] == swapped["found"]) & (
+        ~results["found"] | (results["candidate_index"] == swapped["candidate_index"]))
+
+
+def _thicker_plates_not_longer(inputs, results):
+    increase = inputs["thickness_increase"]
+    thicker = design_lap_joint_batch(inputs["load"], inputs["width"],
+                                     np.minimum(inputs["thickness1"] + increase, 100),
+                                     np.minimum(inputs["thickness2"] + increase, 100))
+    return ~results["found"] | (thicker["found"] & (thicker["length_of_connection"] <= results["length_of_connection"]))
+
+
+def _matches_design_lap_joint(inputs, results):
+    ok = np.ones(len(inputs["load"]), dtype=bool)
+    for i in range(len(ok)):
+        try:
+            design = design_lap_joint(*(float(inputs[name][i]) for name in INPUT_FIELDS[:4]))
+        except ValueError:
+            design = None
+        ok[i] = design == design_from_batch(results, i)
+    return ok
+
+
+INVARIANTS = (
+    Invariant("at_least_two_bolts", "Every design uses at least 2 bolts", _at_least_two_bolts, False),
+    Invariant("utilization_within_one", "The utilization of every design is between 0 and 1",
+              _utilization_within_one, False),
+    Invariant("minimum_spacing", "The pitch is at least 2.5 d and the end distance at least 1.5 d",
+              _minimum_spacing, False),
+    Invariant("length_consistent", "The connection length is 2 e + (bolts - 1) p", _length_consistent, False),
+    Invariant("strength_carries_load", "Utilization times strength equals the load",
+              _strength_carries_load, False),
+    Invariant("plate_order_symmetric", "Swapping the plates does not change the design",
+              _plate_order_symmetric, False),
+    Invariant("thicker_plates_not_longer", "Thicker plates never need a longer connection",
+              _thicker_plates_not_longer, False),
+    Invariant("matches_design_lap_joint", "The batch design equals design_lap_joint",
+              _matches_design_lap_joint, True),
+)
+
+
+def generate_inputs(rng, n):
+    """
+    Generate valid design inputs in bulk.
+    Loads are a mix of log-uniform values between 1 N and 10 MN, whole kN and zero;
+    widths and thicknesses mix uniform values with standard sizes and the input limits.
+    :param rng: numpy.random.Generator
+    :param n: Number of cases
+    :return: Dictionary of INPUT_FIELDS arrays
+    """
+    kind = rng.integers(0, 16, n)
+    load = np.where(kind < 10, 10 ** rng.uniform(-3, 4, n), np.floor(rng.uniform(0, 1000, n)))
+    load[kind == 15] = 0.0
+
+    # 1000 - uniform(0, 1000) lies in (0, 1000], the valid width range
+    width = np.where(rng.random(n) < 0.5, 1000 - rng.uniform(0, 1000, n), rng.choice(_STANDARD_WIDTHS, n))
+    thicknesses = [np.where(rng.random(n) < 0.5, 100 - rng.uniform(0, 100, n), rng.choice(_STANDARD_THICKNESSES, n))
+                   for _ in range(2)]
+    increase = np.where(rng.random(n) < 0.5, rng.uniform(0, 10, n), rng.choice([0.0, 1.0, 2.0, 4.0], n))
+    return dict(zip(INPUT_FIELDS, (load, width, *thicknesses, increase)))
+
+
+def _take(inputs, rows):
+    return {name: values[rows] for name, values in inputs.items()}
+
+
+def _failing(invariant, inputs):
+    """Return a boolean array that is True where the invariant fails."""
+    results = design_lap_joint_batch(*(inputs[name] for name in INPUT_FIELDS[:4]))
+    return ~invariant.predicate(inputs, results)
+
+
+def _valid(name, value):
+    low, inclusive, high = _INPUT_LIMITS[name]
+    return np.isfinite(value) and (value > low or (inclusive and value == low)) and value <= high
+
+
+def _complexity(case):
+    """Sort key of a case: fewer significant digits first, then closer to the shrink targets."""
+    digits = sum(len(f"{abs(case[name]):.15g}".replace(".", "").strip("0")) for name in INPUT_FIELDS)
+    distance = sum(abs(case[name] - _SHRINK_TARGETS[name]) for name in INPUT_FIELDS)
+    return digits, distance
+
+
+def _shrink_values(name, value):
+    """Simpler values to try for one input: its target, rounded values and steps towards the target."""
+    target = _SHRINK_TARGETS[name]
+    values = {target, float(np.floor(value)), float(np.ceil(value))}
+    values.update(round(value, digits) for digits in (-2, -1, 1, 2, 3))
+    for k in range(1, 8):
+        # Each step towards the target, also rounded so that it can be simpler than the value
+        step = value - (value - target) / 2 ** k
+        values.update((step, float(round(step)), float(f"{step:.1g}"), float(f"{step:.2g}")))
+    return [v + 0.0 for v in values if v != value and _valid(name, v)]
+
+
+def shrink_case(invariant, case, deadline=None, max_rounds=MAX_SHRINK_ROUNDS):
+    """
+    Shrink a failing case to a simpler one that still fails.
+    Each round tries simpler values of every input at once, designing all the
+    candidate cases in one batch, and keeps the simplest case that still fails
+    (see _complexity). Shrinking stops when no candidate fails, or at the deadline.
+    :param invariant: Invariant that fails for the case
+    :param case: Dictionary of INPUT_FIELDS values
+    :param deadline: Optional time.perf_counter() value to stop at
+    :param max_rounds: Largest number of rounds
+    :return: Dictionary of INPUT_FIELDS values
+    """
+    case = {name: float(case[name]) for name in INPUT_FIELDS}
+    for _ in range(max_rounds):
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        candidates = []
+        for name in INPUT_FIELDS:
+            for value in _shrink_values(name, case[name]):
+                candidates.append(dict(case, **{name: value}))
+        candidates = [candidate for candidate in candidates if _complexity(candidate) < _complexity(case)]
+        if not candidates:
+            break
+        columns = {name: np.array([candidate[name] for candidate in candidates]) for name in INPUT_FIELDS}
+        failing = _failing(invariant, columns)
+        if not failing.any():
+            break
+        case = min((candidate for candidate, fails in zip(candidates, failing) if fails), key=_complexity)
+    return case
+
+
+class VerificationReport:
+    """Outcome of a verify_invariants run."""
+
+    def __init__(self, seed):
+        self.seed = seed
+        self.cases = 0
+        self.batches = 0
+        self.sampled = 0
+        self.elapsed = 0.0
+        self.failures = {}  # invariant name -> InvariantFailure
+
+    @property
+    def passed(self):
+        return not self.failures
+
+    def as_dict(self):
+        return {
+            "seed": self.seed,
+            "cases": self.cases,
+            "batches": self.batches,
+            "sampled": self.sampled,
+            "elapsed": self.elapsed,
+            "passed": self.passed,
+            "failures": [failure._asdict() for failure in self.failures.values()],
+        }
+
+    def __str__(self):
+        rate = self.cases / self.elapsed if self.elapsed > 0 else float('inf')
+        lines = [f"Checked {self.cases} cases in {self.batches} batches in {self.elapsed:.2f} s "
+                 f"({rate:,.0f} cases/s, seed {self.seed}, {self.sampled} compared with design_lap_joint)"]
+        for failure in self.failures.values():
+            minimal = failure.minimal
+            lines.append(f"FAILED {failure.invariant} in {failure.count} cases; minimal case: "
+                         + ", ".join(f"{name}={minimal[name]:g}" for name in INPUT_FIELDS))
+        return "\n".join(lines)
+
+
+def verify_invariants(cases=None, time_budget=None, seed=0, batch_size=DEFAULT_VERIFY_BATCH,
+                      scalar_sample=DEFAULT_SCALAR_SAMPLE, invariants=INVARIANTS, shrink=True):
+    """
+    Check design invariants on randomly generated inputs.
+    Batches are sized so that the last one still fits in the time budget, and
+    shrinking also stops at the end of the budget.
+    :param cases: Number of cases to check, or None to run until the time budget is spent
+    :param time_budget: Seconds to run for, or None to stop after the given number of cases
+    :param seed: Seed of the input generator; the same seed checks the same cases
+    :param batch_size: Largest number of cases designed and checked together
+    :param scalar_sample: Number of cases per batch checked by the sampled invariants
+    :param invariants: Invariants to check (defaults to INVARIANTS)
+    :param shrink: Shrink the first failing case of each invariant
+    :return: VerificationReport
+    :raises ValueError: If neither a number of cases nor a time budget is given, or for invalid sizes
+    """
+    if cases is None and time_budget is None:
+        raise ValueError("Give a number of cases, a time budget or both")
+    if cases is not None and cases < 0:
+        raise ValueError("Number of cases cannot be negative")
+    if time_budget is not None and time_budget < 0:
+        raise ValueError("Time budget cannot be negative")
+    if batch_size < 1:
+        raise ValueError("Batch size must be at least 1")
+
+    start = time.perf_counter()
+    deadline = None if time_budget is None else start + time_budget
+    rng = np.random.default_rng(seed)
+    report = VerificationReport(seed)
+    size = min(batch_size, 1024)  # The first batch measures the throughput
+
+    while cases is None or report.cases < cases:
+        now = time.perf_counter()
+        if deadline is not None:
+            if now >= deadline:
+                break
+            if report.cases:
+                rate = report.cases / (now - start)
+                size = max(1, min(size, int(rate * (deadline - now))))
+        n = size if cases is None else min(size, cases - report.cases)
+
+        inputs = generate_inputs(rng, n)
+        results = design_lap_joint_batch(*(inputs[name] for name in INPUT_FIELDS[:4]))
+        sample = rng.choice(n, min(scalar_sample, n), replace=False)
+        for invariant in invariants:
+            if invariant.sampled:
+                rows = sample
+                failing = ~invariant.predicate(_take(inputs, rows), {key: column[rows] for key, column in
+                                                                     results.items()})
+            else:
+                rows = np.arange(n)
+                failing = ~invariant.predicate(inputs, results)
+            count = int(failing.sum())
+            if not count:
+                continue
+            failure = report.failures.get(invariant.name)
+            if failure is None:
+                first = int(rows[np.flatnonzero(failing)[0]])
+                example = {name: float(inputs[name][first]) for name in INPUT_FIELDS}
+                minimal = shrink_case(invariant, example, deadline) if shrink else example
+                report.failures[invariant.name] = InvariantFailure(invariant.name, count, example, minimal)
+            else:
+                report.failures[invariant.name] = failure._replace(count=failure.count + count)
+
+        report.cases += n
+        report.sampled += len(sample)
+        report.batches += 1
+        size = batch_size
+
+    report.elapsed = time.perf_counter() - start
+    return report
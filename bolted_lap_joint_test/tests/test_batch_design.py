@@ -0,0 +1,84 @@
+import pytest
+import sys
+import os
+import numpy as np
+
+# Add the src directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+from bolted_lap_joint_design import design_lap_joint
+from batch_design import (
+    design_lap_joint_batch, RESULT_COLUMNS, design_lap_joint_structured, record_from_structured,
+    structured_results, save_designs, load_designs, STATUS_DESIGNED, STATUS_NO_DESIGN,
+)
+
+# Grid covering the scalar test loads plus loads heavy enough that thin plates
+# fail in bearing and no suitable design exists
+load_values = np.concatenate([[0, 0.001], np.linspace(1, 100, 10), [250, 1000, 100000]])
+thickness_values = [5, 6, 8, 10, 12, 16, 20, 24]
+width_values = [60, 150, 400]
+
+
+def test_batch_matches_scalar_design():
+    """Test that every batch column equals the scalar design_lap_joint result exactly."""
+    P, w, t1, t2 = (a.ravel() for a in np.meshgrid(load_values, width_values, thickness_values, thickness_values))
+    batch = design_lap_joint_batch(P, w, t1, t2)
+
+    for i in range(len(P)):
+        try:
+            design = design_lap_joint(P[i], w[i], t1[i], t2[i])
+        except ValueError:
+            assert not batch["found"][i], f"Batch found a design where the scalar search did not for record {i}"
+            continue
+
+        assert batch["found"][i], f"Batch found no design for record {i}"
+        for column in RESULT_COLUMNS:
+            assert batch[column][i] == design[column], f"{column} differs for P={P[i]}, w={w[i]}, t1={t1[i]}, t2={t2[i]}"
+
+
+def test_batch_broadcasts_scalars():
+    """Test that scalar inputs are broadcast against array inputs."""
+    batch = design_lap_joint_batch([10, 50, 90], 150, 12, [10, 12, 16])
+    assert batch["number_of_bolts"].shape == (3,)
+    assert (batch["number_of_bolts"] >= 2).all()
+    assert (batch["gauge_distance"] == 75).all()
+
+
+def test_batch_input_validation():
+    """Test that invalid records raise the scalar error message with the record index."""
+    with pytest.raises(ValueError, match=r"Thickness t1 must be positive \(record 1\)"):
+        design_lap_joint_batch([10, 10], 150, [12, 0], 12)
+
+
+def test_structured_records_match_scalar_design():
+    """Test that records rebuilt from a structured array equal the scalar design dictionaries."""
+    P, w, t1, t2 = (a.ravel() for a in np.meshgrid(load_values, width_values, [5, 10, 16], [6, 12]))
+    designs = design_lap_joint_structured(P, w, t1, t2)
+
+    assert designs.dtype.itemsize < 128, "A structured row should stay compact"
+    for i in range(len(P)):
+        record = record_from_structured(designs, i)
+        try:
+            expected = design_lap_joint(P[i], w[i], t1[i], t2[i])
+        except ValueError:
+            assert record is None and designs["status"][i] == STATUS_NO_DESIGN
+            continue
+        assert designs["status"][i] == STATUS_DESIGNED
+        assert record == design_lap_joint(P[i], w[i], t1[i], t2[i], compact=True)
+        assert record.as_dict() == expected
+
+
+@pytest.mark.parametrize("extension", [".npy", ".npz"])
+def test_structured_save_and_load(tmp_path, extension):
+    """Test that saved result files load back unchanged, with .npy files memory-mapped."""
+    designs = design_lap_joint_structured(load_values, 150, 10, 12)
+    path = str(tmp_path / f"designs{extension}")
+    save_designs(path, designs)
+
+    loaded = load_designs(path)
+    assert isinstance(loaded, np.memmap) == (extension == ".npy")
+    assert loaded.dtype == designs.dtype
+    assert loaded.tobytes() == designs.tobytes()
+
+    views = list(structured_results(loaded))
+    assert views[3] == {"index": 3, "design": design_lap_joint(load_values[3], 150, 10, 12)}
@@ -0,0 +1,130 @@
+import pytest
+import sys
+import os
+import io
+import json
+import random
+
+# Add the src directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+from batch_job import run_batch_job, read_checkpoint, _add_range, _is_done
+from stream_design import design_jsonl, write_jsonl_chunks
+import cli
+
+
+class Interrupt(Exception):
+    pass
+
+
+@pytest.fixture
+def job(tmp_path):
+    """An input file of 500 records, some invalid, and the output of an uninterrupted batch."""
+    rng = random.Random(20)
+    lines = []
+    for i in range(500):
+        if i % 97 == 5:
+            lines.append("not json")
+        else:
+            lines.append(json.dumps({"id": i, "load": rng.uniform(1, 800), "width": rng.choice([100, 150, 200]),
+                                     "thickness1": rng.choice([4, 8, 12]), "thickness2": rng.choice([4, 8, 12])}))
+    input_path = tmp_path / "joints.jsonl"
+    input_path.write_text("\n".join(lines) + "\n")
+
+    expected = io.StringIO()
+    with open(input_path) as stream:
+        write_jsonl_chunks(design_jsonl(stream, chunk_size=32), expected)
+    return str(input_path), str(tmp_path / "designs.jsonl"), expected.getvalue()
+
+
+def _interrupt_after(checkpoints):
+    calls = []
+
+    def progress(records, errors):
+        calls.append(records)
+        if len(calls) == checkpoints:
+            raise Interrupt
+    return progress
+
+
+def test_batch_job_matches_stream(job):
+    """Test that a job writes the streaming batch output and a finished job is not run again."""
+    input_path, output_path, expected = job
+    summary = run_batch_job(input_path, output_path, chunk_size=32)
+    with open(output_path) as f:
+        assert f.read() == expected
+    assert summary["records"] == summary["designed"] == 500 and not summary["resumed"]
+    assert summary["errors"] == expected.count('"error"')
+    assert read_checkpoint(output_path)["complete"]
+
+    again = run_batch_job(input_path, output_path, chunk_size=32)
+    assert again["resumed"] and again["designed"] == 0 and again["skipped"] == 500
+    assert again["errors"] == summary["errors"]
+
+
+def test_batch_job_resumes_after_interruption(job):
+    """Test that an interrupted job skips completed chunks and cuts off a torn final write."""
+    input_path, output_path, expected = job
+    with pytest.raises(Interrupt):
+        run_batch_job(input_path, output_path, chunk_size=32, checkpoint_interval=0, progress=_interrupt_after(5))
+    checkpoint = read_checkpoint(output_path)
+    assert checkpoint["done"] == [[0, 160]] and not checkpoint["complete"]
+
+    # A write cut short by the process being killed
+    with open(output_path, "a") as f:
+        f.write('{"index": 160, "des')
+
+    summary = run_batch_job(input_path, output_path, chunk_size=32)
+    assert summary["resumed"] and summary["skipped"] == 160 and summary["designed"] == 340
+    with open(output_path) as f:
+        assert f.read() == expected
+
+
+def test_batch_job_restarts_for_a_different_job(job):
+    """Test that a checkpoint is ignored for another chunk size, a changed input or with restart."""
+    input_path, output_path, expected = job
+    with pytest.raises(Interrupt):
+        run_batch_job(input_path, output_path, chunk_size=32, checkpoint_interval=0, progress=_interrupt_after(2))
+
+    assert not run_batch_job(input_path, output_path, chunk_size=64)["resumed"]
+    assert run_batch_job(input_path, output_path, chunk_size=64, restart=True)["designed"] == 500
+
+    with open(input_path, "a") as f:
+        f.write(json.dumps({"load": 50, "width": 150, "thickness1": 10, "thickness2": 12}) + "\n")
+    summary = run_batch_job(input_path, output_path, chunk_size=64)
+    assert not summary["resumed"] and summary["records"] == 501
+
+
+def test_batch_job_workers_any_order(job):
+    """Test that an interrupted parallel job in completion order resumes to the same set of results."""
+    input_path, output_path, expected = job
+    with pytest.raises(Interrupt):
+        run_batch_job(input_path, output_path, chunk_size=32, workers=2, preserve_order=False,
+                      checkpoint_interval=0, progress=_interrupt_after(3))
+    run_batch_job(input_path, output_path, chunk_size=32, workers=2, preserve_order=False)
+    with open(output_path) as f:
+        results = [json.loads(line) for line in f]
+    assert sorted(results, key=lambda result: result["index"]) == [json.loads(line) for line in expected.splitlines()]
+
+
+def test_done_ranges():
+    """Test that completed chunks are merged into ranges of input records."""
+    ranges = []
+    for start, stop in [(4, 6), (0, 2), (2, 4), (10, 12), (7, 9), (6, 7)]:
+        _add_range(ranges, start, stop)
+    assert ranges == [[0, 9], [10, 12]]
+    assert _is_done(ranges, 2, 9) and _is_done(ranges, 10, 12)
+    assert not _is_done(ranges, 8, 10) and not _is_done(ranges, 12, 13)
+
+
+def test_cli_checkpoint(job, capsys):
+    """Test the --checkpoint batch option and its requirements."""
+    input_path, output_path, expected = job
+    assert cli.main(["--batch", input_path, "--output", output_path, "--checkpoint", "--chunk-size", "32"]) == 0
+    with open(output_path) as f:
+        assert f.read() == expected
+    assert cli.main(["--batch", input_path, "--output", output_path, "--checkpoint", "--chunk-size", "32"]) == 0
+    assert "500 records already done" in capsys.readouterr().err
+
+    with pytest.raises(SystemExit):
+        cli.main(["--batch", input_path, "--checkpoint"])
@@ -0,0 +1,148 @@
+import pytest
+import sys
+import os
+import json
+import random
+
+# Add the src directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+import bolted_lap_joint_design
+from bolted_lap_joint_design import design_lap_joint, get_capacity_table, use_catalogue, BOLT_DIAMETERS, PLATE_GRADES
+from batch_design import design_lap_joint_batch, design_from_batch
+from catalogue import Catalogue, load_catalogue, DEFAULT_CATALOGUE_PATH
+from design_cache import rules_version
+
+
+def _write_catalogue(path, diameters, grades, plates=(("E250", 250, 410), ("E410", 410, 550))):
+    document = {
+        "bolts": {"diameters": list(diameters), "grades": list(grades)},
+        "plates": [{"grade": name, "fy": fy, "fu": fu} for name, fy, fu in plates],
+    }
+    path.write_text(json.dumps(document))
+    return str(path)
+
+
+@pytest.fixture
+def restore_catalogue():
+    yield
+    use_catalogue(DEFAULT_CATALOGUE_PATH)
+
+
+def test_shipped_catalogue():
+    """Test that the shipped catalogue holds the standard bolts and plates, sorted."""
+    catalogue = load_catalogue(DEFAULT_CATALOGUE_PATH)
+    assert catalogue.bolt_diameters == (10, 12, 16, 20, 24)
+    assert catalogue.bolt_grades == (3.6, 4.6, 4.8, 5.6, 5.8)
+    assert catalogue.plate_grade_names[-1] == "E410"
+    assert catalogue.plate_strengths["E250"] == (250, 410)
+    assert load_catalogue(DEFAULT_CATALOGUE_PATH) is catalogue, "A catalogue file is read once"
+
+
+@pytest.mark.parametrize("diameters,grades,plates,message", [
+    ([], [4.6], [("E250", 250, 410)], "no bolt diameter"),
+    ([12, 12], [4.6], [("E250", 250, 410)], "duplicate bolt diameter"),
+    ([12, -16], [4.6], [("E250", 250, 410)], "bolt diameter -16"),
+    ([12], [4.0], [("E250", 250, 410)], "no yield ratio"),
+    ([12], ["4.6"], [("E250", 250, 410)], "bolt grade '4.6'"),
+    ([12], [4.6], [], "no plate grades"),
+    ([12], [4.6], [("E250", 410, 250)], "fy >= fu"),
+    ([12], [4.6], [("E250", 250, 410), ("E250", 300, 470)], "duplicate plate grade"),
+])
+def test_invalid_catalogue(diameters, grades, plates, message):
+    """Test that invalid catalogue entries are rejected with the reason."""
+    with pytest.raises(ValueError, match=f"Invalid catalogue test: .*{message}"):
+        Catalogue(diameters, grades, plates, source="test")
+
+
+def test_invalid_catalogue_file(tmp_path):
+    """Test that a file missing a section is rejected."""
+    path = tmp_path / "broken.json"
+    path.write_text('{"bolts": {"diameters": [12]}}')
+    with pytest.raises(ValueError, match="Invalid catalogue"):
+        load_catalogue(str(path))
+
+
+def test_use_catalogue(tmp_path, restore_catalogue):
+    """Test that a custom catalogue changes the designs, the shared lists and the rules version."""
+    default_version = rules_version()
+    use_catalogue(_write_catalogue(tmp_path / "small.json", [20, 16], [8.8]))
+
+    assert BOLT_DIAMETERS == [16, 20]
+    assert set(PLATE_GRADES) == {"E250", "E410"}
+    design = design_lap_joint(100, 150, 10, 12)
+    assert design["bolt_diameter"] in (16, 20) and design["bolt_grade"] == 8.8
+    assert rules_version() != default_version
+
+    use_catalogue(DEFAULT_CATALOGUE_PATH)
+    assert rules_version() == default_version
+
+
+def test_indexed_search_matches_full_scan(tmp_path, restore_catalogue):
+    """Test that the indexed search finds the same design as the vectorized full scan on a large catalogue."""
+    rng = random.Random(7)
+    diameters = sorted(rng.sample(range(4, 120), 60))
+    grades = [3.6, 4.6, 4.8, 5.6, 5.8, 6.8, 8.8, 9.8, 10.9, 12.9]
+    use_catalogue(_write_catalogue(tmp_path / "large.json", diameters, grades))
+    assert get_capacity_table().indexed
+
+    P = [rng.choice([0, rng.uniform(0, 50), rng.uniform(0, 2000)]) for _ in range(400)]
+    t1 = [rng.choice([2, 5, 10, 20, 60]) for _ in range(400)]
+    t2 = [rng.choice([2, 5, 10, 20, 60]) for _ in range(400)]
+    results = design_lap_joint_batch(P, 150, t1, t2)
+    for i in range(len(P)):
+        try:
+            design, stats = design_lap_joint(P[i], 150, t1[i], t2[i], return_stats=True)
+        except ValueError:
+            design = None
+        else:
+            assert stats.candidates_evaluated < len(get_capacity_table().candidates)
+        assert design == design_from_batch(results, i)
+
+
+def test_structured_results_keep_their_catalogue(tmp_path, restore_catalogue):
+    """Test that a result file written under one catalogue decodes to the same designs under another."""
+    from batch_design import design_lap_joint_structured, load_designs, save_designs, structured_results
+
+    use_catalogue(_write_catalogue(tmp_path / "small.json", [8], [8.8], plates=(("E250", 250, 410),)))
+    expected = design_lap_joint(20, 150, 10, 12)
+    path = str(tmp_path / "designs.npy")
+    save_designs(path, design_lap_joint_structured([20], 150, 10, 12))
+    assert next(structured_results(load_designs(path)))["design"] == expected
+
+    use_catalogue(DEFAULT_CATALOGUE_PATH)
+    design = next(structured_results(load_designs(path)))["design"]
+    assert design == expected
+    assert (design["bolt_diameter"], design["bolt_grade"], design["yield_strength_plate_1"]) == (8, 8.8, 250)
+
+
+def test_check_plate_grades_from_catalogue(tmp_path, restore_catalogue):
+    """Test that the check subcommand offers the plate grades of its --catalogue, strongest by default."""
+    import cli
+
+    path = _write_catalogue(tmp_path / "catalogue.json", [16, 20], [4.6, 8.8],
+                            plates=(("S235", 235, 360), ("S355", 355, 490)))
+    args = cli.parse_check_arguments(["joints.csv", "--catalogue", path])
+    assert (args.input, args.plate_grade) == ("joints.csv", "S355")
+    assert cli.parse_check_arguments(["--plate-grade", "S235", "--catalogue", path]).plate_grade == "S235"
+    with pytest.raises(SystemExit):
+        cli.parse_check_arguments(["--catalogue", path, "--plate-grade", "E410"])
+
+    use_catalogue(DEFAULT_CATALOGUE_PATH)
+    assert cli.parse_check_arguments([]).plate_grade == "E410"
+    with pytest.raises(SystemExit):
+        cli.parse_check_arguments(["--catalogue", str(tmp_path / "missing.json")])
+
+
+def test_load_index_follows_catalogue(tmp_path, restore_catalogue):
+    """Test that cached load indexes are not reused after switching catalogues."""
+    from load_index import get_load_index, design_for_loads
+
+    assert get_load_index(150, 10, 12).design(200) == design_lap_joint(200, 150, 10, 12)
+
+    use_catalogue(_write_catalogue(tmp_path / "catalogue.json", [30], [4.6], plates=(("E250", 250, 410),)))
+    with pytest.raises(ValueError, match="No suitable design found"):
+        design_lap_joint(200, 150, 10, 12)
+    with pytest.raises(ValueError, match="No suitable design found"):
+        get_load_index(150, 10, 12).design(200)
+    assert design_for_loads([10, 200], 150, 10, 12) == [design_lap_joint(10, 150, 10, 12), None]
@@ -0,0 +1,85 @@
+import pytest
+import sys
+import os
+import math
+import numpy as np
+
+# Add the src directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+from bolted_lap_joint_design import design_lap_joint, calculate_bolt_strength, IS800_2007, PLATE_GRADES
+from check_design import check_lap_joint, check_stream
+
+
+def _scalar_check(P, d, GB, N_b, p, e, t1, t2, plate_grade="E410", hole_type="Standard", location="Field"):
+    """Check one joint with the scalar IS800_2007 clauses."""
+    _, bolt_fy = calculate_bolt_strength(GB)
+    A_bolt = math.pi * (d / 2) ** 2
+    V_b = IS800_2007.cl_10_3_3_bolt_shear_capacity(bolt_fy, A_bolt, A_bolt, 0, 0, location)
+    V_dpb = IS800_2007.cl_10_3_4_bolt_bearing_capacity(
+        PLATE_GRADES[plate_grade][1], bolt_fy, min(t1, t2), d, e, p, hole_type, location)
+    utilization = P * 1000 / (N_b * min(V_b, V_dpb) * 0.75)
+    return V_b, V_dpb, utilization
+
+
+@pytest.mark.parametrize("plate_grade,hole_type,location", [
+    ("E410", "Standard", "Field"),
+    ("E250", "Oversized", "Shop"),
+])
+def test_check_matches_scalar_clauses(plate_grade, hole_type, location):
+    """Test that the vectorized check equals the scalar clause results exactly."""
+    grid = np.meshgrid([5, 50, 250], [10, 16, 24], [3.6, 4.6, 5.8], [2, 5], [30, 60], [15, 40], [6, 10], [8, 20])
+    P, d, GB, N_b, p, e, t1, t2 = (a.ravel() for a in grid)
+    checks = check_lap_joint(P, d, GB, N_b, p, e, t1, t2, plate_grade, hole_type, location)
+
+    for i in range(len(P)):
+        V_b, V_dpb, utilization = _scalar_check(P[i], d[i], GB[i], N_b[i], p[i], e[i], t1[i], t2[i],
+                                                plate_grade, hole_type, location)
+        assert checks["shear_capacity"][i] == V_b
+        assert checks["bearing_capacity"][i] == V_dpb
+        assert checks["utilization"][i] == utilization
+        assert checks["governing_mode"][i] == ("bearing" if V_dpb < V_b else "shear")
+        assert checks["passed"][i] == (utilization <= 1)
+
+
+def test_check_of_designed_joint():
+    """Test that checking a joint from design_lap_joint reproduces its utilization."""
+    design = design_lap_joint(80, 150, 10, 12)
+    checks = check_lap_joint(80, design["bolt_diameter"], design["bolt_grade"], design["number_of_bolts"],
+                             design["pitch_distance"], design["end_distance"], 10, 12)
+    assert checks["utilization"][0] == design["efficiency_of_connection"]
+    assert checks["strength_of_connection"][0] == design["strength_of_connection"]
+    assert checks["passed"][0]
+
+
+def test_check_plate_grade_per_joint():
+    """Test that plate grades can be given per joint."""
+    checks = check_lap_joint(100, 12, 4.6, 3, 30, 18, 6, 6, plate_grade=["E250", "E410"])
+    assert checks["bearing_capacity"][0] < checks["bearing_capacity"][1]
+    with pytest.raises(ValueError, match="Unknown plate grade"):
+        check_lap_joint(100, 12, 4.6, 3, 30, 18, 6, 6, plate_grade="E999")
+
+
+def test_check_input_validation():
+    """Test that invalid joints are reported with their index."""
+    with pytest.raises(ValueError, match=r"Number of bolts must be a positive whole number \(record 1\)"):
+        check_lap_joint(100, 12, 4.6, [3, 2.5], 30, 18, 6, 6)
+    with pytest.raises(ValueError, match="Bolt grade"):
+        check_lap_joint(100, 12, 4.0, 3, 30, 18, 6, 6)
+
+
+def test_check_stream_reports_errors_per_record():
+    """Test that records that cannot be checked do not stop the stream."""
+    records = [
+        {"id": "ok", "load": 50, "d": 12, "grade": 4.8, "bolts": 3, "pitch": 30, "end": 18, "t1": 10, "t2": 12},
+        {"load": 50, "d": 12, "grade": 4.8, "bolts": 0, "pitch": 30, "end": 18, "t1": 10, "t2": 12},
+        '{"load": 50}',
+        {"load": 500, "d": 12, "grade": 4.8, "bolts": 3, "pitch": 30, "end": 18, "t1": 10, "t2": 12},
+    ]
+    results = list(check_stream(records, chunk_size=3))
+
+    assert [r["index"] for r in results] == [0, 1, 2, 3]
+    assert results[0]["id"] == "ok" and results[0]["passed"]
+    assert results[1]["error"] == "Number of bolts must be a positive whole number"
+    assert results[2]["error"] == "Missing field: bolt_diameter"
+    assert not results[3]["passed"]
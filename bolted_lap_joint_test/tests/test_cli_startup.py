@@ -0,0 +1,79 @@
+import pytest
+import sys
+import os
+import subprocess
+
+# Add the src directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+import cli
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../src')
+
+
+def test_single_design_imports_only_what_it_needs():
+    """Test that a plain single design loads neither argparse, the cache, the batch pipeline nor NumPy."""
+    code = (f"import sys; sys.path.insert(0, {SRC_DIR!r}); import cli; cli.main(['50', '150', '10', '12']); "
+            "print(sorted(m for m in ('argparse', 'sqlite3', 'stream_design', 'numpy') if m in sys.modules))")
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.splitlines()[-1] == "[]"
+
+
+@pytest.mark.parametrize("argv,expected", [
+    (["50", "150", "10", "12"], ((50.0, 150.0, 10.0, 12.0), False)),
+    (["--json", "50", "150", "10", "12.5"], ((50.0, 150.0, 10.0, 12.5), True)),
+    (["50", "150", "10"], None),
+    (["50", "150", "10", "12", "--pareto"], None),
+    (["--load", "50", "150", "10"], None),
+    (["50", "150", "10", "12", "--json", "--json"], None),
+])
+def test_plain_design_arguments(argv, expected):
+    """Test that only plain single designs skip the argument parser."""
+    assert cli.plain_design_arguments(argv) == expected
+
+
+@pytest.mark.parametrize("argv", [
+    ["50", "150", "10", "12"],
+    ["80", "150", "6", "8", "--json"],
+    ["-5", "150", "10", "12"],
+])
+def test_plain_design_matches_parsed_design(argv, capsys):
+    """Test that the fast path prints what the full command line handling prints."""
+    fast_code = cli.main(argv)
+    fast = capsys.readouterr()
+    parsed_code = cli.run(cli.parse_arguments(argv))
+    parsed = capsys.readouterr()
+    assert (fast_code, fast.out, fast.err) == (parsed_code, parsed.out, parsed.err)
+
+
+def test_import_time_report(capfd):
+    """Test that --import-time runs the command and lists the modules it loads."""
+    assert cli.main(["50", "150", "10", "12", "--json", "--import-time"]) == 0
+    out, err = capfd.readouterr()
+    assert '"number_of_bolts"' in out
+    assert "IMPORT TIME: main.py 50 150 10 12 --json" in err
+    assert "bolted_lap_joint_design" in err
+    assert "NumPy not loaded" in err
+
+
+def test_stats_only_when_requested(capsys, monkeypatch):
+    """Test that single and Pareto designs are only instrumented with --stats."""
+    calls = []
+    design = cli.design_lap_joint
+
+    def recording_design(*args, **kwargs):
+        calls.append(kwargs["return_stats"])
+        return design(*args, **kwargs)
+
+    monkeypatch.setattr(cli, "design_lap_joint", recording_design)
+    for options in ([], ["--pareto"], ["--stats"], ["--pareto", "--stats"]):
+        assert cli.run(cli.parse_arguments(["50", "150", "10", "12", "--json", *options])) == 0
+        assert ("candidates_evaluated" in capsys.readouterr().err) == ("--stats" in options)
+    assert calls == [False, False, True, True]
+
+
+@pytest.mark.parametrize("option", ["--pareto", "--stats"])
+def test_cache_rejects_uncached_options(option, tmp_path):
+    """Test that options the design cache cannot honour are rejected with --cache."""
+    with pytest.raises(SystemExit):
+        cli.parse_arguments(["50", "150", "10", "12", "--cache", str(tmp_path / "cache.db"), option])
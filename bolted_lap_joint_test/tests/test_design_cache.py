@@ -0,0 +1,130 @@
+import pytest
+import sys
+import os
+import io
+import json
+import subprocess
+
+# Add the src directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+import bolted_lap_joint_design
+import design_cache
+from bolted_lap_joint_design import design_lap_joint
+from design_cache import DesignCache, normalize_key
+from stream_design import read_records, design_stream
+
+
+def test_cache_hits_return_identical_designs(tmp_path):
+    """Test that a cached design equals design_lap_joint and is counted as a hit."""
+    path = str(tmp_path / "designs.db")
+    with DesignCache(path) as cache:
+        first = cache.design(50, 150, 10, 12)
+        second = cache.design(50.0, 150.0, 10, 12.0)
+        assert first == second == design_lap_joint(50, 150, 10, 12)
+        assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+    # A new process reopening the file keeps the entries and the lifetime counters
+    with DesignCache(path) as cache:
+        cache.design(50, 150, 10, 12)
+        stats = cache.stats()
+        assert stats["hits"] == 1 and stats["lifetime_hits"] == 2 and stats["entries"] == 1
+
+
+def test_cache_stores_no_design_results(tmp_path):
+    """Test that 'no suitable design' outcomes are cached and re-raised."""
+    with DesignCache(str(tmp_path / "designs.db")) as cache:
+        for _ in range(2):
+            with pytest.raises(ValueError, match="No suitable design found"):
+                cache.design(100000, 150, 5, 5)
+        assert cache.stats()["hits"] == 1
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Test that the cache never holds more than max_entries designs."""
+    with DesignCache(str(tmp_path / "designs.db"), max_entries=3) as cache:
+        for load in [10, 20, 30]:
+            cache.design(load, 150, 10, 12)
+        cache.design(10, 150, 10, 12)  # Refresh the oldest entry
+        cache.design(40, 150, 10, 12)
+
+        stats = cache.stats()
+        assert stats["entries"] == 3 and stats["evictions"] == 1
+        assert set(cache.get_many([normalize_key(load, 150, 10, 12) for load in [10, 20, 30, 40]])) == {
+            normalize_key(10, 150, 10, 12), normalize_key(30, 150, 10, 12), normalize_key(40, 150, 10, 12)
+        }
+
+
+def test_cache_invalidated_by_rules_version(tmp_path, monkeypatch):
+    """Test that entries written under other design rules are not served but kept for their version."""
+    path = str(tmp_path / "designs.db")
+    with DesignCache(path) as cache:
+        cache.design(50, 150, 10, 12)
+
+    with monkeypatch.context() as patch:
+        patch.setitem(design_cache._rules_versions, bolted_lap_joint_design.CATALOGUE.digest, "changed-rules")
+        with DesignCache(path) as cache:
+            cache.design(50, 150, 10, 12)
+            assert (cache.hits, cache.misses, cache.stats()["entries"]) == (0, 1, 2)
+
+    with DesignCache(path) as cache:
+        cache.design(50, 150, 10, 12)
+        assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_cache_follows_catalogue_change(tmp_path, monkeypatch):
+    """Test that an open cache looks designs up under the rules version active at each lookup."""
+    path = str(tmp_path / "designs.db")
+    with DesignCache(path) as cache:
+        cache.design(50, 150, 10, 12)
+        monkeypatch.setitem(design_cache._rules_versions, bolted_lap_joint_design.CATALOGUE.digest, "changed-rules")
+        assert cache.get_many([normalize_key(50, 150, 10, 12)]) == {}
+        assert cache.stats()["version"] == "changed-rules"
+
+
+def test_cache_file_keyed_by_input_is_migrated(tmp_path):
+    """Test that a cache file with one entry per input keeps its entries under per-version keys."""
+    import sqlite3
+
+    path = str(tmp_path / "designs.db")
+    key = normalize_key(50, 150, 10, 12)
+    design = design_lap_joint(50, 150, 10, 12)
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE designs ("
+                     "key TEXT PRIMARY KEY, version TEXT NOT NULL, result TEXT NOT NULL, last_used INTEGER NOT NULL)")
+        conn.execute("INSERT INTO designs VALUES (?, ?, ?, 1)", (key, design_cache.rules_version(), json.dumps(design)))
+        conn.execute("INSERT INTO designs VALUES ('old', 'old-rules', '{}', 2)")
+    conn.close()
+
+    with DesignCache(path) as cache:
+        assert cache.get_many([key]) == {key: design}
+        cache.put_many([(key, design)])
+        assert cache.stats()["entries"] == 2
+
+
+@pytest.mark.parametrize("module", design_cache.RULES_MODULES)
+def test_rules_version_covers_design_modules(module, monkeypatch):
+    """Test that a change to any module computing cached designs changes the rules version."""
+    version = design_cache.rules_version()
+    source = design_cache._module_source
+
+    monkeypatch.setattr(design_cache, "_rules_versions", {})
+    monkeypatch.setattr(design_cache, "_module_source", lambda name: source(name) + (b"#" if name == module else b""))
+    assert design_cache.rules_version() != version
+
+
+def test_rules_version_does_not_import_batch_design():
+    """Test that hashing the batch module does not load NumPy into single designs."""
+    code = ("import sys; sys.path.insert(0, 'src'); import design_cache; design_cache.rules_version(); "
+            "assert 'batch_design' not in sys.modules and 'numpy' not in sys.modules")
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.join(os.path.dirname(__file__), '..'))
+
+
+def test_stream_with_cache(tmp_path):
+    """Test that the streaming pipeline gives the same output with a cache."""
+    lines = "\n".join(f'{{"load": {P}, "width": 150, "thickness1": 10, "thickness2": 12}}' for P in [10, 50, 10, 90])
+    spec = (str(tmp_path / "designs.db"), 100)
+
+    expected = list(design_stream(read_records(io.StringIO(lines))))
+    assert list(design_stream(read_records(io.StringIO(lines)), cache_spec=spec)) == expected
+    assert list(design_stream(read_records(io.StringIO(lines)), cache_spec=spec)) == expected
@@ -0,0 +1,125 @@
+import pytest
+import sys
+import os
+import numpy as np
+
+# Add the src directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+from bolted_lap_joint_design import design_lap_joint, BOLT_DIAMETERS
+from design_search import search_lap_joint, exhaustive_search_lap_joint, anytime_search_lap_joint, max_rows_for_width
+
+rng = np.random.default_rng(11)
+random_cases = list(zip(
+    rng.choice([0, 0.5, 20, 75, 150, 400, 1500, 5000], 200),
+    rng.choice([40, 80, 150, 220, 400], 200),
+    rng.choice([3, 5, 8, 12, 16, 24], 200),
+    rng.choice([3, 5, 8, 12, 16, 24], 200),
+))
+
+
+def _search_or_none(search, *args, **kwargs):
+    try:
+        return search(*args, **kwargs)
+    except ValueError:
+        return None, None
+
+
+@pytest.mark.parametrize("P,w,t1,t2", random_cases)
+def test_branch_and_bound_matches_exhaustive(P, w, t1, t2):
+    """Test that pruning never changes the optimum of the expanded design space."""
+    expected, _ = _search_or_none(exhaustive_search_lap_joint, P, w, t1, t2)
+    design, stats = _search_or_none(search_lap_joint, P, w, t1, t2)
+
+    assert design == expected, f"Branch and bound differs from exhaustive search for P={P}, w={w}, t1={t1}, t2={t2}"
+    if stats is not None:
+        assert stats.evaluated + stats.pruned == stats.candidates
+
+
+@pytest.mark.parametrize("load", [0, 10, 50, 100])
+def test_single_row_space_reproduces_design_lap_joint(load):
+    """Test that the search restricted to the original space gives the design_lap_joint result."""
+    design, _ = search_lap_joint(load, 150, 10, 12, bolt_diameters=BOLT_DIAMETERS,
+                                 plate_grades=["E410"], max_rows=1)
+    assert design.pop("plate_grade") == "E410"
+    assert design == design_lap_joint(load, 150, 10, 12)
+
+
+def test_search_prunes_most_candidates():
+    """Test that the bounds prune the expanded space and the layout fits the plate width."""
+    design, stats = search_lap_joint(100, 150, 10, 12)
+    assert stats.pruned > stats.evaluated
+    assert design["number_of_rows"] <= max_rows_for_width(design["bolt_diameter"], 150, 4)
+    assert design["number_of_bolts"] >= 2
+    assert design["efficiency_of_connection"] <= 1
+
+
+def test_search_no_suitable_design():
+    """Test that an unsatisfiable load raises the design_lap_joint error."""
+    with pytest.raises(ValueError, match="No suitable design found"):
+        search_lap_joint(1e7, 150, 1, 1)
+
+
+@pytest.mark.parametrize("P,w,t1,t2", random_cases[:60])
+def test_finished_anytime_search_is_optimal(P, w, t1, t2):
+    """Test that an anytime search without a budget returns the branch-and-bound optimum."""
+    expected, _ = _search_or_none(search_lap_joint, P, w, t1, t2)
+    design, stats = _search_or_none(anytime_search_lap_joint, P, w, t1, t2, max_rows=4)
+
+    assert design == expected
+    if stats is not None:
+        assert stats.optimal and stats.gap == 0
+        assert stats.lower_bound == design["length_of_connection"]
+
+
+def test_anytime_search_reports_gap_within_budget():
+    """Test that budgeted searches return feasible layouts whose gap bounds the distance to the optimum."""
+    optimum, _ = anytime_search_lap_joint(2282.88, 40, 12, 12)
+    gaps, evaluations = [], []
+    for budget in [0, 5, 20, 1000]:
+        design, stats = anytime_search_lap_joint(2282.88, 40, 12, 12, max_evaluations=budget)
+        assert design["efficiency_of_connection"] <= 1
+        assert stats.lower_bound <= optimum["length_of_connection"] <= design["length_of_connection"]
+        assert stats.gap == (design["length_of_connection"] - stats.lower_bound) / design["length_of_connection"]
+        gaps.append(stats.gap)
+        evaluations.append(stats.evaluated)
+    assert gaps[0] > 0, "The greedy pass alone should not prove this layout optimal"
+    assert gaps == sorted(gaps, reverse=True) and gaps[-1] == 0
+
+    # Without time only the greedy pass runs
+    design, stats = anytime_search_lap_joint(2282.88, 40, 12, 12, time_budget=0)
+    assert stats.evaluated == evaluations[0] and stats.gap == gaps[0]
+
+
+def test_anytime_search_improves_on_single_row_design():
+    """Test that multi-row layouts shorten the design_lap_joint connection on a wide plate."""
+    single_row = design_lap_joint(500, 400, 12, 12)
+    design, stats = anytime_search_lap_joint(500, 400, 12, 12, max_evaluations=0)
+    assert design["number_of_rows"] > 1
+    assert design["length_of_connection"] < single_row["length_of_connection"]
+    assert design["number_of_rows"] <= max_rows_for_width(design["bolt_diameter"], 400, 1000)
+
+
+@pytest.mark.parametrize("P,w,t1,t2", [(4515.68, 21.42, 54.95, 9.99), (2128.45, 25.32, 9.42, 25.34)]
+                         + random_cases[:40])
+def test_anytime_search_never_longer_than_single_row_design(P, w, t1, t2):
+    """Test that every budget returns a joint no longer than the design_lap_joint one."""
+    try:
+        single_row = design_lap_joint(P, w, t1, t2)
+    except ValueError:
+        return
+    for budget in [0, 1, 5, 20, None]:
+        design, stats = anytime_search_lap_joint(P, w, t1, t2, max_evaluations=budget)
+        assert design["length_of_connection"] <= single_row["length_of_connection"]
+    design, stats = anytime_search_lap_joint(P, w, t1, t2, time_budget=0)
+    assert design["length_of_connection"] <= single_row["length_of_connection"]
+
+
+def test_anytime_search_budget_validation():
+    """Test that negative budgets and a budget too small to find any design are reported."""
+    with pytest.raises(ValueError, match="Time budget"):
+        anytime_search_lap_joint(100, 150, 10, 12, time_budget=-1)
+    with pytest.raises(ValueError, match="Evaluation budget"):
+        anytime_search_lap_joint(100, 150, 10, 12, max_evaluations=-1)
+    with pytest.raises(ValueError, match="No suitable design found that meets the requirements"):
+        anytime_search_lap_joint(1e7, 150, 1, 1)
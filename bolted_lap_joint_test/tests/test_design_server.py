@@ -0,0 +1,152 @@
+import pytest
+import sys
+import os
+import json
+import asyncio
+
+# Add the src directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+from bolted_lap_joint_design import design_lap_joint
+from design_server import DesignService, start_server
+
+REQUEST = {"load": 50, "width": 150, "thickness1": 10, "thickness2": 12}
+
+
+def test_identical_requests_are_coalesced():
+    """Test that identical in-flight requests share one design and one batch."""
+    async def scenario():
+        service = DesignService(batch_window=0.01)
+        results = await asyncio.gather(
+            service.design(REQUEST),
+            service.design(dict(REQUEST)),
+            service.design({**REQUEST, "load": 80}),
+        )
+        return service, results
+
+    service, results = asyncio.run(scenario())
+    assert results[0] == results[1] == design_lap_joint(50, 150, 10, 12)
+    assert results[2] == design_lap_joint(80, 150, 10, 12)
+    stats = service.stats()
+    assert (stats["requests"], stats["coalesced"], stats["batches"], stats["designed"]) == (3, 1, 1, 2)
+
+
+def test_max_batch_flushes_immediately():
+    """Test that a full batch is designed without waiting for the batch window."""
+    async def scenario():
+        service = DesignService(batch_window=60, max_batch=2)
+        designs = await asyncio.wait_for(asyncio.gather(
+            service.design(REQUEST), service.design({**REQUEST, "load": 70})), timeout=5)
+        return service, designs
+
+    service, designs = asyncio.run(scenario())
+    assert service.stats()["batches"] == 1
+    assert designs[1] == design_lap_joint(70, 150, 10, 12)
+
+
+def test_unix_socket_protocol(tmp_path):
+    """Test newline-delimited JSON requests over a Unix socket, including errors."""
+    path = str(tmp_path / "design.sock")
+
+    async def scenario():
+        server = await start_server(DesignService(), unix_path=path)
+        async with server:
+            reader, writer = await asyncio.open_unix_connection(path)
+            writer.write(json.dumps({"id": "a", **REQUEST}).encode() + b"\n")
+            writer.write(json.dumps({"id": "b", **REQUEST, "load": -1}).encode() + b"\n")
+            writer.write(b"not json\n")
+            await writer.drain()
+            responses = [json.loads(await reader.readline()) for _ in range(3)]
+            writer.close()
+        return responses
+
+    responses = asyncio.run(scenario())
+    by_id = {r.get("id"): r for r in responses}
+    assert by_id["a"]["design"] == design_lap_joint(50, 150, 10, 12)
+    assert by_id["b"]["error"] == "Tensile force P cannot be negative"
+    assert by_id[None]["error"].startswith("Invalid JSON request")
+
+
+def test_invalid_utf8_line_is_answered(tmp_path):
+    """Test that a line that is not UTF-8 gets an error and later requests are still answered."""
+    path = str(tmp_path / "design.sock")
+
+    async def scenario():
+        server = await start_server(DesignService(), unix_path=path)
+        async with server:
+            reader, writer = await asyncio.open_unix_connection(path)
+            writer.write(b"\xc3(\n")
+            writer.write(json.dumps({"id": "a", **REQUEST}).encode() + b"\n")
+            await writer.drain()
+            responses = [json.loads(await asyncio.wait_for(reader.readline(), 5)) for _ in range(2)]
+            writer.close()
+        return responses
+
+    by_id = {r.get("id"): r for r in asyncio.run(scenario())}
+    assert by_id[None]["error"].startswith("Invalid JSON request")
+    assert by_id["a"]["design"] == design_lap_joint(50, 150, 10, 12)
+
+
+def test_http_protocol():
+    """Test POST /design with a list of requests and GET /health over HTTP."""
+    async def request(port, method, path, body=b""):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+        await writer.drain()
+        raw = await reader.read()
+        writer.close()
+        head, _, payload = raw.partition(b"\r\n\r\n")
+        return int(head.split()[1]), json.loads(payload)
+
+    async def scenario():
+        server = await start_server(DesignService(), port=0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            design = await request(port, "POST", "/design", json.dumps([REQUEST, {"load": 1}]).encode())
+            health = await request(port, "GET", "/health")
+            missing = await request(port, "GET", "/nowhere")
+        return design, health, missing
+
+    (status, body), (health_status, health), (missing_status, _) = asyncio.run(scenario())
+    assert status == 200
+    assert body[0]["design"] == design_lap_joint(50, 150, 10, 12)
+    assert body[1]["error"] == "Missing field: width"
+    assert health_status == 200 and health["requests"] == 2
+    assert missing_status == 404
+
+
+def test_http_invalid_utf8_body():
+    """Test that a POST body that is not UTF-8 is answered with 400."""
+    async def scenario():
+        server = await start_server(DesignService(), port=0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"POST /design HTTP/1.1\r\nContent-Length: 2\r\nConnection: close\r\n\r\n\xc3(")
+            await writer.drain()
+            raw = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+        return raw
+
+    head, _, payload = asyncio.run(scenario()).partition(b"\r\n\r\n")
+    assert int(head.split()[1]) == 400
+    assert json.loads(payload)["error"].startswith("Invalid JSON request")
+
+
+@pytest.mark.parametrize("length", ["-5", "abc"])
+def test_http_invalid_content_length(length):
+    """Test that a negative or non-numeric Content-Length is answered with 400."""
+    async def scenario():
+        server = await start_server(DesignService(), port=0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"POST /design HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode())
+            await writer.drain()
+            raw = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+        return raw
+
+    head, _, payload = asyncio.run(scenario()).partition(b"\r\n\r\n")
+    assert int(head.split()[1]) == 400
+    assert json.loads(payload) == {"error": "Invalid Content-Length header"}
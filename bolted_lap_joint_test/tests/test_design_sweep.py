@@ -0,0 +1,87 @@
+import pytest
+import sys
+import os
+import json
+import numpy as np
+
+# Add the src directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+from bolted_lap_joint_design import design_lap_joint
+from design_sweep import run_sweep, load_sweep, parse_range, SWEEP_FIELDS, MANIFEST_NAME
+
+loads = np.linspace(1, 500, 9).tolist()
+widths = [60, 150]
+thicknesses = [5, 10, 16]
+
+
+class Interrupted(Exception):
+    pass
+
+
+def test_parse_range():
+    """Test the axis range syntax."""
+    assert parse_range("1:5:3") == [1.0, 3.0, 5.0]
+    assert parse_range("6,8,10") == [6.0, 8.0, 10.0]
+    assert parse_range("150") == [150.0]
+    with pytest.raises(ValueError, match="Invalid range"):
+        parse_range("1:5")
+
+
+def test_sweep_matches_scalar_design(tmp_path):
+    """Test that every point of the design map equals design_lap_joint."""
+    run_sweep(str(tmp_path), loads, widths, thicknesses, thicknesses, block_size=7)
+    sweep = load_sweep(str(tmp_path))
+    assert sweep["completed"] == sweep["total"] == 9 * 2 * 3 * 3
+
+    for index in np.ndindex(sweep["number_of_bolts"].shape):
+        P, w, t1, t2 = (sweep["axes"][name][i] for name, i in zip(("load", "width", "thickness1", "thickness2"), index))
+        try:
+            design = design_lap_joint(P, w, t1, t2)
+        except ValueError:
+            assert sweep["candidate_index"][index] == -1
+            assert np.isnan(sweep["length_of_connection"][index])
+            continue
+        assert sweep["number_of_bolts"][index] == design["number_of_bolts"]
+        assert sweep["length_of_connection"][index] == design["length_of_connection"]
+        assert sweep["efficiency_of_connection"][index] == design["efficiency_of_connection"]
+
+
+def test_interrupted_sweep_resumes(tmp_path):
+    """Test that an interrupted sweep continues from its last completed block."""
+    def stop_after_two_blocks(completed, total):
+        if completed >= 20:
+            raise Interrupted()
+
+    with pytest.raises(Interrupted):
+        run_sweep(str(tmp_path), loads, widths, thicknesses, thicknesses, block_size=10, progress=stop_after_two_blocks)
+    with open(tmp_path / MANIFEST_NAME) as f:
+        assert json.load(f)["completed"] == 20
+
+    blocks = []
+    run_sweep(str(tmp_path), loads, widths, thicknesses, thicknesses, block_size=10,
+              progress=lambda completed, total: blocks.append(completed))
+    assert blocks[0] == 30, "The resumed sweep should skip the completed blocks"
+
+    reference = tmp_path / "reference"
+    run_sweep(str(reference), loads, widths, thicknesses, thicknesses)
+    resumed, fresh = load_sweep(str(tmp_path)), load_sweep(str(reference))
+    for name in SWEEP_FIELDS:
+        np.testing.assert_array_equal(resumed[name], fresh[name])
+
+
+def test_sweep_with_new_axes_starts_over(tmp_path):
+    """Test that changing the axes discards the stored progress."""
+    run_sweep(str(tmp_path), loads, widths, thicknesses, thicknesses)
+    run_sweep(str(tmp_path), [50], widths, thicknesses, [12])
+    sweep = load_sweep(str(tmp_path))
+    assert sweep["number_of_bolts"].shape == (1, 2, 3, 1)
+    assert sweep["completed"] == 6
+
+
+def test_sweep_rejects_invalid_axes(tmp_path):
+    """Test that axis values outside the design input limits are rejected before any work."""
+    with pytest.raises(ValueError, match="axis width"):
+        run_sweep(str(tmp_path), loads, [0, 150], thicknesses, thicknesses)
+    with pytest.raises(ValueError, match="No sweep found"):
+        load_sweep(str(tmp_path))
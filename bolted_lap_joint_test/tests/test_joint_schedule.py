@@ -0,0 +1,89 @@
+import pytest
+import sys
+import os
+import io
+import json
+
+# Add the src directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+from bolted_lap_joint_design import design_lap_joint
+from joint_schedule import design_schedule, load_schedule, schedule_key, governing_inputs
+
+
+def _joint(joint_id, P, w=150, t1=10, t2=12):
+    return {"id": joint_id, "load": P, "width": w, "thickness1": t1, "thickness2": t2}
+
+
+def test_equal_joints_share_one_design():
+    """Test that equal joints are designed once and every joint gets the design_lap_joint result."""
+    joints = [_joint("B1", 50), _joint("B2", 80), _joint("B3", 50.0), _joint("B4", 50, t2=12.0)]
+    results, summary = design_schedule(joints)
+
+    assert [result["id"] for result in results] == ["B1", "B2", "B3", "B4"]
+    assert [result["group"] for result in results] == [0, 1, 0, 0]
+    assert results[0]["design"] == design_lap_joint(50, 150, 10, 12)
+    assert results[1]["design"] == design_lap_joint(80, 150, 10, 12)
+    assert results[3]["design"] == results[0]["design"] and results[3]["design"] is not results[0]["design"]
+    assert summary["joints"] == 4 and summary["unique_designs"] == 2
+    assert summary["dedup_ratio"] == 2.0
+    assert summary["total_time"] >= summary["design_time"] >= 0
+
+
+def test_tolerance_designs_for_the_governing_joint():
+    """Test that near-equal joints are grouped and designed for the largest load and thinnest plates."""
+    joints = [_joint("A", 50.2, t1=10.4), _joint("B", 50.9, t1=10.1), _joint("C", 51.1)]
+    results, summary = design_schedule(joints, tolerance=1)
+
+    assert summary["unique_designs"] == 2
+    assert results[0]["design"] == results[1]["design"] == design_lap_joint(50.9, 150, 10.1, 12)
+    assert results[2]["group"] == 1
+    assert schedule_key((50.2, 150, 10.4, 12), 1) == schedule_key((50.9, 150, 10.1, 12), 1)
+    assert governing_inputs([(1, 150, 8, 12), (2, 100, 10, 6)]) == (2, 100, 8, 6)
+    with pytest.raises(ValueError, match="Tolerance"):
+        design_schedule(joints, tolerance=-1)
+
+
+def test_tiny_tolerance_keys_exact_values():
+    """Test that a tolerance too small to bin an input falls back to its exact value."""
+    key = schedule_key((100.0, 150.0, 10.0, 12.0), 1e-320)
+    assert key == schedule_key((100.0, 150.0, 10.0, 12.0), 1e-320)
+    assert key != schedule_key((100.5, 150.0, 10.0, 12.0), 1e-320)
+    assert schedule_key((1e-318, 150.0, 10.0, 12.0), 1e-320)[0] == 100
+
+    joints = [_joint("A", 100), _joint("B", 100.0), _joint("C", 101)]
+    results, summary = design_schedule(joints, tolerance=1e-320)
+    assert [result["group"] for result in results] == [0, 0, 1]
+    with pytest.raises(ValueError, match="finite"):
+        design_schedule(joints, tolerance=float("inf"))
+
+
+def test_cli_rejects_infinite_tolerance():
+    """Test that the schedule subcommand rejects a tolerance that is not finite."""
+    import cli
+
+    with pytest.raises(SystemExit):
+        cli.parse_schedule_arguments(["--tolerance", "inf"])
+
+
+def test_schedule_errors_per_joint():
+    """Test that invalid joints and joints without a design are reported without stopping the schedule."""
+    joints = [_joint("ok", 50), {"id": "missing", "load": 50}, _joint("big", 100000, t1=5, t2=5),
+              _joint("big-too", 100000, t1=5, t2=5), ValueError("Invalid JSON record")]
+    results, summary = design_schedule(joints)
+
+    assert "design" in results[0]
+    assert results[1]["error"] == "Missing field: width"
+    assert results[2]["error"] == results[3]["error"] == "No suitable design found that meets the requirements."
+    assert results[4]["error"] == "Invalid JSON record"
+    assert summary["errors"] == 4 and summary["unique_designs"] == 2
+
+
+def test_load_schedule_formats():
+    """Test that schedules can be a JSON list, an object with joints, or JSON lines."""
+    joints = [_joint("B1", 50), _joint("B2", 80)]
+    assert load_schedule(io.StringIO(json.dumps(joints))) == joints
+    assert load_schedule(io.StringIO(json.dumps({"project": "Hall", "joints": joints}))) == joints
+    assert load_schedule(io.StringIO("\n".join(json.dumps(joint) for joint in joints) + "\n")) == joints
+    with pytest.raises(ValueError, match="list of joint objects"):
+        load_schedule(io.StringIO('{"project": "Hall"}'))
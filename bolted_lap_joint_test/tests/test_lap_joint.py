@@ -1,12 +1,17 @@
 import pytest
 import sys
 import os
+import math
 import numpy as np
 
 # Add the src directory to the Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
 
-from bolted_lap_joint_design import design_lap_joint, calculate_bolt_strength, IS800_2007
+from bolted_lap_joint_design import (
+    design_lap_joint, calculate_bolt_strength, IS800_2007,
+    get_capacity_table, clear_capacity_tables, BEARING_CACHE_SIZE,
+    ParetoFront, pareto_objectives, DesignRecord, BOLT_DIAMETERS,
+)
 
 # Test parameters
 load_values = np.linspace(1, 100, 10)  # 10 evenly spaced load values from 1 to 100 kN
@@ -151,4 +156,135 @@ def test_input_validation(param_name, invalid_value, error_message):
         t2 = invalid_value
     
     with pytest.raises(ValueError, match=error_message):
-        design_lap_joint(load, width, t1, t2) 
\ No newline at end of file
+        design_lap_joint(load, width, t1, t2) 
+
+# Tests for the precomputed capacity table
+
+def test_capacity_table_matches_clause_functions():
+    """Test that the capacity table reproduces the IS800_2007 shear capacities for every candidate."""
+    table = get_capacity_table()
+    assert len(table.candidates) == 25, "Table should hold every (diameter, grade) pair"
+
+    for row in table.as_rows():
+        bolt_fu, bolt_fy = calculate_bolt_strength(row["bolt_grade"])
+        A_bolt = math.pi * (row["bolt_diameter"] / 2) ** 2
+        expected = IS800_2007.cl_10_3_3_bolt_shear_capacity(bolt_fy, A_bolt, A_bolt, 0, 0, 'Field')
+        assert row["shear_capacity"] == expected, f"Shear capacity differs for {row}"
+
+def test_capacity_table_is_reused_and_invalidated():
+    """Test that the table is built once per process and rebuilt after clearing."""
+    table = get_capacity_table()
+    assert get_capacity_table() is table, "Repeated lookups should return the same table"
+
+    clear_capacity_tables()
+    rebuilt = get_capacity_table()
+    assert rebuilt is not table, "Clearing should discard the cached table"
+    assert rebuilt.as_rows() == table.as_rows(), "Rebuilt table should hold the same capacities"
+
+def test_bearing_capacity_cache():
+    """Test that bearing capacities are cached per (diameter, thickness) with a bounded LRU."""
+    table = get_capacity_table(plate_grade="E250", hole_type='Oversized', connection_location='Shop')
+    first = table.bearing_capacity(20, 12)
+    assert table.bearing_capacity(20, 12) == first
+    assert first == IS800_2007.cl_10_3_4_bolt_bearing_capacity(410, 0, 12, 20, 30.0, 50.0, 'Oversized', 'Shop')
+
+    info = table.bearing_cache_info()
+    assert info.hits >= 1, "Repeated bearing lookups should hit the cache"
+    assert info.maxsize == BEARING_CACHE_SIZE, "Bearing cache should be bounded"
+
+# Tests for the Pareto-front mode
+
+def _all_feasible_designs(P, w, t1, t2):
+    """Collect every feasible candidate by brute force, for comparison with the Pareto front."""
+    table = get_capacity_table()
+    P_N = P * 1000
+    designs = []
+    for candidate in table.candidates:
+        N_b = max(math.ceil(P_N / (candidate.shear_capacity * 0.75)), 2)
+        V_dpb = table.bearing_capacity(candidate.bolt_diameter, min(t1, t2))
+        utilization = P_N / (N_b * min(candidate.shear_capacity, V_dpb) * 0.75)
+        if utilization <= 1:
+            length = 2 * candidate.end_distance + (N_b - 1) * candidate.pitch_distance
+            designs.append((length, N_b, candidate.bolt_grade, utilization))
+    return designs
+
+@pytest.mark.parametrize("load,t1,t2", [(10, 10, 12), (100, 10, 12), (300, 16, 20), (400, 6, 8)])
+def test_pareto_front_is_exactly_the_non_dominated_set(load, t1, t2):
+    """Test that Pareto mode returns every non-dominated feasible design and nothing else."""
+    front = design_lap_joint(load, width_value, t1, t2, pareto=True)
+    objectives = [pareto_objectives(design) for design in front]
+
+    candidates = _all_feasible_designs(load, width_value, t1, t2)
+    expected = [c for c in candidates if not any(ParetoFront.dominates(o, c) for o in candidates)]
+
+    assert sorted(objectives) == sorted(expected)
+    assert objectives == sorted(objectives, key=lambda o: o[0]), "Front should be sorted by connection length"
+    assert front[0]["length_of_connection"] == design_lap_joint(load, width_value, t1, t2)["length_of_connection"]
+
+def test_pareto_front_filter():
+    """Test the online dominance filter."""
+    front = ParetoFront()
+    assert front.add((2, 2), "a")
+    assert not front.add((3, 3), "dominated")
+    assert front.add((1, 3), "b")
+    assert front.add((1, 1), "c"), "A dominating item should join and evict the others"
+    assert front.items() == ["c"]
+
+def test_pareto_no_suitable_design():
+    """Test that Pareto mode raises the same error when nothing is feasible."""
+    with pytest.raises(ValueError, match="No suitable design found that meets the requirements."):
+        design_lap_joint(100000, width_value, 5, 5, pareto=True)
+
+@pytest.mark.parametrize("load", [10, 50, 300])
+def test_design_stats(load):
+    """Test that an instrumented design returns the same design and consistent statistics."""
+    clear_capacity_tables()
+    design, stats = design_lap_joint(load, width_value, 10, 12, return_stats=True)
+    assert design == design_lap_joint(load, width_value, 10, 12)
+
+    n_candidates = len(get_capacity_table().candidates)
+    assert 0 < stats.candidates_evaluated <= n_candidates
+    assert 0 <= stats.rejected_by_utilization < stats.candidates_evaluated
+    assert stats.improvements >= 1
+    assert stats.clause_calls["cl_10_3_3_bolt_shear_capacity"] == n_candidates, "A cold table computes every shear capacity"
+    assert 0 < stats.bearing_cache_misses <= len(BOLT_DIAMETERS), "One bearing capacity per diameter at most"
+    assert set(stats.phase_times) == {"validation", "capacity_table", "search"}
+
+    # A warm table reuses every capacity
+    _, stats = design_lap_joint(load, width_value, 10, 12, return_stats=True)
+    assert sum(stats.clause_calls.values()) == 0
+    assert stats.bearing_cache_hit_rate == 1.0
+
+def test_design_stats_pareto():
+    """Test that Pareto mode can be instrumented too."""
+    front, stats = design_lap_joint(100, width_value, 10, 12, pareto=True, return_stats=True)
+    assert front == design_lap_joint(100, width_value, 10, 12, pareto=True)
+    assert stats.candidates_evaluated == len(get_capacity_table().candidates)
+
+def test_compact_design_record():
+    """Test that the compact record restores the full design dictionary."""
+    design = design_lap_joint(50, width_value, 10, 12)
+    record = design_lap_joint(50, width_value, 10, 12, compact=True)
+    assert not hasattr(record, "__dict__"), "Records should not carry a per-instance dictionary"
+    assert record.as_dict() == design
+    assert DesignRecord.from_dict(design) == record
+
+    front = design_lap_joint(100, width_value, 10, 12, pareto=True, compact=True)
+    assert [r.as_dict() for r in front] == design_lap_joint(100, width_value, 10, 12, pareto=True)
+
+
+def test_design_stats_per_thread():
+    """Test that designs in other threads do not fill the statistics of an instrumented design."""
+    import threading
+    import bolted_lap_joint_design
+
+    stats = bolted_lap_joint_design.DesignStats()
+    token = bolted_lap_joint_design._active_stats.set(stats)
+    try:
+        # A cold table in another thread computes every clause while stats are being filled here
+        thread = threading.Thread(target=lambda: (clear_capacity_tables(), design_lap_joint(50, width_value, 10, 12)))
+        thread.start()
+        thread.join()
+    finally:
+        bolted_lap_joint_design._active_stats.reset(token)
+    assert sum(stats.clause_calls.values()) == 0
@@ -0,0 +1,81 @@
+import pytest
+import sys
+import os
+import numpy as np
+
+# Add the src directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+from bolted_lap_joint_design import design_lap_joint
+from load_index import LoadIndex, get_load_index, design_for_loads
+
+
+def _design_or_none(P, w, t1, t2):
+    try:
+        return design_lap_joint(P, w, t1, t2)
+    except ValueError:
+        return None
+
+
+@pytest.mark.parametrize("w,t1,t2", [(150, 10, 12), (150, 5, 5), (60, 3, 24), (400, 20, 16)])
+def test_index_matches_design_lap_joint(w, t1, t2):
+    """Test that the index answers random loads and loads at the breakpoints exactly."""
+    index = LoadIndex(w, t1, t2, max_load=500)
+    breakpoints = index.breakpoints
+    loads = np.concatenate([
+        [0, 0.001],
+        np.random.default_rng(3).uniform(0, 1500, 500),  # Beyond max_load, so the index is extended
+        breakpoints,
+        np.nextafter(breakpoints, np.inf),
+    ])
+
+    for P in loads:
+        expected = _design_or_none(P, w, t1, t2)
+        if expected is None:
+            with pytest.raises(ValueError, match="No suitable design found"):
+                index.design(P)
+        else:
+            assert index.design(P) == expected, f"Index differs from design_lap_joint at P={P}"
+
+    assert index.max_load >= 1500
+
+
+def test_breakpoints_and_headroom():
+    """Test that breakpoints are sorted and headroom reports the load for one more bolt."""
+    index = get_load_index(150, 10, 12)
+    assert get_load_index(150, 10, 12) is index, "Indexes should be cached per geometry"
+    assert index.breakpoints == sorted(index.breakpoints)
+
+    headroom = index.headroom(100)
+    assert headroom["load_for_next_bolt"] > 100
+    assert headroom["next_breakpoint"] > 100
+    beyond = design_lap_joint(headroom["load_for_next_bolt"] * 1.0001, 150, 10, 12)
+    same_bolt = beyond["bolt_diameter"] == design_lap_joint(100, 150, 10, 12)["bolt_diameter"]
+    if same_bolt:
+        assert beyond["number_of_bolts"] == headroom["number_of_bolts"] + 1
+
+
+def test_design_for_loads():
+    """Test designing several load cases of one geometry at once."""
+    designs = design_for_loads([10, 50, 100000], 150, 5, 5)
+    assert designs[0] == design_lap_joint(10, 150, 5, 5)
+    assert designs[2] is None
+    with pytest.raises(ValueError, match="cannot be negative"):
+        design_for_loads([-1], 150, 5, 5)
+
+
+def test_index_range_is_capped(monkeypatch):
+    """Test that loads above MAX_INDEX_LOAD are designed without growing the index."""
+    import load_index
+
+    uncapped = LoadIndex(150, 10, 12, max_load=1500)
+    monkeypatch.setattr(load_index, "MAX_INDEX_LOAD", 200)
+    index = LoadIndex(150, 10, 12, max_load=500)
+    assert index.max_load == 200
+    size = len(index.breakpoints)
+
+    for P in np.random.default_rng(5).uniform(0, 1500, 300):
+        assert index.design(P) == design_lap_joint(P, 150, 10, 12), f"Capped index differs at P={P}"
+        assert index.next_breakpoint(P) == pytest.approx(uncapped.next_breakpoint(P), rel=1e-12)
+    assert index.headroom(1000)["next_breakpoint"] > 1000
+    assert (index.max_load, len(index.breakpoints)) == (200, size)
@@ -0,0 +1,79 @@
+import pytest
+import sys
+import os
+import io
+import numpy as np
+
+# Add the src directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+from batch_design import design_lap_joint_batch
+from parallel_design import design_lap_joint_parallel, imap_chunks
+from stream_design import read_records, design_stream, design_jsonl
+
+rng = np.random.default_rng(7)
+loads = rng.uniform(0, 400, 500)
+thicknesses = rng.choice([5, 6, 8, 10, 12, 16], size=(2, 500))
+
+
+def test_parallel_matches_batch_in_input_order():
+    """Test that chunks designed across workers are reassembled in input order."""
+    expected = design_lap_joint_batch(loads, 150, thicknesses[0], thicknesses[1])
+    results, report = design_lap_joint_parallel(loads, 150, thicknesses[0], thicknesses[1],
+                                                workers=2, chunk_size=64, return_report=True)
+
+    for key, column in expected.items():
+        np.testing.assert_array_equal(results[key], column)
+    assert report.records == 500
+    assert report.records_per_second > 0
+
+
+def test_single_worker_designs_in_chunks(monkeypatch):
+    """Test that one worker designs large inputs chunk by chunk, with the same results."""
+    import parallel_design
+
+    sizes = []
+    batch = parallel_design.design_lap_joint_batch
+
+    def recording_batch(P, w, t1, t2):
+        sizes.append(len(P))
+        return batch(P, w, t1, t2)
+
+    expected = design_lap_joint_batch(loads, 150, thicknesses[0], thicknesses[1])
+    monkeypatch.setattr(parallel_design, "design_lap_joint_batch", recording_batch)
+    results = design_lap_joint_parallel(loads, 150, thicknesses[0], thicknesses[1], workers=1, chunk_size=64)
+
+    assert max(sizes) == 64 and sum(sizes) == 500
+    for key, column in expected.items():
+        np.testing.assert_array_equal(results[key], column)
+
+
+def test_parallel_validation_names_global_index():
+    """Test that invalid records are reported with their index in the full input."""
+    with pytest.raises(ValueError, match=r"\(record 300\)"):
+        design_lap_joint_parallel(np.where(np.arange(400) == 300, -1.0, 10.0), 150, 10, 12,
+                                  workers=2, chunk_size=64)
+
+
+def test_parallel_stream_matches_serial_stream():
+    """Test that the streaming pipeline gives the same output with several workers."""
+    lines = "\n".join(f'{{"load": {P}, "width": 150, "thickness1": {a}, "thickness2": {b}}}'
+                      for P, a, b in zip(loads, thicknesses[0], thicknesses[1]))
+
+    serial = list(design_stream(read_records(io.StringIO(lines)), chunk_size=50))
+    parallel = list(design_stream(read_records(io.StringIO(lines)), chunk_size=50, workers=2))
+    assert parallel == serial
+
+    text = "".join(chunk for chunk, _, _ in design_jsonl(io.StringIO(lines), chunk_size=50, workers=2))
+    assert len(text.splitlines()) == 500
+
+
+def test_imap_chunks_completion_order_returns_every_chunk():
+    """Test that unordered mapping still yields each chunk exactly once."""
+    chunks = ((i, (np.full(10, float(i)), 150, 10, 12)) for i in range(8))
+    tags = [tag for tag, _ in imap_chunks(_design, chunks, workers=2, preserve_order=False)]
+    assert sorted(tags) == list(range(8))
+
+
+def _design(payload):
+    return design_lap_joint_batch(*payload)
@@ -0,0 +1,125 @@
+import pytest
+import sys
+import os
+import json
+import random
+
+# Add the src directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+from bolted_lap_joint_design import design_lap_joint, use_catalogue
+from catalogue import DEFAULT_CATALOGUE_PATH
+from sensitivity import design_sensitivity, parse_perturbation, DEFAULT_PERTURBATIONS
+import cli
+
+
+def test_sensitivity_table():
+    """Test that every default change is designed and that a load increase flips the bolt grade."""
+    result = design_sensitivity(80, 150, 10, 12)
+    assert result["design"] == design_lap_joint(80, 150, 10, 12)
+
+    table = result["table"]
+    assert len(table) == sum(len(deltas) for deltas in DEFAULT_PERTURBATIONS.values())
+    flipped = [row for row in table if row["status"] == "flipped"]
+    assert [(row["input"], row["delta"]) for row in flipped] == [("load", 10.0)]
+    assert flipped[0]["bolt_grade"] == 4.8 and result["design"]["bolt_grade"] == 3.6
+    assert all(row["length_change"] == 0 for row in table)
+
+
+def test_sensitivity_matches_design_lap_joint():
+    """Test that each row holds the design_lap_joint result of the changed inputs."""
+    rng = random.Random(19)
+    for _ in range(50):
+        base = (rng.uniform(1, 600), rng.uniform(50, 300), rng.uniform(3, 25), rng.uniform(3, 25))
+        try:
+            result = design_sensitivity(*base, perturbations={"load": (-25, 40), "thickness1": (-2.5, 3),
+                                                              "thickness2": (-1, 1), "width": (5,)})
+        except ValueError:
+            with pytest.raises(ValueError):
+                design_lap_joint(*base)
+            continue
+        axes = {"load": 0, "width": 1, "thickness1": 2, "thickness2": 3}
+        for row in result["table"]:
+            inputs = list(base)
+            inputs[axes[row["input"]]] += row["delta"]
+            try:
+                design = design_lap_joint(*inputs)
+            except ValueError as e:
+                assert row["status"] == "infeasible" and row["error"] == str(e)
+                continue
+            for key in ("bolt_diameter", "bolt_grade", "number_of_bolts", "length_of_connection",
+                        "efficiency_of_connection"):
+                assert row[key] == design[key]
+
+
+def test_sensitivity_on_large_catalogue(tmp_path):
+    """Test that the indexed shared search finds the design_lap_joint designs on a large catalogue."""
+    rng = random.Random(600)
+    document = {
+        "bolts": {"diameters": sorted(rng.sample(range(4, 400), 60)),
+                  "grades": [3.6, 4.6, 4.8, 5.6, 5.8, 6.8, 8.8, 9.8, 10.9, 12.9]},
+        "plates": [{"grade": "E250", "fy": 250, "fu": 410}, {"grade": "E410", "fy": 410, "fu": 550}],
+    }
+    path = tmp_path / "large.json"
+    path.write_text(json.dumps(document))
+    use_catalogue(str(path))
+    try:
+        for _ in range(30):
+            base = (rng.uniform(1, 3000), rng.uniform(50, 300), rng.uniform(3, 40), rng.uniform(3, 40))
+            result = design_sensitivity(*base, perturbations={"load": (-50, 50), "thickness1": (-2, 2)})
+            assert result["design"] == design_lap_joint(*base)
+            for row in result["table"]:
+                inputs = list(base)
+                inputs[0 if row["input"] == "load" else 2] += row["delta"]
+                try:
+                    design = design_lap_joint(*inputs)
+                except ValueError:
+                    assert row["status"] == "infeasible"
+                    continue
+                assert (row["bolt_diameter"], row["bolt_grade"], row["number_of_bolts"]) == (
+                    design["bolt_diameter"], design["bolt_grade"], design["number_of_bolts"])
+    finally:
+        use_catalogue(DEFAULT_CATALOGUE_PATH)
+
+
+def test_sensitivity_infeasible_and_invalid():
+    """Test that changes without a design are reported and unknown inputs are rejected."""
+    result = design_sensitivity(80, 150, 10, 12, {"thickness1": (-8,), "load": (-100,)})
+    assert [row["status"] for row in result["table"]] == ["infeasible", "infeasible"]
+    assert result["table"][0]["error"] == "No suitable design found that meets the requirements."
+    assert result["table"][1]["error"] == "Tensile force P cannot be negative"
+
+    with pytest.raises(ValueError, match="Unknown input 'depth'"):
+        design_sensitivity(80, 150, 10, 12, {"depth": (1,)})
+    with pytest.raises(ValueError):
+        design_sensitivity(-80, 150, 10, 12)
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("thickness1=-2,2", ("thickness1", (-2.0, 2.0))),
+    ("load=5", ("load", (5.0,))),
+    ("load=", None),
+    ("load", None),
+    ("height=1", None),
+])
+def test_parse_perturbation(text, expected):
+    """Test the command line perturbation syntax."""
+    if expected is None:
+        with pytest.raises(ValueError):
+            parse_perturbation(text)
+    else:
+        assert parse_perturbation(text) == expected
+
+
+def test_cli_sensitivity(capsys):
+    """Test the --sensitivity and --perturb command line options."""
+    assert cli.main(["80", "150", "10", "12", "--perturb", "load=10", "--json"]) == 0
+    output = json.loads(capsys.readouterr().out)
+    assert output == design_sensitivity(80, 150, 10, 12, {"load": (10,)})
+
+    assert cli.main(["80", "150", "10", "12", "--sensitivity"]) == 0
+    out = capsys.readouterr().out
+    assert "SENSITIVITY" in out and "flipped" in out
+
+    with pytest.raises(SystemExit):
+        cli.main(["80", "150", "10", "12", "--sensitivity", "--pareto"])
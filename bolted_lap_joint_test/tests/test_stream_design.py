@@ -0,0 +1,79 @@
+import pytest
+import sys
+import os
+import io
+import json
+
+# Add the src directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+from bolted_lap_joint_design import design_lap_joint
+from stream_design import read_records, design_stream, write_jsonl, detect_format, design_structured
+
+JSONL_INPUT = "\n".join([
+    '{"id": "J1", "load": 50, "width": 150, "thickness1": 10, "thickness2": 12}',
+    '{"load": -5, "width": 150, "thickness1": 10, "thickness2": 12}',
+    'not json',
+    '{"P": 100000, "w": 150, "t1": 5, "t2": 5}',
+    '{"load": 20, "width": 150, "thickness1": 10}',
+    '{"load": 80, "width": 200, "thickness1": 16, "thickness2": 8}',
+])
+
+
+def test_stream_matches_scalar_design():
+    """Test that streamed designs equal design_lap_joint and keep input order."""
+    results = list(design_stream(read_records(io.StringIO(JSONL_INPUT)), chunk_size=2))
+
+    assert [r["index"] for r in results] == list(range(6))
+    assert results[0]["id"] == "J1"
+    assert results[0]["design"] == design_lap_joint(50, 150, 10, 12)
+    assert results[5]["design"] == design_lap_joint(80, 200, 16, 8)
+
+
+def test_stream_reports_errors_per_record():
+    """Test that invalid records are reported without aborting the run."""
+    results = list(design_stream(read_records(io.StringIO(JSONL_INPUT))))
+    errors = {r["index"]: r["error"] for r in results if "error" in r}
+
+    assert errors[1] == "Tensile force P cannot be negative"
+    assert errors[2].startswith("Invalid JSON record")
+    assert errors[3] == "No suitable design found that meets the requirements."
+    assert errors[4] == "Missing field: thickness2"
+
+
+def test_stream_unordered_reports_errors_first():
+    """Test that unordered mode emits invalid records ahead of the pending chunk."""
+    results = list(design_stream(read_records(io.StringIO(JSONL_INPUT)), chunk_size=3, preserve_order=False))
+    assert [r["index"] for r in results] == [1, 2, 0, 4, 3, 5]
+
+
+def test_stream_csv_to_jsonl():
+    """Test reading CSV records and writing JSONL output."""
+    source = io.StringIO("load,width,thickness1,thickness2\n50,150,10,12\nx,150,10,12\n")
+    output = io.StringIO()
+
+    written, errors = write_jsonl(design_stream(read_records(source, detect_format("joints.csv"))), output)
+
+    assert (written, errors) == (2, 1)
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert lines[0]["design"] == design_lap_joint(50.0, 150.0, 10.0, 12.0)
+    assert "must be a number" in lines[1]["error"]
+
+
+def test_stream_to_structured_file(tmp_path):
+    """Test that structured output written chunk by chunk matches the JSONL results."""
+    from batch_design import StructuredWriter, load_designs, structured_results
+
+    path = str(tmp_path / "designs.npy")
+    with StructuredWriter(path) as writer:
+        for designs, _, _ in design_structured(io.StringIO(JSONL_INPUT), chunk_size=4):
+            writer.write(designs)
+
+    views = list(structured_results(load_designs(path)))
+    expected = list(design_stream(read_records(io.StringIO(JSONL_INPUT))))
+    assert [view["index"] for view in views] == list(range(6))
+    for view, result in zip(views, expected):
+        if "design" in result:
+            assert view["design"] == result["design"]
+        else:
+            assert "error" in view
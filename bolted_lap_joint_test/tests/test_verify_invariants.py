@@ -0,0 +1,81 @@
+import pytest
+import sys
+import os
+import numpy as np
+
+# Add the src directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+
+import verify_invariants
+from verify_invariants import (verify_invariants as run_verification, generate_inputs, shrink_case, Invariant,
+                               INPUT_FIELDS, _complexity, _failing)
+import cli
+
+
+def test_invariants_hold():
+    """Test that every invariant holds on a few hundred thousand random cases, reproducibly."""
+    report = run_verification(cases=200000, batch_size=50000, seed=1)
+    assert report.passed, str(report)
+    assert report.cases == 200000 and report.batches == 5
+    assert report.sampled > 0
+
+    inputs = generate_inputs(np.random.default_rng(1), 1000)
+    again = generate_inputs(np.random.default_rng(1), 1000)
+    assert all(np.array_equal(inputs[name], again[name]) for name in INPUT_FIELDS)
+    assert inputs["load"].min() >= 0 and 0 < inputs["width"].min() and inputs["width"].max() <= 1000
+    assert 0 < inputs["thickness1"].min() and inputs["thickness1"].max() <= 100
+
+
+def test_time_budget():
+    """Test that a time budget alone stops the run on time."""
+    report = run_verification(time_budget=0.3)
+    assert report.passed and report.cases > 0
+    assert report.elapsed < 0.6
+
+
+def test_injected_bug_is_found_and_shrunk(monkeypatch):
+    """Test that a batch path dropping to one bolt above 250 kN fails and shrinks to a simple reproducer."""
+    batch = verify_invariants.design_lap_joint_batch
+
+    def broken_batch(P, w, t1, t2):
+        results = batch(P, w, t1, t2)
+        results["number_of_bolts"] = np.where(np.asarray(P) > 250, 1, results["number_of_bolts"])
+        return results
+
+    monkeypatch.setattr(verify_invariants, "design_lap_joint_batch", broken_batch)
+    report = run_verification(cases=20000, batch_size=10000)
+
+    assert not report.passed
+    failure = report.failures["at_least_two_bolts"]
+    assert failure.count > 0
+    assert failure.example["load"] > 250
+    assert failure.minimal == {"load": 300.0, "width": 1.0, "thickness1": 5.0, "thickness2": 5.0,
+                               "thickness_increase": 0.0}
+    assert "matches_design_lap_joint" in report.failures
+    assert "FAILED at_least_two_bolts" in str(report)
+
+
+def test_shrink_case():
+    """Test that shrinking keeps the case failing and makes it simpler."""
+    invariant = Invariant("small_load", "", lambda inputs, results: inputs["load"] < 123.456, False)
+    case = {"load": 987.654321, "width": 133.7, "thickness1": 17.25, "thickness2": 3.5, "thickness_increase": 2.2}
+    minimal = shrink_case(invariant, case)
+    assert minimal == {"load": 200.0, "width": 1.0, "thickness1": 1.0, "thickness2": 1.0, "thickness_increase": 0.0}
+
+    columns = {name: np.array([minimal[name]]) for name in INPUT_FIELDS}
+    assert _failing(invariant, columns)[0]
+    assert _complexity(minimal) < _complexity(case)
+
+
+def test_invalid_arguments():
+    """Test that a run needs a number of cases or a time budget."""
+    with pytest.raises(ValueError, match="number of cases"):
+        run_verification()
+    with pytest.raises(ValueError):
+        run_verification(cases=10, batch_size=0)
+
+
+def test_cli_verify(capsys):
+    """Test the verify subcommand."""
+    assert cli.main(["verify", "--cases", "5000", "--seed", "2"]) == 0
+    assert "Checked 5000 cases" in capsys.readouterr().out